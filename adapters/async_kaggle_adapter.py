@@ -0,0 +1,197 @@
+# adapters/async_kaggle_adapter.py
+import asyncio
+import json
+import os
+import urllib.parse
+
+import aiohttp
+
+from ports.dataset_port import AsyncDatasetPort
+from adapters.kaggle_download_manager import (
+    CHUNK_SIZE, KAGGLE_API_URL, RETRYABLE_CLIENT_ERRORS, ChecksumError, KaggleDownloadManager, _header_md5,
+)
+from adapters.kaggle_downloader_adapter import MetadataCache
+
+
+def kaggle_credentials() -> tuple:
+    """(username, key) from KAGGLE_USERNAME/KAGGLE_KEY or kaggle.json, like the official client."""
+    if os.environ.get("KAGGLE_USERNAME") and os.environ.get("KAGGLE_KEY"):
+        return os.environ["KAGGLE_USERNAME"], os.environ["KAGGLE_KEY"]
+    config_dir = os.environ.get("KAGGLE_CONFIG_DIR") or os.path.join(os.path.expanduser("~"), ".kaggle")
+    path = os.path.join(config_dir, "kaggle.json")
+    if not os.path.exists(path):
+        raise OSError(f"Could not find {path}; set KAGGLE_USERNAME and KAGGLE_KEY or create kaggle.json.")
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    return config["username"], config["key"]
+
+
+class AsyncKaggleDownloaderAdapter(AsyncDatasetPort):
+    """
+    Kaggle over aiohttp: metadata lookups, file listings and file downloads
+    are coroutines sharing one connection pool, so many datasets can be
+    fetched from a single event loop without a thread per request.
+
+    Uses the same on-disk layout as KaggleDownloaderAdapter (metadata cache,
+    content-addressed mirror with Range resume and checksum verification),
+    so both adapters reuse each other's downloads. Hashing and extraction
+    run on the default executor.
+    """
+
+    def __init__(self, metadata_ttl: float = 3600, max_connections: int = 8,
+                 base_url: str = KAGGLE_API_URL, auth: tuple = None, retries: int = 2, **mirror_options):
+        self.metadata_cache = MetadataCache(ttl=metadata_ttl)
+        self.max_connections = max_connections
+        self.base_url = base_url.rstrip("/")
+        self.auth = auth
+        self.retries = retries
+        self.download_manager = KaggleDownloadManager(None, None, base_url=base_url, auth=auth,
+                                                      retries=retries, **mirror_options)
+        self._session = None
+        self._slots = None
+
+    # --- session -------------------------------------------------------
+
+    async def _client(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            username, key = self.auth or kaggle_credentials()
+            self._session = aiohttp.ClientSession(
+                auth=aiohttp.BasicAuth(username, key),
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60),
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+            )
+            self._slots = asyncio.Semaphore(self.max_connections)
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        await self._client()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _get_json(self, path: str, params: dict = None) -> dict:
+        session = await self._client()
+        async with self._slots, session.get(f"{self.base_url}/{path}", params=params) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    # --- metadata ------------------------------------------------------
+
+    async def get_dataset_metadata(self, dataset_name: str, max_age: float = None) -> dict:
+        """Same dict (and cache) as KaggleDownloaderAdapter.get_dataset_metadata."""
+        metadata = self.metadata_cache.get(dataset_name, max_age)
+        if metadata is not None:
+            return metadata
+        info = await self._get_json(f"datasets/view/{dataset_name}")
+        metadata = {
+            "title": info.get("title"),
+            "description": info.get("description"),
+            "size": info.get("totalBytes", info.get("size")),
+            "last_updated": info.get("lastUpdated"),
+            "tags": info.get("tags"),
+            "url": info.get("url"),
+        }
+        self.metadata_cache.put(dataset_name, metadata)
+        return metadata
+
+    async def get_datasets_metadata(self, dataset_names: list, max_age: float = None) -> dict:
+        """{slug: metadata} for many slugs at once; failed lookups map to the raised exception."""
+        async def fetch(name):
+            try:
+                return await self.get_dataset_metadata(name, max_age)
+            except Exception as e:
+                print(f"Could not fetch metadata for '{name}': {e}")
+                return e
+
+        results = await asyncio.gather(*(fetch(name) for name in dataset_names))
+        return dict(zip(dataset_names, results))
+
+    async def list_files(self, dataset_name: str) -> list:
+        """[{"name", "size", "sha256"}], following the listing's pages."""
+        files, token = [], None
+        while True:
+            page = await self._get_json(f"datasets/list/{dataset_name}", {"pageToken": token} if token else None)
+            for f in page.get("datasetFiles") or []:
+                size = f.get("totalBytes")
+                files.append({"name": f["name"], "size": int(size) if size is not None else None,
+                              "sha256": f.get("sha256")})
+            token = page.get("nextPageToken")
+            if not token:
+                return files
+
+    # --- transfer ------------------------------------------------------
+
+    async def _download(self, url: str, part_path: str) -> str:
+        """Stream `url` into `part_path` with Range resume. Returns the server MD5, if any."""
+        session = await self._client()
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        async with self._slots, session.get(url, headers=headers) as response:
+            if response.status == 416:
+                return None  # the partial file is already complete
+            response.raise_for_status()
+            if offset and response.status != 206:
+                offset = 0  # server ignored the Range header
+            with open(part_path, "ab" if offset else "wb") as f:
+                # Network chunks are small; gather them and write each full buffer off the loop.
+                buffer = bytearray()
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    buffer += chunk
+                    if len(buffer) >= CHUNK_SIZE:
+                        await asyncio.to_thread(f.write, bytes(buffer))
+                        buffer.clear()
+                if buffer:
+                    await asyncio.to_thread(f.write, bytes(buffer))
+            return _header_md5(response.headers)
+
+    async def _fetch_into_mirror(self, dataset_name: str, file: dict, staging: str) -> dict:
+        manager = self.download_manager
+        part_path = os.path.join(staging, file["name"].replace("/", "__") + ".part")
+        url = f"{self.base_url}/datasets/download/{dataset_name}/{urllib.parse.quote(file['name'])}"
+
+        for attempt in range(self.retries + 1):
+            try:
+                server_md5 = await self._download(url, part_path)
+                digests, size = await asyncio.to_thread(manager._verify, file, part_path, server_md5)
+                break
+            except ChecksumError as e:
+                os.remove(part_path)
+                if attempt == self.retries:
+                    raise
+                print(f"{e} Retrying...")
+            except aiohttp.ClientResponseError as e:
+                if 400 <= e.status < 500 and e.status not in RETRYABLE_CLIENT_ERRORS or attempt == self.retries:
+                    raise
+                print(f"Download of '{file['name']}' failed ({e.status}); retrying...")
+            except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError) as e:
+                if attempt == self.retries:
+                    raise
+                print(f"Download of '{file['name']}' interrupted ({e!r}); resuming...")
+        return manager._store_object(file, part_path, digests, size)
+
+    async def fetch(self, dataset_name: str) -> dict:
+        """Async KaggleDownloadManager.fetch: update the mirror, return the version manifest."""
+        manager = self.download_manager
+        # Fresh lookup: a cached `last_updated` could hide a new version.
+        last_updated = str((await self.get_dataset_metadata(dataset_name, max_age=0))["last_updated"])
+        snapshot_path = manager._snapshot_path(dataset_name, last_updated)
+        manifest = await asyncio.to_thread(manager._load_manifest, snapshot_path)
+        if manifest is not None:
+            print(f"'{dataset_name}' unchanged since {last_updated}; using local mirror.")
+            return manifest
+        files = await self.list_files(dataset_name)
+        staging = manager._staging_dir(dataset_name)
+        entries = await asyncio.gather(*(self._fetch_into_mirror(dataset_name, f, staging) for f in files))
+        return manager._save_manifest(snapshot_path, dataset_name, last_updated, list(entries))
+
+    async def download_dataset(self, dataset_name: str, path: str) -> str:
+        manifest = await self.fetch(dataset_name)
+        await asyncio.to_thread(self.download_manager._materialize, manifest, path)
+        print(f"Downloaded '{dataset_name}' into '{path}'.")
+        return path
@@ -1,35 +1,41 @@
 # adapters/dtale_adapter.py
 
 from ports.dtale_port import DtalePort
-import dtale
+from adapters.dtale_session_manager import DtaleSessionManager, default_session_manager
 import pandas as pd
 
 class DtaleAdapter(DtalePort):
+    def __init__(self, session_manager: DtaleSessionManager = None, owner: str = "shared",
+                 wait_for_edits=None):
+        """
+        - session_manager: shared Dtale server registry (one per process by default)
+        - owner: user/session name, so concurrent users get separate copies to edit
+        - wait_for_edits: called with the Dtale URL; returns when the user is done
+          editing (defaults to waiting for Enter on the terminal)
+        """
+        self.session_manager = session_manager or default_session_manager
+        self.owner = owner
+        self.wait_for_edits = wait_for_edits or self._wait_for_enter
+
+    @staticmethod
+    def _wait_for_enter(url: str) -> None:
+        input(f"Edit the data at {url}, then press Enter to continue...")
+
     def open_in_dtale(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Launch Dtale at a specific host & port in a CLI scenario.
-        
-        - host="localhost": ensures we bind to localhost
-        - port=40000: forces Dtale to run on port 40000 (change if needed)
-        - open_browser=False: doesn't auto-launch a browser tab
-        - subprocess=False: keep process inline
+        Register the DataFrame with the shared Dtale server (started in the
+        background on a free port), wait until the user finishes editing and
+        return the edited data (`d.data`).
 
-        Returning the same df for simplicity. 
-        In practice, you'd use dtale APIs to retrieve the updated dataset.
+        The same frame opened twice by the same owner reuses the existing
+        Dtale dataset instead of copying it again.
         """
-        d = dtale.show(
-            df, 
-            subprocess=False, 
-            host="localhost", 
-            port=40000, 
-            open_browser=False
-        )
+        session = self.session_manager.open(df, owner=self.owner)
 
         # Print out the local Dtale URL so user can open it manually
-        print(f"Dtale is running at {d._main_url}")
+        print(f"Dtale is running at {session.url}")
         print("Open the above URL in your browser to explore or edit the data.")
-        print("Returning the original DataFrame (no changes in this example).")
 
-        # In a real-world scenario, you might fetch updates from Dtale
-        # or call `d.data` after editing. For now, we just return the original df.
-        return df
+        self.wait_for_edits(session.url)
+        self.session_manager.touch(session)
+        return session.instance.data
@@ -0,0 +1,127 @@
+# adapters/dtale_session_manager.py
+
+import socket
+import threading
+import time
+
+import dtale
+from dtale import global_state
+import pandas as pd
+
+from application.fingerprint import dataset_fingerprint
+from application.tracing import tracer
+
+PORT_RANGE = range(40000, 40100)
+
+
+def find_free_port(host: str = "localhost", ports=PORT_RANGE) -> int:
+    """First port in `ports` nobody is listening on."""
+    for port in ports:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            try:
+                s.bind((host, port))
+                return port
+            except OSError:
+                continue
+    raise RuntimeError(f"No free port between {ports.start} and {ports.stop - 1}.")
+
+
+class DtaleSession:
+    def __init__(self, key: str, instance, fingerprint: str):
+        self.key = key
+        self.instance = instance
+        self.fingerprint = fingerprint
+        self.last_used = time.time()
+
+    @property
+    def url(self) -> str:
+        return self.instance._main_url
+
+    @property
+    def data_id(self):
+        return self.instance._data_id
+
+
+class DtaleSessionManager:
+    """
+    One background Dtale server per process, shared by every dataset and user.
+
+    - the server starts lazily on a free port from PORT_RANGE, so several
+      processes (e.g. two analysts running edit_data) never collide
+    - datasets are registered by content fingerprint: opening the same frame
+      again reuses its data_id instead of copying it into Dtale's store
+    - `owner` separates the sessions of different users on the same data,
+      so their edits stay apart
+    - sessions idle for more than `max_idle` seconds are dropped by cleanup(),
+      and the server is shut down once it has no sessions left
+    """
+
+    def __init__(self, host: str = "localhost", max_idle: float = 1800):
+        self.host = host
+        self.max_idle = max_idle
+        self.port = None
+        self._server = None
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def open(self, df: pd.DataFrame, owner: str = "shared", name: str = None) -> DtaleSession:
+        self.cleanup()
+        fingerprint = dataset_fingerprint(df)
+        key = f"{owner}:{fingerprint}"
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None and global_state.contains(session.data_id):
+                session.last_used = time.time()
+                return session
+
+            if self.port is None:
+                self.port = find_free_port(self.host)
+            with tracer.span("dtale_launch", port=self.port, owner=owner) as span:
+                span.set_frame(df)
+                instance = dtale.show(
+                    df,
+                    host=self.host,
+                    port=self.port,
+                    subprocess=True,
+                    open_browser=False,
+                    ignore_duplicate=True,
+                    name=name,
+                )
+            self._server = self._server or instance
+            session = DtaleSession(key, instance, fingerprint)
+            self._sessions[key] = session
+            return session
+
+    def touch(self, session: DtaleSession) -> None:
+        session.last_used = time.time()
+
+    def close(self, session: DtaleSession) -> None:
+        with self._lock:
+            self._sessions.pop(session.key, None)
+            global_state.cleanup(session.data_id)
+            self._shutdown_if_idle()
+
+    def cleanup(self) -> int:
+        """Drop sessions idle for longer than max_idle; returns how many were dropped."""
+        now = time.time()
+        with self._lock:
+            expired = [s for s in self._sessions.values() if now - s.last_used > self.max_idle]
+            for session in expired:
+                self._sessions.pop(session.key, None)
+                global_state.cleanup(session.data_id)
+            if expired:
+                self._shutdown_if_idle()
+        return len(expired)
+
+    def _shutdown_if_idle(self) -> None:
+        if not self._sessions and self._server is not None:
+            try:
+                self._server.kill()
+            except Exception as e:
+                print(f"Could not stop Dtale on port {self.port}: {e}")
+            self._server = None
+            self.port = None
+
+
+# Shared by every DtaleAdapter in the process.
+default_session_manager = DtaleSessionManager()
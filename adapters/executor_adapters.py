@@ -0,0 +1,73 @@
+# adapters/executor_adapters.py
+"""
+Async ports backed by the synchronous adapters: the blocking call runs on
+an executor while the event loop keeps serving other pipelines.
+
+Profiling and training are CPU-bound. On the default thread pool they
+overlap where numpy/sklearn release the GIL; pass a ProcessPoolExecutor
+(the adapter and the frame are pickled to the worker) for full
+parallelism, and always for PyCaretAdapter, whose setup() keeps global
+state that concurrent threads would overwrite.
+
+Downloads and D-Tale sessions are I/O-bound and their adapters hold
+unpicklable clients, so ExecutorDatasetAdapter and ExecutorDtaleAdapter
+only accept thread executors.
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+import pandas as pd
+
+from ports.dataset_port import AsyncDatasetPort, DatasetPort
+from ports.dtale_port import AsyncDtalePort, DtalePort
+from ports.profiling_port import AsyncProfilingPort, ProfilingPort
+from ports.training_port import AsyncTrainingPort, TrainingPort
+from application.async_runtime import run_blocking
+
+
+def _thread_executor(executor: Executor, port: str) -> Executor:
+    if isinstance(executor, ProcessPoolExecutor):
+        raise TypeError(f"{port} adapters can't be pickled to a process pool; pass a thread executor.")
+    return executor
+
+
+class ExecutorDatasetAdapter(AsyncDatasetPort):
+    def __init__(self, adapter: DatasetPort, executor: Executor = None):
+        self.adapter = adapter
+        self.executor = _thread_executor(executor, "Dataset")
+
+    async def download_dataset(self, source_name: str, path: str) -> str:
+        await run_blocking(self.executor, self.adapter.download_dataset, source_name, path)
+        return path
+
+
+class ExecutorProfilingAdapter(AsyncProfilingPort):
+    def __init__(self, adapter: ProfilingPort, executor: Executor = None):
+        self.adapter = adapter
+        self.executor = executor
+
+    @property
+    def output_path(self):
+        return getattr(self.adapter, "output_path", None)
+
+    async def generate_report(self, df: pd.DataFrame) -> None:
+        await run_blocking(self.executor, self.adapter.generate_report, df)
+
+
+class ExecutorDtaleAdapter(AsyncDtalePort):
+    """Waiting for the user's edits holds a thread, never the loop."""
+
+    def __init__(self, adapter: DtalePort, executor: Executor = None):
+        self.adapter = adapter
+        self.executor = _thread_executor(executor, "D-Tale")
+
+    async def open_in_dtale(self, df: pd.DataFrame) -> pd.DataFrame:
+        return await run_blocking(self.executor, self.adapter.open_in_dtale, df)
+
+
+class ExecutorTrainingAdapter(AsyncTrainingPort):
+    def __init__(self, adapter: TrainingPort, executor: Executor = None):
+        self.adapter = adapter
+        self.executor = executor
+
+    async def train_model(self, df: pd.DataFrame, target: str, task_type: str):
+        return await run_blocking(self.executor, self.adapter.train_model, df, target, task_type)
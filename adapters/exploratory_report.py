@@ -1,14 +1,15 @@
 import pandas as pd
-from ydata_profiling import ProfileReport
+from adapters.ydata_profiling_adapter import YDataProfilingAdapter
 
 def gerar_relatorio_exploratorio():
     # Carrega o dataset
     df = pd.read_csv("application/data/SpotifyFeatures.csv")
 
-    # Gera o relatório
-    profile = ProfileReport(df, title="Relatório Exploratório - Spotify", explorative=True)
-
-    # Salva como HTML
-    profile.to_file("spotify_relatorio.html")
+    # Gera o relatório (amostrado e em cache por fingerprint do dataset)
+    profiler = YDataProfilingAdapter(
+        output_path="spotify_relatorio.html",
+        title="Relatório Exploratório - Spotify",
+    )
+    profiler.generate_report(df)
 
     print("✅ Relatório gerado com sucesso: spotify_relatorio.html")
@@ -0,0 +1,284 @@
+# adapters/kaggle_download_manager.py
+
+import base64
+import hashlib
+import json
+import os
+import shutil
+import urllib.error
+import urllib.parse
+import urllib.request
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+KAGGLE_API_URL = "https://www.kaggle.com/api/v1"
+MIRROR_FOLDER = os.path.join("data", "kaggle_mirror")
+CHUNK_SIZE = 1 << 20
+# Client errors worth retrying; any other 4xx (auth, not found) fails at once.
+RETRYABLE_CLIENT_ERRORS = (408, 429)
+
+
+class ChecksumError(IOError):
+    pass
+
+
+def _file_digests(path: str) -> dict:
+    md5, sha256 = hashlib.md5(), hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            md5.update(chunk)
+            sha256.update(chunk)
+    return {"md5": md5.hexdigest(), "sha256": sha256.hexdigest()}
+
+
+def _file_crc32(path: str) -> int:
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _header_md5(headers) -> str:
+    """MD5 advertised by the server (Content-MD5 or GCS x-goog-hash), as hex."""
+    values = [headers.get("Content-MD5")]
+    for part in (headers.get("x-goog-hash") or "").split(","):
+        part = part.strip()
+        if part.startswith("md5="):
+            values.append(part[4:])
+    for value in values:
+        if value:
+            return base64.b64decode(value).hex()
+    return None
+
+
+class KaggleDownloadManager:
+    """
+    Keeps a local, content-addressed mirror of Kaggle datasets.
+
+    - objects/<sha256>: every downloaded file, stored once across versions
+    - snapshots/<owner>__<slug>/<version>.json: manifest of a dataset version,
+      where <version> hashes the slug and the `lastUpdated` metadata
+
+    A dataset whose version manifest already exists (and whose objects still
+    verify) is never downloaded again. Files are fetched concurrently with
+    HTTP Range resume from `.part` files, and checked against the expected size,
+    the server-advertised MD5 and the listed SHA-256 when available.
+
+    `base_url` and `api` are injectable so a local stand-in server can replace Kaggle.
+    """
+
+    def __init__(self, api, metadata_fn, mirror_dir: str = MIRROR_FOLDER,
+                 base_url: str = KAGGLE_API_URL, auth: tuple = None,
+                 max_workers: int = 4, retries: int = 2):
+        self.api = api
+        self.metadata_fn = metadata_fn
+        self.mirror_dir = mirror_dir
+        self.base_url = base_url.rstrip("/")
+        self.auth = auth
+        self.max_workers = max_workers
+        self.retries = retries
+
+    # --- mirror layout -------------------------------------------------
+
+    def object_path(self, sha256: str) -> str:
+        return os.path.join(self.mirror_dir, "objects", sha256[:2], sha256)
+
+    def _snapshot_path(self, dataset_name: str, last_updated: str) -> str:
+        version = hashlib.sha1(f"{dataset_name}@{last_updated}".encode()).hexdigest()[:16]
+        slug = dataset_name.replace("/", "__")
+        return os.path.join(self.mirror_dir, "snapshots", slug, f"{version}.json")
+
+    def _load_manifest(self, snapshot_path: str) -> dict:
+        if not os.path.exists(snapshot_path):
+            return None
+        with open(snapshot_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        for entry in manifest["files"]:
+            obj = self.object_path(entry["sha256"])
+            if not os.path.exists(obj) or os.path.getsize(obj) != entry["size"]:
+                print(f"Mirror object for '{entry['name']}' is missing or truncated; re-downloading.")
+                return None
+        return manifest
+
+    # --- public API ----------------------------------------------------
+
+    def sync(self, dataset_name: str, path: str) -> str:
+        """Make `path` contain the current version of the dataset; download only if it changed."""
+        self._materialize(self.fetch(dataset_name), path)
+        return path
+
+    def fetch(self, dataset_name: str) -> dict:
+        """
+        Bring the mirror up to date with the current version of the dataset and
+        return its manifest. Nothing is extracted; use object_path() to read files.
+        """
+        last_updated = str(self.metadata_fn(dataset_name)["last_updated"])
+        snapshot_path = self._snapshot_path(dataset_name, last_updated)
+        manifest = self._load_manifest(snapshot_path)
+
+        if manifest is None:
+            files = self.list_files(dataset_name)
+            staging = self._staging_dir(dataset_name)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                entries = list(executor.map(
+                    lambda f: self._fetch_into_mirror(dataset_name, f, staging), files))
+            manifest = self._save_manifest(snapshot_path, dataset_name, last_updated, entries)
+        else:
+            print(f"'{dataset_name}' unchanged since {last_updated}; using local mirror.")
+        return manifest
+
+    def list_files(self, dataset_name: str) -> list:
+        """
+        [{"name", "size", "sha256"}] for every file of the dataset (size/sha256
+        may be None), following the listing's pages.
+        """
+        files, token = [], None
+        while True:
+            listing = (self.api.dataset_list_files(dataset_name, page_token=token) if token
+                       else self.api.dataset_list_files(dataset_name))
+            for f in getattr(listing, "files", listing):
+                size = getattr(f, "totalBytes", None)
+                files.append({
+                    "name": getattr(f, "name", None) or str(f),
+                    "size": int(size) if size is not None else None,
+                    "sha256": getattr(f, "sha256", None),
+                })
+            token = getattr(listing, "nextPageToken", None) or getattr(listing, "next_page_token", None)
+            if not token:
+                return files
+
+    # --- transfer ------------------------------------------------------
+
+    def _file_url(self, dataset_name: str, file_name: str) -> str:
+        return f"{self.base_url}/datasets/download/{dataset_name}/{urllib.parse.quote(file_name)}"
+
+    def _open(self, url: str, offset: int):
+        request = urllib.request.Request(url)
+        if offset:
+            request.add_header("Range", f"bytes={offset}-")
+        auth = self.auth or self._api_credentials()
+        if auth:
+            token = base64.b64encode(f"{auth[0]}:{auth[1]}".encode()).decode()
+            request.add_header("Authorization", f"Basic {token}")
+        return urllib.request.urlopen(request, timeout=60)
+
+    def _api_credentials(self):
+        config = getattr(self.api, "config_values", None) or {}
+        if config.get("username") and config.get("key"):
+            return config["username"], config["key"]
+        return None
+
+    def _staging_dir(self, dataset_name: str) -> str:
+        staging = os.path.join(self.mirror_dir, "staging", dataset_name.replace("/", "__"))
+        os.makedirs(staging, exist_ok=True)
+        return staging
+
+    def _save_manifest(self, snapshot_path: str, dataset_name: str, last_updated: str, entries: list) -> dict:
+        manifest = {"dataset": dataset_name, "last_updated": last_updated, "files": entries}
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        with open(snapshot_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+    def _verify(self, file: dict, part_path: str, server_md5: str) -> tuple:
+        """Check a finished partial against the listing and the server MD5; returns (digests, size)."""
+        digests = _file_digests(part_path)
+        size = os.path.getsize(part_path)
+        # Kaggle lists uncompressed sizes but may serve a file zipped.
+        if file["size"] is not None and size != file["size"] and not zipfile.is_zipfile(part_path):
+            raise ChecksumError(f"{file['name']}: expected {file['size']} bytes, got {size}.")
+        if server_md5 and server_md5 != digests["md5"]:
+            raise ChecksumError(f"{file['name']}: MD5 mismatch.")
+        if file["sha256"] and file["sha256"] != digests["sha256"]:
+            raise ChecksumError(f"{file['name']}: SHA-256 mismatch.")
+        return digests, size
+
+    def _store_object(self, file: dict, part_path: str, digests: dict, size: int) -> dict:
+        """Move a verified partial into the object store; returns its manifest entry."""
+        obj = self.object_path(digests["sha256"])
+        os.makedirs(os.path.dirname(obj), exist_ok=True)
+        if os.path.exists(obj):
+            os.remove(part_path)
+        else:
+            os.replace(part_path, obj)
+        print(f"Fetched '{file['name']}' ({size} bytes).")
+        return {"name": file["name"], "size": size, "sha256": digests["sha256"]}
+
+    def _fetch_into_mirror(self, dataset_name: str, file: dict, staging: str) -> dict:
+        part_path = os.path.join(staging, file["name"].replace("/", "__") + ".part")
+        url = self._file_url(dataset_name, file["name"])
+
+        for attempt in range(self.retries + 1):
+            try:
+                digests, size = self._verify(file, part_path, self._download(url, part_path))
+                break
+            except ChecksumError as e:
+                # A corrupt partial cannot be resumed; start this file over.
+                os.remove(part_path)
+                if attempt == self.retries:
+                    raise
+                print(f"{e} Retrying...")
+            except urllib.error.HTTPError as e:
+                # HTTPError is a URLError: handle it first so 4xx fails fast.
+                if 400 <= e.code < 500 and e.code not in RETRYABLE_CLIENT_ERRORS or attempt == self.retries:
+                    raise
+                print(f"Download of '{file['name']}' failed ({e}); retrying...")
+            except (urllib.error.URLError, ConnectionError, TimeoutError) as e:
+                if attempt == self.retries:
+                    raise
+                print(f"Download of '{file['name']}' interrupted ({e}); resuming...")
+        return self._store_object(file, part_path, digests, size)
+
+    def _download(self, url: str, part_path: str) -> str:
+        """Stream `url` into `part_path`, resuming from its current size. Returns the server MD5, if any."""
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        try:
+            response = self._open(url, offset)
+        except urllib.error.HTTPError as e:
+            if e.code != 416:
+                raise
+            # Range not satisfiable: the partial file is already complete.
+            return None
+        with response:
+            if offset and response.status != 206:
+                offset = 0  # server ignored the Range header
+            with open(part_path, "ab" if offset else "wb") as f:
+                for chunk in iter(lambda: response.read(CHUNK_SIZE), b""):
+                    f.write(chunk)
+            return _header_md5(response.headers)
+
+    # --- working copy --------------------------------------------------
+
+    def _materialize(self, manifest: dict, path: str) -> None:
+        """
+        Link (or copy) mirror objects into `path`, extracting zip archives.
+        Existing files are kept only when their content matches (same inode,
+        or same size and checksum), so a new version is never masked by an
+        old file of the same size.
+        """
+        os.makedirs(path, exist_ok=True)
+        for entry in manifest["files"]:
+            obj = self.object_path(entry["sha256"])
+            if zipfile.is_zipfile(obj):
+                with zipfile.ZipFile(obj) as archive:
+                    for member in archive.infolist():
+                        target = os.path.join(path, member.filename)
+                        if not (os.path.isfile(target) and os.path.getsize(target) == member.file_size
+                                and _file_crc32(target) == member.CRC):
+                            archive.extract(member, path)
+                continue
+            target = os.path.join(path, entry["name"])
+            if os.path.exists(target) and (
+                    os.path.samefile(obj, target)
+                    or os.path.getsize(target) == entry["size"]
+                    and _file_digests(target)["sha256"] == entry["sha256"]):
+                continue
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            if os.path.exists(target):
+                os.remove(target)
+            try:
+                os.link(obj, target)
+            except OSError:
+                shutil.copy2(obj, target)
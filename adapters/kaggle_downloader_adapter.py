@@ -1,9 +1,16 @@
 # adapters\kaggle_downloader_adapter.py
 
+import json
 import os
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from kaggle.api.kaggle_api_extended import KaggleApi
 
+from adapters.kaggle_download_manager import KaggleDownloadManager
+
+METADATA_CACHE_FOLDER = os.path.join("data", "kaggle_metadata")
+
 class IKaggleRepository(ABC):
     @abstractmethod
     def authenticate(self):
@@ -17,16 +24,62 @@ class IKaggleRepository(ABC):
     def get_dataset_metadata(self, dataset_name: str) -> dict:
         pass
 
+    @abstractmethod
+    def get_datasets_metadata(self, dataset_names: list) -> dict:
+        pass
+
+
+class MetadataCache:
+    """
+    On-disk cache of dataset metadata: one JSON file per slug holding the
+    metadata and the time it was fetched. Entries older than `ttl` seconds
+    are treated as missing. Writes are atomic, so concurrent lookups are safe.
+    """
+
+    def __init__(self, folder: str = METADATA_CACHE_FOLDER, ttl: float = 3600):
+        self.folder = folder
+        self.ttl = ttl
+
+    def _path(self, dataset_name: str) -> str:
+        return os.path.join(self.folder, dataset_name.replace("/", "__") + ".json")
+
+    def get(self, dataset_name: str, max_age: float = None):
+        path = self._path(dataset_name)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+        max_age = self.ttl if max_age is None else max_age
+        if time.time() - entry["fetched_at"] > max_age:
+            return None
+        return entry["metadata"]
+
+    def put(self, dataset_name: str, metadata: dict) -> None:
+        os.makedirs(self.folder, exist_ok=True)
+        path = self._path(dataset_name)
+        tmp_path = f"{path}.{os.getpid()}.{id(metadata)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fetched_at": time.time(), "metadata": metadata}, f, default=str)
+        os.replace(tmp_path, path)
+
 class KaggleDownloaderAdapter(IKaggleRepository):
     """
     A Kaggle adapter that uses the Python API
     (kaggle.api.kaggle_api_extended) directly.
     """
 
-    def __init__(self):
+    def __init__(self, metadata_ttl: float = 3600, max_metadata_workers: int = 16,
+                 **download_options):
         self.api = KaggleApi()
         # We do NOT call authenticate() here,
         # so that the user can explicitly call it later if needed.
+        self.metadata_cache = MetadataCache(ttl=metadata_ttl)
+        self.max_metadata_workers = max_metadata_workers
+        # The mirror decides whether to re-download from `last_updated`, so it
+        # always asks Kaggle instead of reading the TTL cache.
+        self.download_manager = KaggleDownloadManager(
+            self.api, lambda name: self.get_dataset_metadata(name, max_age=0), **download_options
+        )
 
     def authenticate(self):
         """
@@ -36,15 +89,26 @@ class KaggleDownloaderAdapter(IKaggleRepository):
         self.api.authenticate()
 
     def download_dataset(self, dataset_name: str, path: str):
+        """
+        Sync the dataset into `path` through the local mirror: unchanged
+        datasets (same `lastUpdated`) are not downloaded again, and changed
+        ones are fetched file by file, concurrently and with resume.
+        """
         os.makedirs(path, exist_ok=True)
-        self.api.dataset_download_files(dataset_name, path=path, unzip=True)
+        self.download_manager.sync(dataset_name, path)
         print(f"Downloaded '{dataset_name}' into '{path}'.")
 
 
-    def get_dataset_metadata(self, dataset_name: str) -> dict:
+    def get_dataset_metadata(self, dataset_name: str, max_age: float = None) -> dict:
         """
         Returns a dict with some metadata about the dataset (title, description, etc.).
+        Served from the on-disk cache while it is younger than `max_age`
+        seconds (the cache TTL by default); pass max_age=0 to force a refresh.
         """
+        metadata = self.metadata_cache.get(dataset_name, max_age)
+        if metadata is not None:
+            return metadata
+
         dataset_info = self.api.dataset_view(dataset_name)
         metadata = {
             "title": dataset_info["title"],
@@ -54,4 +118,31 @@ class KaggleDownloaderAdapter(IKaggleRepository):
             "tags": dataset_info["tags"],
             "url": dataset_info["url"]
         }
+        self.metadata_cache.put(dataset_name, metadata)
         return metadata
+
+    def get_datasets_metadata(self, dataset_names: list, max_age: float = None) -> dict:
+        """
+        Resolve many slugs at once: cached entries are answered locally and the
+        rest are fetched concurrently on a bounded thread pool.
+        Returns {slug: metadata}; failed lookups map to the raised exception.
+        """
+        results, missing = {}, []
+        for name in dataset_names:
+            metadata = self.metadata_cache.get(name, max_age)
+            if metadata is not None:
+                results[name] = metadata
+            else:
+                missing.append(name)
+
+        def fetch(name):
+            try:
+                return name, self.get_dataset_metadata(name, max_age=0)
+            except Exception as e:
+                print(f"Could not fetch metadata for '{name}': {e}")
+                return name, e
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_metadata_workers, len(missing))) as executor:
+                results.update(executor.map(fetch, missing))
+        return {name: results[name] for name in dataset_names}
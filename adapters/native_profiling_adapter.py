@@ -0,0 +1,163 @@
+# adapters/native_profiling_adapter.py
+import html
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from ports.profiling_port import ProfilingPort
+from adapters.profiling_executor import ColumnProfilingExecutor
+
+QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+
+def profile_column(series: pd.Series, top_k: int = 10, bins: int = 20) -> dict:
+    """Structured statistics for one column, JSON-serializable."""
+    n = len(series)
+    missing = int(series.isna().sum())
+    values = series.dropna()
+    stats = {
+        "name": str(series.name),
+        "dtype": str(series.dtype),
+        "count": n - missing,
+        "missing": missing,
+        "missing_pct": missing / n if n else 0.0,
+        "distinct": int(values.nunique()),
+    }
+
+    counts = values.value_counts()
+    stats["top"] = [{"value": str(v), "count": int(c)} for v, c in counts.head(top_k).items()]
+
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        array = values.to_numpy(dtype=np.float64)
+        array = array[np.isfinite(array)]
+        if len(array):
+            q = np.quantile(array, QUANTILES)
+            hist, edges = np.histogram(array, bins=bins)
+            stats.update({
+                "kind": "numeric",
+                "mean": float(array.mean()),
+                "std": float(array.std(ddof=1)) if len(array) > 1 else 0.0,
+                "min": float(array.min()),
+                "max": float(array.max()),
+                "quantiles": {f"p{int(p * 100)}": float(v) for p, v in zip(QUANTILES, q)},
+                "zeros": int((array == 0).sum()),
+                "histogram": {"counts": hist.tolist(), "edges": edges.tolist()},
+            })
+            return stats
+        stats["kind"] = "numeric"
+        return stats
+
+    stats["kind"] = "categorical"
+    if len(values):
+        lengths = values.astype(str).str.len()
+        stats["length"] = {"min": int(lengths.min()), "mean": float(lengths.mean()), "max": int(lengths.max())}
+    return stats
+
+
+def correlation_top_pairs(df: pd.DataFrame, top_n: int = 20) -> list:
+    """Strongest Pearson correlations between numeric columns, computed once on a float matrix."""
+    numeric = df.select_dtypes(include=[np.number]).drop(columns=df.select_dtypes(include=["bool"]).columns)
+    if numeric.shape[1] < 2:
+        return []
+    corr = numeric.corr().to_numpy()
+    rows, cols = np.triu_indices_from(corr, k=1)
+    values = corr[rows, cols]
+    valid = np.isfinite(values)
+    rows, cols, values = rows[valid], cols[valid], values[valid]
+    order = np.argsort(-np.abs(values))[:top_n]
+    names = numeric.columns
+    return [{"a": str(names[rows[i]]), "b": str(names[cols[i]]), "r": float(values[i])} for i in order]
+
+
+class NativeProfilingAdapter(ProfilingPort):
+    """
+    Lightweight profiler built on vectorized pandas/NumPy, for routine checks
+    (ydata-profiling stays available for deep dives).
+
+    Produces a structured profile — per-column stats, histograms, top-k values,
+    missingness and the top correlated pairs — written as JSON plus a small
+    self-contained HTML page. Columns are profiled in parallel by
+    ColumnProfilingExecutor over a shared-memory Arrow copy of the frame.
+    """
+
+    def __init__(self, output_path: str = "profile_report.html", top_k: int = 10,
+                 bins: int = 20, top_correlations: int = 20, n_jobs: int = -1):
+        self.output_path = output_path
+        self.top_k = top_k
+        self.bins = bins
+        self.top_correlations = top_correlations
+        self.executor = ColumnProfilingExecutor(n_jobs=n_jobs)
+
+    def profile(self, df: pd.DataFrame) -> dict:
+        columns = self.executor.map(df, profile_column, top_k=self.top_k, bins=self.bins)
+        return {
+            "rows": len(df),
+            "columns": df.shape[1],
+            "missing_cells": int(sum(c["missing"] for c in columns)),
+            "memory_bytes": int(df.memory_usage(deep=False).sum()),
+            "variables": columns,
+            "correlations": correlation_top_pairs(df, self.top_correlations),
+        }
+
+    def generate_report(self, df: pd.DataFrame) -> None:
+        profile = self.profile(df)
+        json_path = os.path.splitext(self.output_path)[0] + ".json"
+        os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2)
+        with open(self.output_path, "w", encoding="utf-8") as f:
+            f.write(render_html(profile))
+        print(f"Report generated: {self.output_path} (data: {json_path})")
+
+
+def _histogram_svg(histogram: dict, width: int = 200, height: int = 40) -> str:
+    counts = histogram["counts"]
+    peak = max(counts) or 1
+    bar = width / len(counts)
+    rects = "".join(
+        f'<rect x="{i * bar:.1f}" y="{height - c / peak * height:.1f}" '
+        f'width="{bar - 1:.1f}" height="{c / peak * height:.1f}"/>'
+        for i, c in enumerate(counts)
+    )
+    return f'<svg width="{width}" height="{height}" fill="#1f77b4">{rects}</svg>'
+
+
+def render_html(profile: dict) -> str:
+    """Render a structured profile as one self-contained HTML page."""
+    esc = html.escape
+    rows = []
+    for var in profile["variables"]:
+        if var["kind"] == "numeric" and "mean" in var:
+            detail = (f"mean {var['mean']:.4g} · std {var['std']:.4g} · "
+                      f"min {var['min']:.4g} · p50 {var['quantiles']['p50']:.4g} · max {var['max']:.4g}")
+            chart = _histogram_svg(var["histogram"])
+        else:
+            detail = ", ".join(f"{esc(t['value'])} ({t['count']:,})" for t in var["top"][:5])
+            chart = ""
+        rows.append(
+            f"<tr><td><b>{esc(var['name'])}</b><br><small>{esc(var['dtype'])}</small></td>"
+            f"<td>{var['missing']:,} ({var['missing_pct']:.1%})</td><td>{var['distinct']:,}</td>"
+            f"<td>{detail}</td><td>{chart}</td></tr>"
+        )
+    pairs = "".join(
+        f"<tr><td>{esc(p['a'])}</td><td>{esc(p['b'])}</td><td>{p['r']:.3f}</td></tr>"
+        for p in profile["correlations"]
+    )
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Data Profile</title>
+<style>
+body {{ font-family: sans-serif; margin: 2rem; }}
+table {{ border-collapse: collapse; margin-bottom: 2rem; }}
+td, th {{ border-bottom: 1px solid #ddd; padding: 0.4rem 0.8rem; text-align: left; vertical-align: top; }}
+</style></head><body>
+<h1>Data Profile</h1>
+<p>{profile['rows']:,} rows · {profile['columns']:,} columns · {profile['missing_cells']:,} missing cells</p>
+<h2>Variables</h2>
+<table><tr><th>Column</th><th>Missing</th><th>Distinct</th><th>Summary</th><th>Distribution</th></tr>
+{''.join(rows)}</table>
+<h2>Top correlations</h2>
+<table><tr><th>Variable 1</th><th>Variable 2</th><th>r</th></tr>{pairs}</table>
+</body></html>
+"""
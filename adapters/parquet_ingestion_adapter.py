@@ -0,0 +1,134 @@
+# adapters/parquet_ingestion_adapter.py
+
+import glob
+import json
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from ports.dataset_port import DatasetPort
+
+PARQUET_FOLDER = os.path.join("data", "parquet")
+
+# Column kinds from narrowest to widest; a column only ever moves right.
+KINDS = ["bool", "Int64", "float64", "string"]
+PANDAS_DTYPES = {"bool": "boolean", "Int64": "Int64", "float64": "float64", "string": "string"}
+
+
+def _column_kind(series: pd.Series) -> str:
+    if series.isna().all():
+        return KINDS[0]
+    if pd.api.types.is_bool_dtype(series):
+        return "bool"
+    if pd.api.types.is_integer_dtype(series):
+        return "Int64"
+    if pd.api.types.is_float_dtype(series):
+        # read_csv turns integer columns with gaps into floats; keep them integers.
+        values = series.dropna().to_numpy()
+        if np.all(np.mod(values, 1) == 0) and np.all(np.abs(values) < 2 ** 53):
+            return "Int64"
+        return "float64"
+    return "string"
+
+
+def _cast(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    return df.astype({col: PANDAS_DTYPES[kind] for col, kind in schema.items()})
+
+
+class ParquetIngestionAdapter(DatasetPort):
+    """
+    Turns a Kaggle dataset into partitioned Parquet in a single pass.
+
+    CSV members are streamed straight out of the mirrored zip archives (see
+    KaggleDownloadManager), parsed in chunks of `chunksize` rows and written as
+    one part-NNNNN.parquet file per chunk, so the unzipped CSV never touches
+    the disk. The schema is inferred as the chunks arrive and only widened
+    (bool -> Int64 -> float64 -> string); when a column widens, the parts
+    already written are rewritten, so every part of a table shares one schema.
+
+    Layout: <output>/<table>/part-*.parquet plus a _schema.json recording the
+    column kinds and the SHA-256 of the source, used to skip re-ingestion.
+    """
+
+    def __init__(self, download_manager, output_root: str = PARQUET_FOLDER,
+                 chunksize: int = 250_000):
+        self.download_manager = download_manager
+        self.output_root = output_root
+        self.chunksize = chunksize
+
+    def download_dataset(self, source_name: str, path: str = None) -> str:
+        manifest = self.download_manager.fetch(source_name)
+        output_dir = path or os.path.join(self.output_root, source_name.replace("/", "__"))
+        for entry in manifest["files"]:
+            source = self.download_manager.object_path(entry["sha256"])
+            self.ingest_file(source, entry["name"], output_dir, entry["sha256"])
+        print(f"Ingested '{source_name}' as Parquet into '{output_dir}'.")
+        return output_dir
+
+    def ingest_file(self, source: str, name: str, output_dir: str, source_sha256: str = None) -> list:
+        """Ingest a zip archive (every CSV member) or a plain CSV file; returns the table directories."""
+        tables = []
+        if zipfile.is_zipfile(source):
+            with zipfile.ZipFile(source) as archive:
+                for member in archive.infolist():
+                    if not member.filename.lower().endswith(".csv"):
+                        continue
+                    table_dir = os.path.join(output_dir, self._table_name(member.filename))
+                    signature = f"{source_sha256}:{member.filename}"
+                    if not self._is_current(table_dir, signature):
+                        with archive.open(member) as stream:
+                            self.ingest_csv(stream, table_dir, signature)
+                    tables.append(table_dir)
+        elif name.lower().endswith(".csv"):
+            table_dir = os.path.join(output_dir, self._table_name(name))
+            if not self._is_current(table_dir, source_sha256):
+                self.ingest_csv(source, table_dir, source_sha256)
+            tables.append(table_dir)
+        return tables
+
+    def ingest_csv(self, source, table_dir: str, signature: str = None) -> dict:
+        """Stream a CSV (path or binary file object) into `table_dir`; returns the final schema."""
+        os.makedirs(table_dir, exist_ok=True)
+        for stale in glob.glob(os.path.join(table_dir, "part-*.parquet")):
+            os.remove(stale)
+
+        schema, n_rows, n_parts = {}, 0, 0
+        for chunk in pd.read_csv(source, chunksize=self.chunksize, low_memory=False):
+            chunk_schema = {col: _column_kind(chunk[col]) for col in chunk.columns}
+            widened = {
+                col: kind for col, kind in chunk_schema.items()
+                if col not in schema or KINDS.index(kind) > KINDS.index(schema[col])
+            }
+            if schema and any(col in schema for col in widened):
+                schema.update(widened)
+                self._rewrite_parts(table_dir, schema)
+            else:
+                schema.update(widened)
+
+            part = os.path.join(table_dir, f"part-{n_parts:05d}.parquet")
+            _cast(chunk, schema).to_parquet(part, index=False)
+            n_rows += len(chunk)
+            n_parts += 1
+
+        with open(os.path.join(table_dir, "_schema.json"), "w", encoding="utf-8") as f:
+            json.dump({"source": signature, "rows": n_rows, "parts": n_parts, "columns": schema}, f, indent=2)
+        return schema
+
+    @staticmethod
+    def _rewrite_parts(table_dir: str, schema: dict) -> None:
+        for part in sorted(glob.glob(os.path.join(table_dir, "part-*.parquet"))):
+            _cast(pd.read_parquet(part), schema).to_parquet(part, index=False)
+
+    @staticmethod
+    def _is_current(table_dir: str, signature: str) -> bool:
+        schema_file = os.path.join(table_dir, "_schema.json")
+        if not signature or not os.path.exists(schema_file):
+            return False
+        with open(schema_file, encoding="utf-8") as f:
+            return json.load(f).get("source") == signature
+
+    @staticmethod
+    def _table_name(file_name: str) -> str:
+        return os.path.splitext(os.path.basename(file_name))[0]
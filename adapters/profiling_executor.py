@@ -0,0 +1,94 @@
+# adapters/profiling_executor.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+def basic_column_stats(series: pd.Series) -> dict:
+    """Column summary used by the Streamlit EDA tables."""
+    counts = series.value_counts()
+    return {
+        "name": str(series.name),
+        "dtype": str(series.dtype),
+        "unique": int(series.nunique()),
+        "missing": int(series.isna().sum()),
+        "mode": counts.index[0] if len(counts) else "N/A",
+        "mode_count": int(counts.iloc[0]) if len(counts) else 0,
+    }
+
+
+def _to_shared_memory(table: pa.Table) -> shared_memory.SharedMemory:
+    """Write `table` in Arrow IPC stream format into a new shared memory block."""
+    sink = pa.MockOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    shm = shared_memory.SharedMemory(create=True, size=max(sink.size(), 1))
+    with pa.ipc.new_stream(pa.FixedSizeBufferWriter(pa.py_buffer(shm.buf)), table.schema) as writer:
+        writer.write_table(table)
+    return shm
+
+
+def _run_shard(shm_name: str, columns: list, func, kwargs: dict) -> list:
+    """
+    Worker: attach to the shared block, read the Arrow table without copying
+    it, and convert only this shard's columns to pandas.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        table = pa.ipc.open_stream(pa.py_buffer(shm.buf)).read_all()
+        results = [func(table.column(col).to_pandas().rename(col), **kwargs) for col in columns]
+        del table
+        return results
+    finally:
+        try:
+            shm.close()
+        except BufferError:
+            # A zero-copy pandas view may still pin the buffer; the mapping
+            # is released when the worker exits.
+            pass
+
+
+class ColumnProfilingExecutor:
+    """
+    Runs a per-column statistics function over every column of a frame on a
+    process pool.
+
+    The frame is converted once to an Arrow table and published in shared
+    memory; workers attach to it by name and read their shard of columns
+    zero-copy, so the frame itself is never pickled. Results come back in
+    column order. Frames narrower than `min_parallel_columns` are processed
+    inline, where a pool would cost more than it saves, and so are frames
+    Arrow cannot convert (e.g. object columns mixing strings and numbers).
+    """
+
+    def __init__(self, n_jobs: int = -1, min_parallel_columns: int = 64):
+        self.n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+        self.min_parallel_columns = min_parallel_columns
+
+    def map(self, df: pd.DataFrame, func, **kwargs) -> list:
+        if self.n_jobs <= 1 or df.shape[1] < self.min_parallel_columns:
+            return [func(df[col], **kwargs) for col in df.columns]
+
+        renamed = df.copy(deep=False)
+        renamed.columns = [str(col) for col in df.columns]
+        try:
+            table = pa.Table.from_pandas(renamed, preserve_index=False)
+        except (pa.ArrowTypeError, pa.ArrowInvalid) as e:
+            # Mixed-type object columns have no Arrow type; profile them in-process.
+            print(f"Arrow conversion failed ({e}); profiling columns inline.")
+            return [func(df[col], **kwargs) for col in df.columns]
+        shm = _to_shared_memory(table)
+        del table
+        try:
+            n_shards = min(self.n_jobs * 4, df.shape[1])
+            shards = [list(part) for part in np.array_split(np.asarray(renamed.columns, dtype=object), n_shards)]
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+                futures = [executor.submit(_run_shard, shm.name, shard, func, kwargs) for shard in shards]
+                return [stats for future in futures for stats in future.result()]
+        finally:
+            shm.close()
+            shm.unlink()
@@ -1,15 +1,19 @@
 import pandas as pd
 from ports.training_port import TrainingPort
+from application.clustering import ClusteringEngine
+from application.tracing import tracer
 
 # PyCaret tasks
-from pycaret.classification import setup as class_setup, compare_models as class_compare, get_config as class_config
-from pycaret.regression import setup as reg_setup, compare_models as reg_compare, get_config as reg_config
-from pycaret.clustering import setup as clus_setup, create_model as clus_create, get_config as clus_config
+from pycaret.classification import setup as class_setup, compare_models as class_compare, get_config as class_config, pull as class_pull
+from pycaret.regression import setup as reg_setup, compare_models as reg_compare, get_config as reg_config, pull as reg_pull
 
 import seaborn as sns
 import matplotlib.pyplot as plt
 
 class PyCaretAdapter(TrainingPort):
+    # Grade completa do último compare_models (pull()), não só o melhor modelo
+    leaderboard = None
+
     def train_model(self, df: pd.DataFrame, target: str, task_type: str):
         """
         Faz análise exploratória, seleção de variáveis e treinamento de modelos com PyCaret.
@@ -31,25 +35,36 @@ class PyCaretAdapter(TrainingPort):
         print("\n⚙️ Iniciando Setup com PyCaret...")
 
         if task_type == "classification":
-            class_setup(data=df, target=target, session_id=123, html=False, silent=True, verbose=False)
+            with tracer.span("setup", task_type=task_type) as span:
+                span.set_frame(df)
+                class_setup(data=df, target=target, session_id=123, html=False, silent=True, verbose=False)
+            print(f"⏱️ Setup: {span.duration:.1f}s")
             print("🔍 Variáveis selecionadas:", class_config("X").columns.tolist())
-            best_model = class_compare()
-            print("✅ Melhor modelo de Classificação:", best_model)
+            with tracer.span("compare_models", task_type=task_type) as span:
+                best_model = class_compare()
+            self.leaderboard = class_pull()
+            print(f"✅ Melhor modelo de Classificação ({span.duration:.1f}s):", best_model)
             return best_model
 
         elif task_type == "regression":
-            reg_setup(data=df, target=target, session_id=123, html=False, silent=True, verbose=False)
+            with tracer.span("setup", task_type=task_type) as span:
+                span.set_frame(df)
+                reg_setup(data=df, target=target, session_id=123, html=False, silent=True, verbose=False)
+            print(f"⏱️ Setup: {span.duration:.1f}s")
             print("🔍 Variáveis selecionadas:", reg_config("X").columns.tolist())
-            best_model = reg_compare()
-            print("✅ Melhor modelo de Regressão:", best_model)
+            with tracer.span("compare_models", task_type=task_type) as span:
+                best_model = reg_compare()
+            self.leaderboard = reg_pull()
+            print(f"✅ Melhor modelo de Regressão ({span.duration:.1f}s):", best_model)
             return best_model
 
         elif task_type == "clustering":
-            clus_setup(data=df, session_id=123, html=False, silent=True, verbose=False)
-            print("🔍 Variáveis utilizadas:", clus_config("X").columns.tolist())
-            best_model = clus_create("kmeans")
-            print("✅ Modelo de Clustering criado:", best_model)
-            return best_model
+            with tracer.span("cluster") as span:
+                span.set_frame(df)
+                clustering = ClusteringEngine().fit(df)
+            print("🔍 Variáveis utilizadas:", clustering.encoder.feature_names)
+            print(f"✅ Modelo de Clustering criado com k={clustering.k} ({span.duration:.1f}s):", clustering.model)
+            return clustering
 
         else:
             raise ValueError("❌ task_type inválido. Escolha entre: classification, regression ou clustering.")
\ No newline at end of file
@@ -0,0 +1,116 @@
+# adapters/sklearn_training_adapter.py
+import numpy as np
+import pandas as pd
+
+from ports.training_port import TrainingPort
+from application.candidates import candidate_estimators
+from application.clustering import ClusteringEngine, FeatureEncoder
+from application.data_prep import NullHandler, missing_mask
+from application.fold_cache import FoldCache
+from application.leaderboard_store import LeaderboardStore
+from application.meta_learning import WarmStartSelector, meta_features
+from application.tuning import HyperparameterTuner
+
+
+class TrainedModel:
+    """
+    A fitted estimator together with the preprocessing it was trained with,
+    so it can score raw frames: NullHandler -> FeatureEncoder -> estimator.
+    """
+
+    def __init__(self, null_handler: NullHandler, encoder: FeatureEncoder, estimator,
+                 task_type: str, target: str, leaderboard: pd.DataFrame = None, fold_results: dict = None):
+        self.null_handler = null_handler
+        self.encoder = encoder
+        self.estimator = estimator
+        self.task_type = task_type
+        self.target = target
+        self.leaderboard = leaderboard
+        self.fold_results = fold_results or {}
+
+    @property
+    def features(self) -> list:
+        return self.null_handler.columns
+
+    def transform(self, df: pd.DataFrame) -> tuple:
+        prepared, valid_rows = self.null_handler.transform(df)
+        return self.encoder.transform(prepared), valid_rows
+
+    def predict(self, df: pd.DataFrame) -> pd.Series:
+        """Predictions aligned with `df`; rows the null handler can't use get None."""
+        X, valid_rows = self.transform(df)
+        predictions = pd.Series(None, index=df.index, dtype=object)
+        if valid_rows.any():
+            predictions[valid_rows] = self.estimator.predict(X[valid_rows])
+        return predictions
+
+    def __repr__(self) -> str:
+        return f"TrainedModel({type(self.estimator).__name__}, task_type={self.task_type!r})"
+
+
+class SklearnTrainingAdapter(TrainingPort):
+    """
+    Headless training without PyCaret: the same fold-cached comparison and
+    optional tuning the Streamlit page runs after setup(), on features
+    prepared by NullHandler and FeatureEncoder. Comparisons are recorded in
+    (and reused from) the leaderboard store; with warm_start, only the
+    candidates that won on similar past datasets are compared and tuning
+    starts from their best parameters. Returns a TrainedModel
+    (or a ClusteringResult for clustering), both of which can be pickled
+    and score raw frames.
+    """
+
+    def __init__(self, include: list = None, tune: bool = False, n_trials: int = 20,
+                 time_budget: float = 300, n_splits: int = 5, random_state: int = 123, n_jobs: int = -1,
+                 leaderboard_store: LeaderboardStore = None, warm_start: bool = False, shortlist_size: int = 3):
+        self.include = include
+        self.tune = tune
+        self.n_trials = n_trials
+        self.time_budget = time_budget
+        self.n_splits = n_splits
+        self.random_state = random_state
+        self.n_jobs = n_jobs
+        self.leaderboard_store = leaderboard_store or LeaderboardStore()
+        self.warm_start = warm_start
+        self.shortlist_size = shortlist_size
+
+    def train_model(self, df: pd.DataFrame, target: str, task_type: str):
+        if task_type == "clustering":
+            return ClusteringEngine(random_state=self.random_state).fit(df)
+        if task_type not in ("classification", "regression"):
+            raise ValueError("task_type must be classification, regression or clustering.")
+
+        features = [col for col in df.columns if col != target]
+        null_handler = NullHandler().fit(df, features)
+        prepared, valid_rows = null_handler.transform(df)
+        valid_rows &= ~missing_mask(df, [target])
+        if not valid_rows.all():
+            prepared = prepared[valid_rows]
+        encoder = FeatureEncoder().fit(prepared)
+        X = encoder.transform(prepared)
+        y = df[target].to_numpy()[valid_rows]
+        if task_type == "classification":
+            y = y.astype(str)
+        else:
+            y = y.astype(np.float64)
+
+        fold_cache = FoldCache(X, y, task_type, n_splits=self.n_splits, random_state=self.random_state)
+        candidates = candidate_estimators(task_type, include=self.include, random_state=self.random_state)
+        meta = meta_features(df, target, task_type)
+        selector = WarmStartSelector(self.leaderboard_store) if self.warm_start else None
+        if selector:
+            candidates = selector.shortlist(meta, task_type, candidates, self.shortlist_size)
+        leaderboard, fold_results = fold_cache.compare(candidates, store=self.leaderboard_store,
+                                                       meta_features=meta)
+        best = candidates[leaderboard["ID"].iloc[0]]
+        if self.tune:
+            tuner = HyperparameterTuner(task_type, n_trials=self.n_trials, time_budget=self.time_budget,
+                                        n_jobs=self.n_jobs, n_splits=self.n_splits,
+                                        random_state=self.random_state)
+            seeds = selector.seed_params(meta, task_type, [type(best).__name__]) if selector else None
+            result = tuner.tune_candidates([best], fold_cache=fold_cache, seeds=seeds)[0]
+            self.leaderboard_store.record_tuning(fold_cache.key, result)
+            best = result.estimator
+        print(f"Best model: {type(best).__name__}")
+        return TrainedModel(null_handler, encoder, best.fit(X, y), task_type, target,
+                            leaderboard, fold_results)
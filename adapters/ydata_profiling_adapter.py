@@ -1,10 +1,109 @@
 # adapters/ydata_profiling_adapter.py
+import hashlib
+import json
+import os
+import shutil
+
 from ydata_profiling import ProfileReport
 from ports.profiling_port import ProfilingPort
+from application.fingerprint import dataset_fingerprint
 import pandas as pd
 
+PROFILE_CACHE_FOLDER = os.path.join("data", "profile_cache")
+
+
+def stratified_sample(df: pd.DataFrame, n: int, stratify_by: str = None,
+                      random_state: int = 123) -> pd.DataFrame:
+    """
+    Sample about `n` rows keeping the proportions of `stratify_by`. Without a
+    column, the lowest-cardinality categorical column (2 to 50 values) is used;
+    if there is none, the sample is uniform.
+    """
+    if len(df) <= n:
+        return df
+    if stratify_by is None:
+        candidates = [
+            (df[col].nunique(), col)
+            for col in df.select_dtypes(include=["object", "category", "bool"]).columns
+        ]
+        candidates = [(k, col) for k, col in candidates if 2 <= k <= 50]
+        stratify_by = min(candidates)[1] if candidates else None
+    if stratify_by is None:
+        return df.sample(n=n, random_state=random_state)
+    frac = n / len(df)
+    return df.groupby(stratify_by, group_keys=False, dropna=False).sample(
+        frac=frac, random_state=random_state)
+
+
 class YDataProfilingAdapter(ProfilingPort):
+    """
+    ydata-profiling report with size-aware settings and a report cache.
+
+    - frames above `sample_size` rows are profiled on a stratified sample;
+      the exact row count and the exact per-column missing/distinct counts
+      (cheap vectorized passes over the full frame) go into the report
+    - explorative settings while the profiled frame has at most
+      `explorative_max_cells` cells, minimal settings above that
+    - reports are cached in PROFILE_CACHE_FOLDER by dataset fingerprint and
+      settings, so unchanged data is never profiled twice
+    """
+
+    def __init__(self, output_path: str = "profile_report.html",
+                 title: str = "Data Profiling Report", sample_size: int = 100_000,
+                 explorative_max_cells: int = 2_000_000, stratify_by: str = None,
+                 cache_dir: str = PROFILE_CACHE_FOLDER):
+        self.output_path = output_path
+        self.title = title
+        self.sample_size = sample_size
+        self.explorative_max_cells = explorative_max_cells
+        self.stratify_by = stratify_by
+        self.cache_dir = cache_dir
+
     def generate_report(self, df: pd.DataFrame) -> None:
-        profile = ProfileReport(df, title="Data Profiling Report", explorative=True)
-        profile.to_file("profile_report.html")
-        print("Report generated: profile_report.html")
+        sampled = len(df) > self.sample_size
+        explorative = min(len(df), self.sample_size) * df.shape[1] <= self.explorative_max_cells
+        mode = "explorative" if explorative else "minimal"
+        # Every setting that changes the report's content is part of the key.
+        settings = {
+            "title": self.title,
+            "mode": mode,
+            "explorative_max_cells": self.explorative_max_cells,
+            "sample_size": self.sample_size if sampled else None,
+            "stratify_by": self.stratify_by if sampled else None,
+        }
+        settings_hash = hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:12]
+        key = f"{dataset_fingerprint(df)}-{mode}-{settings_hash}"
+        cached_report = os.path.join(self.cache_dir, f"{key}.html")
+
+        if os.path.exists(cached_report):
+            shutil.copyfile(cached_report, self.output_path)
+            print(f"Report generated (cached): {self.output_path}")
+            return
+
+        data = stratified_sample(df, self.sample_size, self.stratify_by) if sampled else df
+        description = f"{mode.title()} profile of {len(df):,} rows x {df.shape[1]} columns."
+        if sampled:
+            description += f" Statistics computed on a stratified sample of {len(data):,} rows."
+
+        profile = ProfileReport(
+            data,
+            title=self.title,
+            explorative=explorative,
+            minimal=not explorative,
+            dataset={"description": description},
+            variables={"descriptions": self._exact_counts(df) if sampled else {}},
+        )
+        os.makedirs(self.cache_dir, exist_ok=True)
+        profile.to_file(cached_report)
+        shutil.copyfile(cached_report, self.output_path)
+        print(f"Report generated: {self.output_path}")
+
+    @staticmethod
+    def _exact_counts(df: pd.DataFrame) -> dict:
+        missing = df.isna().sum()
+        distinct = df.nunique()
+        return {
+            col: f"Full data: {missing[col]:,} missing ({missing[col] / len(df):.2%}), "
+                 f"{distinct[col]:,} distinct values."
+            for col in df.columns
+        }
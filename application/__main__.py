@@ -0,0 +1,6 @@
+# application/__main__.py
+import sys
+
+from application.cli import main
+
+sys.exit(main())
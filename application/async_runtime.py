@@ -0,0 +1,28 @@
+# application/async_runtime.py
+import asyncio
+import contextvars
+import functools
+import inspect
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+
+async def run_blocking(executor: Executor, func, *args, **kwargs):
+    """
+    Run a blocking call on `executor` (None: the loop's default thread pool)
+    and await its result. On threads the caller's context variables (run id,
+    current span, memory session) travel with the call; a process pool gets
+    a plain picklable call instead.
+    """
+    loop = asyncio.get_running_loop()
+    if isinstance(executor, ProcessPoolExecutor):
+        call = functools.partial(func, *args, **kwargs)
+    else:
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(executor, call)
+
+
+async def call_port(method, *args, executor: Executor = None):
+    """Await an async port method, or run a sync one on `executor`."""
+    if inspect.iscoroutinefunction(method):
+        return await method(*args)
+    return await run_blocking(executor, method, *args)
@@ -0,0 +1,54 @@
+# application/candidates.py
+from sklearn.ensemble import (
+    ExtraTreesClassifier,
+    ExtraTreesRegressor,
+    GradientBoostingClassifier,
+    GradientBoostingRegressor,
+    RandomForestClassifier,
+    RandomForestRegressor,
+)
+from sklearn.linear_model import LinearRegression, LogisticRegression
+
+# Same ids that show_training_page passes to compare_models.
+CANDIDATE_IDS = {
+    "classification": ["lr", "rf", "et", "gbc", "xgboost"],
+    "regression": ["lr", "rf", "et", "gbr", "xgboost"],
+}
+
+
+def candidate_estimators(task_type: str, include: list = None, random_state: int = 123) -> dict:
+    """
+    Build unfitted estimators for the given PyCaret model ids.
+    Ids whose library is not installed (e.g. xgboost) are skipped.
+    """
+    include = include or CANDIDATE_IDS[task_type]
+    classification = task_type == "classification"
+    factories = {
+        "lr": lambda: LogisticRegression(max_iter=1000) if classification else LinearRegression(),
+        "rf": lambda: (RandomForestClassifier if classification else RandomForestRegressor)(
+            random_state=random_state, n_jobs=-1),
+        "et": lambda: (ExtraTreesClassifier if classification else ExtraTreesRegressor)(
+            random_state=random_state, n_jobs=-1),
+        "gbc": lambda: GradientBoostingClassifier(random_state=random_state),
+        "gbr": lambda: GradientBoostingRegressor(random_state=random_state),
+        "xgboost": lambda: _xgboost(classification, random_state),
+    }
+
+    estimators = {}
+    for model_id in include:
+        if model_id not in factories:
+            raise ValueError(f"Unknown model id '{model_id}'.")
+        estimator = factories[model_id]()
+        if estimator is not None:
+            estimators[model_id] = estimator
+    return estimators
+
+
+def _xgboost(classification: bool, random_state: int):
+    try:
+        from xgboost import XGBClassifier, XGBRegressor
+    except ImportError:
+        print("xgboost is not installed; skipping it.")
+        return None
+    cls = XGBClassifier if classification else XGBRegressor
+    return cls(random_state=random_state, n_jobs=-1, verbosity=0)
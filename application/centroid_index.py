@@ -0,0 +1,123 @@
+# application/centroid_index.py
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from application.clustering import ClusteringResult, FeatureEncoder
+
+CLUSTER_INDEX_FOLDER = os.path.join("data", "cluster_index")
+
+
+class CentroidIndex:
+    """
+    Persisted nearest-centroid index for a fitted clustering, saved per
+    dataset and training run (see save/load).
+
+    Holds the encoder, the centroids (with their squared norms precomputed),
+    per-cluster member counts and per-cluster means of the numeric columns,
+    so assigning new rows is one matrix product and every cluster-size
+    question is an array lookup.
+    """
+
+    def __init__(self, encoder: FeatureEncoder, centroids: np.ndarray,
+                 counts: np.ndarray, numeric_means: np.ndarray):
+        self.encoder = encoder
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float64)
+        self.centroid_norms = np.einsum("ij,ij->i", self.centroids, self.centroids)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.total = int(self.counts.sum())
+        self.numeric_means = np.asarray(numeric_means, dtype=np.float64)
+
+        # Position of every one-hot feature, for the single-row fast path.
+        self._n_numeric = len(encoder.numeric_columns)
+        self._onehot_position = {}
+        offset = self._n_numeric
+        for col, values in encoder.categories.items():
+            self._onehot_position[col] = {value: offset + i for i, value in enumerate(values)}
+            offset += len(values)
+        self._n_features = offset
+
+    @classmethod
+    def from_clustering(cls, clustering: ClusteringResult, df: pd.DataFrame) -> "CentroidIndex":
+        k = clustering.k
+        labels = np.asarray(clustering.labels)
+        counts = np.bincount(labels, minlength=k)
+        numeric = df[clustering.encoder.numeric_columns].to_numpy(dtype=np.float64)
+        numeric = np.where(np.isnan(numeric), clustering.encoder.means, numeric)
+        sums = np.zeros((k, numeric.shape[1]))
+        np.add.at(sums, labels, numeric)
+        numeric_means = sums / np.maximum(counts, 1)[:, None]
+        return cls(clustering.encoder, clustering.model.cluster_centers_, counts, numeric_means)
+
+    @property
+    def k(self) -> int:
+        return len(self.centroids)
+
+    @staticmethod
+    def name(cluster: int) -> str:
+        return f"Cluster {cluster}"
+
+    def assign(self, df: pd.DataFrame) -> np.ndarray:
+        """Nearest centroid for every row: argmin of ||c||² - 2·x·c (||x||² is constant per row)."""
+        X = self.encoder.transform(df)
+        return np.argmin(self.centroid_norms - 2.0 * X @ self.centroids.T, axis=1)
+
+    def assign_row(self, row: dict) -> int:
+        """Single-row assignment straight from a dict of feature values, without pandas."""
+        x = np.zeros(self._n_features)
+        for i, col in enumerate(self.encoder.numeric_columns):
+            value = row.get(col)
+            x[i] = self.encoder.means[i] if value is None or value != value else float(value)
+        x[:self._n_numeric] = (x[:self._n_numeric] - self.encoder.means) / self.encoder.scales
+        for col, positions in self._onehot_position.items():
+            position = positions.get(str(row.get(col)))
+            if position is not None:
+                x[position] = 1.0
+        return int(np.argmin(self.centroid_norms - 2.0 * (self.centroids @ x)))
+
+    def size(self, cluster: int) -> int:
+        return int(self.counts[cluster])
+
+    def share(self, cluster: int) -> float:
+        return self.counts[cluster] / self.total if self.total else 0.0
+
+    def profile(self, cluster: int) -> pd.Series:
+        """Mean of each numeric column among the members of `cluster`."""
+        return pd.Series(self.numeric_means[cluster], index=self.encoder.numeric_columns)
+
+    @staticmethod
+    def _dataset_dir(dataset_name: str, root: str) -> str:
+        return os.path.join(root, dataset_name.replace("/", "__"))
+
+    def save(self, dataset_name: str, run_id: str, root: str = CLUSTER_INDEX_FOLDER) -> str:
+        """
+        Store the index under <root>/<dataset>/<run_id>/ and mark it as the
+        dataset's latest, so runs and datasets never overwrite each other.
+        """
+        dataset_dir = self._dataset_dir(dataset_name, root)
+        folder = os.path.join(dataset_dir, run_id)
+        os.makedirs(folder, exist_ok=True)
+        np.savez(os.path.join(folder, "centroids.npz"), centroids=self.centroids,
+                 counts=self.counts, numeric_means=self.numeric_means)
+        with open(os.path.join(folder, "encoder.json"), "w", encoding="utf-8") as f:
+            json.dump(self.encoder.to_dict(), f)
+        tmp_path = os.path.join(dataset_dir, f"LATEST.{run_id}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(run_id)
+        os.replace(tmp_path, os.path.join(dataset_dir, "LATEST"))
+        return folder
+
+    @classmethod
+    def load(cls, dataset_name: str, run_id: str = None, root: str = CLUSTER_INDEX_FOLDER) -> "CentroidIndex":
+        """The index saved by `run_id` (default: the dataset's latest); FileNotFoundError if there is none."""
+        dataset_dir = cls._dataset_dir(dataset_name, root)
+        if run_id is None:
+            with open(os.path.join(dataset_dir, "LATEST"), encoding="utf-8") as f:
+                run_id = f.read().strip()
+        folder = os.path.join(dataset_dir, run_id)
+        arrays = np.load(os.path.join(folder, "centroids.npz"))
+        with open(os.path.join(folder, "encoder.json"), encoding="utf-8") as f:
+            encoder = FeatureEncoder.from_dict(json.load(f))
+        return cls(encoder, arrays["centroids"], arrays["counts"], arrays["numeric_means"])
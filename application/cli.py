@@ -0,0 +1,235 @@
+# application/cli.py
+"""
+Headless entry point: runs download -> ingest -> profile -> train -> score
+as a DAG of cached stages (see application.pipeline).
+
+    python -m application run --kaggle zaheenhamidani/ultimate-spotify-tracks-db \\
+        --table SpotifyFeatures --target genre --task classification
+    python -m application run --csv data/SpotifyFeatures.csv --target popularity --task regression
+    python -m application status --name SpotifyFeatures
+    python -m application batch jobs.json --cpus 8 --memory-gb 24
+
+Stages are skipped when their inputs are unchanged; profile and train run
+concurrently once the data is ingested. `batch` runs the pipelines of several
+datasets side by side within a CPU/memory budget (see application.orchestrator).
+"""
+import argparse
+import json
+import os
+import pickle
+import sys
+
+from application.dataset_store import new_run_id
+from application.pipeline import PIPELINE_FOLDER, Pipeline, Stage
+from application.structured_logging import configure_logging
+from application.use_cases import MLUseCases
+
+MODELS_FOLDER = os.path.join("data", "models")
+SCORES_FOLDER = os.path.join("data", "scores")
+REPORTS_FOLDER = os.path.join("data", "reports")
+STAGES = ["download", "ingest", "profile", "train", "score"]
+
+
+def file_signature(path: str) -> dict:
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def pipeline_name(args) -> str:
+    return args.name or (args.kaggle.replace("/", "__") if args.kaggle else
+                         os.path.splitext(os.path.basename(args.csv))[0])
+
+
+def build_pipeline(args) -> Pipeline:
+    """Wire the adapters and MLUseCases into the stages for one dataset."""
+    # Imported here so `status` does not pay for loading the adapters.
+    from adapters.native_profiling_adapter import NativeProfilingAdapter
+    from adapters.parquet_ingestion_adapter import PARQUET_FOLDER, ParquetIngestionAdapter
+    from adapters.sklearn_training_adapter import SklearnTrainingAdapter
+
+    name = pipeline_name(args)
+    kaggle = None
+    if args.kaggle:
+        from adapters.kaggle_downloader_adapter import KaggleDownloaderAdapter
+        kaggle = KaggleDownloaderAdapter()
+        kaggle.authenticate()
+    ingestion = ParquetIngestionAdapter(kaggle.download_manager if kaggle else None)
+    use_cases = MLUseCases(
+        dataset_adapter=ingestion,
+        profiler_adapter=NativeProfilingAdapter(output_path=os.path.join(REPORTS_FOLDER, name, "profile.html")),
+        dtale_adapter=None,
+        training_adapter=SklearnTrainingAdapter(include=args.models, tune=args.tune, time_budget=args.time_budget,
+                                                n_jobs=args.n_jobs, warm_start=args.warm_start,
+                                                shortlist_size=args.shortlist),
+        data_folder=PARQUET_FOLDER,
+    )
+    dataset_dir = os.path.join(PARQUET_FOLDER, name)
+
+    def pick_table(inputs: dict) -> str:
+        """Dataset name of the table to use, relative to the Parquet folder."""
+        tables = inputs["ingest"]["tables"]
+        table = args.table or sorted(tables)[0]
+        if table not in tables:
+            raise ValueError(f"Table '{table}' not found; available: {sorted(tables)}.")
+        return os.path.relpath(tables[table], PARQUET_FOLDER)
+
+    def download(inputs):
+        manifest = kaggle.download_manager.fetch(args.kaggle)
+        files = [{"name": f["name"], "sha256": f["sha256"]} for f in manifest["files"]]
+        return {"last_updated": manifest["last_updated"], "files": files,
+                "paths": [kaggle.download_manager.object_path(f["sha256"]) for f in files]}
+
+    def ingest(inputs):
+        if args.kaggle:
+            tables = []
+            for f in inputs["download"]["files"]:
+                tables += ingestion.ingest_file(kaggle.download_manager.object_path(f["sha256"]),
+                                                f["name"], dataset_dir, f["sha256"])
+            source = [f["sha256"] for f in inputs["download"]["files"]]
+        else:
+            table_dir = os.path.join(dataset_dir, ingestion._table_name(args.csv))
+            source = file_signature(args.csv)
+            ingestion.ingest_csv(args.csv, table_dir, json.dumps(source))
+            tables = [table_dir]
+        # The table paths stay the same across versions; `source` tells them apart.
+        return {"tables": {os.path.basename(t): t for t in tables}, "source": source, "paths": tables}
+
+    def profile(inputs):
+        table = pick_table(inputs)
+        use_cases.profile_data(table)
+        report = use_cases.profiler_adapter.output_path
+        return {"table": table, "report": report, "paths": [report]}
+
+    def train(inputs):
+        table = pick_table(inputs)
+        run_id = new_run_id(name)
+        model = use_cases.train_model(table, args.target, args.task, run_id=run_id)
+        model_path = os.path.join(MODELS_FOLDER, name, f"{run_id}.pkl")
+        os.makedirs(os.path.dirname(model_path), exist_ok=True)
+        with open(model_path, "wb") as f:
+            pickle.dump(model, f)
+        pin = use_cases.dataset_store.pinned(run_id)
+        return {"table": table, "run_id": run_id, "dataset_version": pin["version"],
+                "model": model_path, "paths": [model_path]}
+
+    def score(inputs):
+        with open(inputs["train"]["model"], "rb") as f:
+            model = pickle.load(f)
+        output_path = os.path.join(SCORES_FOLDER, name, f"{inputs['train']['run_id']}.parquet")
+        use_cases.score(pick_table(inputs), model, output_path)
+        return {"predictions": output_path, "paths": [output_path]}
+
+    training = {"target": args.target, "task": args.task, "models": args.models, "tune": args.tune,
+                "table": args.table, "warm_start": args.warm_start, "shortlist": args.shortlist}
+    stages = [
+        Stage("ingest", ingest, deps=("download",) if args.kaggle else (),
+              watch=None if args.kaggle else (lambda: file_signature(args.csv))),
+        Stage("profile", profile, deps=("ingest",), params={"table": args.table}),
+        Stage("train", train, deps=("ingest",), params=training),
+        Stage("score", score, deps=("ingest", "train")),
+    ]
+    if args.kaggle:
+        max_age = 0 if args.refresh else None
+        stages.insert(0, Stage("download", download, params={"dataset": args.kaggle},
+                               watch=lambda: kaggle.get_dataset_metadata(args.kaggle, max_age)["last_updated"]))
+    return Pipeline(name, stages, max_workers=args.workers)
+
+
+def validate_run_args(args) -> str:
+    """Error message for an incomplete `run` (or batch job), None when it can run."""
+    if not args.kaggle and not args.csv:
+        return "Pass --kaggle <owner/dataset> or --csv <path>."
+    if args.task != "clustering" and not args.target:
+        return "--target is required for classification and regression."
+    return None
+
+
+def run_command(args) -> int:
+    error = validate_run_args(args)
+    if error:
+        print(error)
+        return 2
+    pipeline = build_pipeline(args)
+    targets = [s for s in (args.only or STAGES) if s in pipeline.stages]
+    report = pipeline.run(targets, force=tuple(args.force or ()))
+    for stage in STAGES:
+        if stage in report:
+            print(f"{stage:<10} {report[stage]['status']}")
+    return 1 if any(r["status"] in ("failed", "blocked") for r in report.values()) else 0
+
+
+def status_command(args) -> int:
+    state_dir = os.path.join(PIPELINE_FOLDER, args.name)
+    if not os.path.isdir(state_dir):
+        print(f"No pipeline state for '{args.name}'.")
+        return 1
+    for stage in STAGES:
+        path = os.path.join(state_dir, f"{stage}.json")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+            print(f"{stage:<10} {state['fingerprint']}  {state['duration']:8.1f}s  {state['output']}")
+    return 0
+
+
+def batch_command(args) -> int:
+    from application.orchestrator import Orchestrator
+
+    with open(args.jobs, encoding="utf-8") as f:
+        jobs = json.load(f)
+    orchestrator = Orchestrator(cpus=args.cpus, memory_gb=args.memory_gb, default_cpus=args.job_cpus,
+                                default_memory_gb=args.job_memory_gb)
+    result = orchestrator.run(jobs)
+    if not result["leaderboard"].empty:
+        print(result["leaderboard"].groupby("dataset").head(1).to_string(index=False))
+    return 1 if any(job["failed"] for job in result["summary"]["jobs"]) else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m application", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the pipeline for one dataset")
+    source = run.add_mutually_exclusive_group()
+    source.add_argument("--kaggle", help="Kaggle dataset (owner/name)")
+    source.add_argument("--csv", help="local CSV file")
+    run.add_argument("--name", help="pipeline name (default: derived from the source)")
+    run.add_argument("--table", help="table to use when the dataset has several CSV files")
+    run.add_argument("--target", help="target column")
+    run.add_argument("--task", choices=["classification", "regression", "clustering"], default="classification")
+    run.add_argument("--models", nargs="+", help="candidate model ids (default: all)")
+    run.add_argument("--tune", action="store_true", help="tune the best candidate")
+    run.add_argument("--time-budget", type=float, default=300, help="tuning budget in seconds")
+    run.add_argument("--warm-start", action="store_true",
+                     help="compare only the models that won on similar past datasets, seeding tuning from them")
+    run.add_argument("--shortlist", type=int, default=3, help="models compared with --warm-start")
+    run.add_argument("--only", nargs="+", choices=STAGES, help="run only these stages (and their dependencies)")
+    run.add_argument("--force", nargs="+", choices=STAGES, help="re-run these stages even if unchanged")
+    run.add_argument("--refresh", action="store_true", help="ignore the cached Kaggle metadata")
+    run.add_argument("--workers", type=int, default=4, help="stages run concurrently")
+    run.add_argument("--n-jobs", type=int, default=-1, help="processes for tuning (default: all CPUs)")
+    run.set_defaults(func=run_command)
+
+    status = commands.add_parser("status", help="show the stored state of a pipeline")
+    status.add_argument("--name", required=True)
+    status.set_defaults(func=status_command)
+
+    batch = commands.add_parser("batch", help="run the pipelines of several datasets within a CPU/memory budget")
+    batch.add_argument("jobs", help='JSON list of jobs, e.g. [{"kaggle": "...", "target": "...", "cpus": 2}]')
+    batch.add_argument("--cpus", type=int, help="CPUs shared by all jobs (default: all)")
+    batch.add_argument("--memory-gb", type=float, help="memory shared by all jobs (default: 80%% of RAM)")
+    batch.add_argument("--job-cpus", type=int, default=2, help="CPUs of a job that does not set its own")
+    batch.add_argument("--job-memory-gb", type=float, default=4.0, help="memory of a job that does not set its own")
+    batch.set_defaults(func=batch_command)
+    return parser
+
+
+def main(argv=None) -> int:
+    configure_logging()
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+# application/clustering.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.metrics import calinski_harabasz_score, silhouette_score
+
+SELECTION_METHODS = ("silhouette", "calinski_harabasz", "elbow")
+
+
+class FeatureEncoder:
+    """
+    Minimal, numpy-only preprocessing for clustering: numeric columns are
+    mean-imputed and standardized, categorical columns are one-hot encoded
+    over their `max_categories` most frequent values (the rest map to all zeros).
+    Small enough to serialize and to apply to a single row without a pipeline.
+    """
+
+    def __init__(self, max_categories: int = 20):
+        self.max_categories = max_categories
+        self.numeric_columns = []
+        self.means = np.empty(0)
+        self.scales = np.empty(0)
+        self.categories = {}
+
+    def fit(self, df: pd.DataFrame) -> "FeatureEncoder":
+        numeric = df.select_dtypes(include=[np.number])
+        self.numeric_columns = numeric.columns.tolist()
+        self.means = numeric.mean().to_numpy(dtype=np.float64)
+        scales = numeric.std().to_numpy(dtype=np.float64)
+        self.scales = np.where((scales > 0) & np.isfinite(scales), scales, 1.0)
+        self.categories = {
+            col: df[col].astype(str).value_counts().index[:self.max_categories].tolist()
+            for col in df.columns if col not in self.numeric_columns
+        }
+        return self
+
+    @property
+    def feature_names(self) -> list:
+        names = list(self.numeric_columns)
+        for col, values in self.categories.items():
+            names.extend(f"{col}_{value}" for value in values)
+        return names
+
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
+        numeric = df[self.numeric_columns].to_numpy(dtype=np.float64)
+        numeric = np.where(np.isnan(numeric), self.means, numeric)
+        parts = [(numeric - self.means) / self.scales]
+        for col, values in self.categories.items():
+            codes = pd.Categorical(df[col].astype(str), categories=values).codes
+            onehot = np.zeros((len(df), len(values)))
+            rows = np.flatnonzero(codes >= 0)
+            onehot[rows, codes[rows]] = 1.0
+            parts.append(onehot)
+        return np.hstack(parts)
+
+    def to_dict(self) -> dict:
+        return {
+            "max_categories": self.max_categories,
+            "numeric_columns": self.numeric_columns,
+            "means": self.means.tolist(),
+            "scales": self.scales.tolist(),
+            "categories": self.categories,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FeatureEncoder":
+        encoder = cls(data["max_categories"])
+        encoder.numeric_columns = data["numeric_columns"]
+        encoder.means = np.asarray(data["means"], dtype=np.float64)
+        encoder.scales = np.asarray(data["scales"], dtype=np.float64)
+        encoder.categories = data["categories"]
+        return encoder
+
+
+def _evaluate_k(X_fit, X_score, k, batch_size, random_state):
+    """Fit MiniBatchKMeans for one k on the sample and score it (runs in a worker)."""
+    model = MiniBatchKMeans(n_clusters=k, init="k-means++", n_init=3,
+                            batch_size=batch_size, random_state=random_state)
+    model.fit(X_fit)
+    score_labels = model.predict(X_score)
+    n_labels = len(np.unique(score_labels))
+    return {
+        "k": k,
+        "inertia": float(model.inertia_),
+        "silhouette": float(silhouette_score(X_score, score_labels)) if 1 < n_labels < len(X_score) else np.nan,
+        "calinski_harabasz": float(calinski_harabasz_score(X_score, score_labels)) if n_labels > 1 else np.nan,
+    }
+
+
+def elbow_k(ks, inertias) -> int:
+    """
+    Kneedle-style elbow: normalize the inertia curve and take the k farthest
+    below the straight line joining its first and last points.
+    """
+    ks = np.asarray(ks, dtype=np.float64)
+    inertias = np.asarray(inertias, dtype=np.float64)
+    if len(ks) < 3:
+        return int(ks[0])
+    x = (ks - ks[0]) / (ks[-1] - ks[0])
+    span = inertias[0] - inertias[-1]
+    y = (inertias - inertias[-1]) / span if span > 0 else np.zeros_like(inertias)
+    distance = (1 - x) - y
+    return int(ks[int(np.argmax(distance))])
+
+
+class ClusteringResult:
+    def __init__(self, encoder: FeatureEncoder, model, k: int, selection: str,
+                 scores: pd.DataFrame, labels: np.ndarray):
+        self.encoder = encoder
+        self.model = model
+        self.k = k
+        self.selection = selection
+        self.scores = scores
+        self.labels = labels
+
+    @staticmethod
+    def cluster_names(labels) -> np.ndarray:
+        # Same labels PyCaret's assign_model produces.
+        return np.char.add("Cluster ", np.asarray(labels).astype(str))
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        return self.cluster_names(self.model.predict(self.encoder.transform(df)))
+
+
+class ClusteringEngine:
+    """
+    Scalable k-means with automatic k selection.
+
+    Each k in `k_range` is fitted with MiniBatchKMeans (k-means++ init) on a
+    random sample of at most `sample_size` rows, the candidates are evaluated
+    in parallel, and silhouette / Calinski-Harabasz are computed on a smaller
+    `score_sample_size` sample (silhouette is O(n²)). The k picked by
+    `selection` ("silhouette", "calinski_harabasz" or "elbow") is then
+    refitted on all rows with MiniBatchKMeans.
+    """
+
+    def __init__(self, k_range=range(2, 11), selection: str = "silhouette",
+                 sample_size: int = 50000, score_sample_size: int = 5000,
+                 batch_size: int = 4096, n_jobs: int = -1, random_state: int = 123):
+        if selection not in SELECTION_METHODS:
+            raise ValueError(f"selection must be one of {SELECTION_METHODS}.")
+        self.k_range = list(k_range)
+        self.selection = selection
+        self.sample_size = sample_size
+        self.score_sample_size = score_sample_size
+        self.batch_size = batch_size
+        self.n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+        self.random_state = random_state
+
+    def fit(self, df: pd.DataFrame) -> ClusteringResult:
+        encoder = FeatureEncoder().fit(df)
+        X = encoder.transform(df)
+        rng = np.random.default_rng(self.random_state)
+        X_fit = X[rng.choice(len(X), self.sample_size, replace=False)] if len(X) > self.sample_size else X
+        X_score = X_fit[rng.choice(len(X_fit), self.score_sample_size, replace=False)] \
+            if len(X_fit) > self.score_sample_size else X_fit
+
+        ks = [k for k in self.k_range if 1 < k < len(X_fit)]
+        if not ks:
+            raise ValueError("Not enough rows for the requested k range.")
+        args = [(X_fit, X_score, k, self.batch_size, self.random_state) for k in ks]
+        if self.n_jobs == 1 or len(ks) == 1:
+            rows = [_evaluate_k(*a) for a in args]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(ks))) as executor:
+                rows = list(executor.map(_evaluate_k, *zip(*args)))
+        scores = pd.DataFrame(rows)
+
+        if self.selection == "elbow":
+            k = elbow_k(scores["k"], scores["inertia"])
+        else:
+            k = int(scores.loc[scores[self.selection].idxmax(), "k"])
+        print(f"Selected k={k} by {self.selection}.")
+
+        model = MiniBatchKMeans(n_clusters=k, init="k-means++", n_init=3,
+                                batch_size=self.batch_size, random_state=self.random_state)
+        model.fit(X)
+        return ClusteringResult(encoder, model, k, self.selection, scores, model.predict(X))
@@ -0,0 +1,101 @@
+# application/data_prep.py
+import numpy as np
+import pandas as pd
+
+NUMERIC_STRATEGIES = ("median", "mean", "constant", "drop")
+CATEGORICAL_STRATEGIES = ("most_frequent", "constant", "drop")
+
+
+def missing_mask(df: pd.DataFrame, columns: list = None) -> np.ndarray:
+    """Rows with a missing value in any of `columns`, accumulated column by column."""
+    mask = np.zeros(len(df), dtype=bool)
+    for col in (df.columns if columns is None else columns):
+        mask |= df[col].isna().to_numpy()
+    return mask
+
+
+def _is_numeric(series: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+class NullHandler:
+    """
+    Null-handling stage fitted on the training data and applied identically
+    at prediction time.
+
+    Each column gets a strategy — numeric columns `numeric_strategy`,
+    the others `categorical_strategy`, unless overridden in `strategies` —
+    and the fill values learned by fit(). transform() never copies the
+    frame: columns without missing values are passed through as they are,
+    only columns that need filling get a new array. Rows that can't be
+    used (a missing value in a "drop" column) are reported as a row mask
+    instead of being removed.
+    """
+
+    def __init__(self, numeric_strategy: str = "median", categorical_strategy: str = "most_frequent",
+                 fill_value=None, strategies: dict = None):
+        if numeric_strategy not in NUMERIC_STRATEGIES:
+            raise ValueError(f"numeric_strategy must be one of {NUMERIC_STRATEGIES}.")
+        if categorical_strategy not in CATEGORICAL_STRATEGIES:
+            raise ValueError(f"categorical_strategy must be one of {CATEGORICAL_STRATEGIES}.")
+        self.numeric_strategy = numeric_strategy
+        self.categorical_strategy = categorical_strategy
+        self.fill_value = fill_value
+        self.strategies = dict(strategies or {})
+        self.fill_values = {}
+
+    @property
+    def columns(self) -> list:
+        return list(self.strategies)
+
+    def fit(self, df: pd.DataFrame, columns: list = None) -> "NullHandler":
+        for col in (df.columns if columns is None else columns):
+            series = df[col]
+            numeric = _is_numeric(series)
+            strategy = self.strategies.get(col) or (self.numeric_strategy if numeric else self.categorical_strategy)
+            self.strategies[col] = strategy
+            if strategy == "mean":
+                value = series.mean()
+            elif strategy == "median":
+                value = series.median()
+            elif strategy == "most_frequent":
+                counts = series.value_counts()
+                value = counts.index[0] if len(counts) else self.fill_value
+            elif strategy == "constant":
+                value = self.fill_value if self.fill_value is not None else (0 if numeric else "missing")
+            else:  # drop
+                value = None
+            self.fill_values[col] = value.item() if isinstance(value, np.generic) else value
+        return self
+
+    def valid_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """Rows usable after transform(): no missing value in a "drop" column."""
+        drop_columns = [col for col, strategy in self.strategies.items() if strategy == "drop"]
+        return ~missing_mask(df, drop_columns)
+
+    def transform(self, df: pd.DataFrame) -> tuple:
+        """Return (frame with the fitted columns filled, valid row mask)."""
+        columns = {}
+        for col in self.columns:
+            series = df[col]
+            value = self.fill_values[col]
+            columns[col] = series.fillna(value) if value is not None and series.hasnans else series
+        return pd.DataFrame(columns, index=df.index, copy=False), self.valid_mask(df)
+
+    def fit_transform(self, df: pd.DataFrame, columns: list = None) -> tuple:
+        return self.fit(df, columns).transform(df)
+
+    def to_dict(self) -> dict:
+        return {
+            "numeric_strategy": self.numeric_strategy,
+            "categorical_strategy": self.categorical_strategy,
+            "fill_value": self.fill_value,
+            "strategies": self.strategies,
+            "fill_values": self.fill_values,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "NullHandler":
+        handler = cls(data["numeric_strategy"], data["categorical_strategy"], data["fill_value"], data["strategies"])
+        handler.fill_values = data["fill_values"]
+        return handler
@@ -0,0 +1,246 @@
+# application/dataset_store.py
+import hashlib
+import io
+import json
+import os
+import pickle
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DATASET_STORE_FOLDER = os.path.join("data", "store")
+INDEX_COLUMN = "__index__"
+# Schema metadata of chunks Arrow cannot represent (e.g. object columns
+# mixing strings and numbers), stored as a pickled Series instead.
+PICKLED_CHUNK = b"dataset_store.pickled"
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Unique per writer: threads of one process may write the same chunk or LATEST at once.
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def new_run_id(prefix: str = None) -> str:
+    """Run id for pins: timestamp plus a random suffix, so runs started in the same second never collide."""
+    run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    return f"{prefix}-{run_id}" if prefix else run_id
+
+
+def segment_bounds(index: pd.Index, avg_rows: int = 65_536, min_rows: int = 4_096,
+                   max_rows: int = 262_144) -> list:
+    """
+    Content-defined row segments: a segment ends after every row whose index
+    label hashes to 0 modulo `avg_rows`. Boundaries depend on the labels, not
+    on positions, so deleting or appending rows only changes the segments
+    that contain them. Returns [(start, stop), ...] positions.
+    """
+    n = len(index)
+    if n == 0:
+        return []
+    hashes = pd.util.hash_pandas_object(index, index=False).to_numpy()
+    candidates = np.flatnonzero(hashes % np.uint64(avg_rows) == 0) + 1
+
+    bounds, start = [], 0
+    for stop in list(candidates) + [n]:
+        while stop - start > max_rows:
+            bounds.append((start, start + max_rows))
+            start += max_rows
+        if stop - start >= min_rows or (stop == n and stop > start):
+            bounds.append((start, int(stop)))
+            start = int(stop)
+    return bounds
+
+
+def chunk_id(series: pd.Series) -> str:
+    """Content address of one column segment: name, dtype and values."""
+    digest = hashlib.sha256(f"{series.name}|{series.dtype}|".encode())
+    digest.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class DatasetStore:
+    """
+    Versioned, content-addressed dataset storage under DATASET_STORE_FOLDER.
+
+    A frame is cut into row segments (see segment_bounds) and each column of
+    each segment — plus the index — is stored once as a small Parquet object
+    named by its sha256 (objects/ab/cdef....parquet); segments Arrow cannot
+    convert are pickled into the Parquet object instead. A version is a JSON
+    manifest listing those chunk ids, so:
+
+    - committing an edited frame only writes the column segments that changed;
+      everything else is shared with the previous versions
+    - snapshots are cheap (one manifest) and checkout can read a subset of columns
+    - training runs pin the exact version they used (pins/<run_id>.json)
+
+    Manifests and objects are written atomically, so concurrent commits never
+    overwrite each other: each one becomes its own version.
+    """
+
+    def __init__(self, folder: str = DATASET_STORE_FOLDER, avg_rows: int = 65_536):
+        self.folder = folder
+        self.avg_rows = avg_rows
+
+    # -- paths ---------------------------------------------------------------
+
+    def _object_path(self, chunk: str) -> str:
+        return os.path.join(self.folder, "objects", chunk[:2], f"{chunk[2:]}.parquet")
+
+    def _dataset_dir(self, dataset_name: str) -> str:
+        return os.path.join(self.folder, "datasets", dataset_name.replace("/", "__"))
+
+    def _manifest_path(self, dataset_name: str, version: str) -> str:
+        return os.path.join(self._dataset_dir(dataset_name), "versions", f"{version}.json")
+
+    def _pin_path(self, run_id: str) -> str:
+        return os.path.join(self.folder, "pins", f"{run_id}.json")
+
+    # -- objects -------------------------------------------------------------
+
+    def _put_chunk(self, series: pd.Series) -> tuple:
+        """Store one column segment if it is new; returns (chunk id, bytes written)."""
+        chunk = chunk_id(series)
+        path = self._object_path(chunk)
+        if os.path.exists(path):
+            return chunk, 0
+        try:
+            table = pa.Table.from_pandas(series.to_frame(), preserve_index=False)
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            # Keep the exact values and dtypes; checkout unpickles it.
+            table = pa.table({"pickle": [pickle.dumps(series, protocol=pickle.HIGHEST_PROTOCOL)]},
+                             metadata={PICKLED_CHUNK: b"1"})
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer)
+        _write_atomic(path, buffer.getvalue())
+        return chunk, buffer.tell()
+
+    def _get_chunk(self, chunk: str) -> pd.Series:
+        table = pq.read_table(self._object_path(chunk))
+        if PICKLED_CHUNK in (table.schema.metadata or {}):
+            return pickle.loads(table.column(0)[0].as_py())
+        return table.to_pandas().iloc[:, 0]
+
+    # -- versions ------------------------------------------------------------
+
+    def commit(self, dataset_name: str, df: pd.DataFrame, message: str = "", parent: str = None) -> str:
+        """
+        Store `df` as a version of `dataset_name` and return its version id.
+        Committing content identical to an existing version returns that version.
+        """
+        parent = parent or self.latest(dataset_name)
+        index = pd.Series(df.index.to_numpy(), name=INDEX_COLUMN)
+        segments, written = [], 0
+        for start, stop in segment_bounds(df.index, self.avg_rows, max(self.avg_rows // 16, 1),
+                                          self.avg_rows * 4):
+            chunks = {}
+            for col in [INDEX_COLUMN] + list(df.columns):
+                series = index.iloc[start:stop] if col == INDEX_COLUMN else df[col].iloc[start:stop]
+                chunks[str(col)], n_bytes = self._put_chunk(series.reset_index(drop=True).rename(str(col)))
+                written += n_bytes
+            segments.append({"rows": stop - start, "chunks": chunks})
+
+        columns = [str(col) for col in df.columns]
+        version = hashlib.sha256(
+            json.dumps({"columns": columns, "segments": segments}, sort_keys=True).encode()
+        ).hexdigest()[:16]
+        manifest_path = self._manifest_path(dataset_name, version)
+        if not os.path.exists(manifest_path):
+            manifest = {
+                "dataset": dataset_name,
+                "version": version,
+                "parent": parent,
+                "message": message,
+                "created_at": time.time(),
+                "rows": len(df),
+                "columns": columns,
+                "index_name": df.index.name,
+                "segments": segments,
+            }
+            _write_atomic(manifest_path, json.dumps(manifest).encode())
+            print(f"Committed version {version} of '{dataset_name}' ({written:,} new bytes).")
+        _write_atomic(os.path.join(self._dataset_dir(dataset_name), "LATEST"), version.encode())
+        return version
+
+    def manifest(self, dataset_name: str, version: str) -> dict:
+        with open(self._manifest_path(dataset_name, version), encoding="utf-8") as f:
+            return json.load(f)
+
+    def latest(self, dataset_name: str) -> str:
+        path = os.path.join(self._dataset_dir(dataset_name), "LATEST")
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip()
+
+    def checkout(self, dataset_name: str, version: str = None, columns: list = None) -> pd.DataFrame:
+        """Rebuild a stored version (default: latest), optionally only some columns."""
+        version = version or self.latest(dataset_name)
+        if version is None:
+            raise FileNotFoundError(f"No versions stored for '{dataset_name}'.")
+        manifest = self.manifest(dataset_name, version)
+        columns = manifest["columns"] if columns is None else [str(c) for c in columns]
+
+        parts = []
+        for segment in manifest["segments"]:
+            chunks = segment["chunks"]
+            part = pd.DataFrame({col: self._get_chunk(chunks[col]) for col in columns})
+            part.index = pd.Index(self._get_chunk(chunks[INDEX_COLUMN]), name=manifest["index_name"])
+            parts.append(part)
+        if not parts:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(parts) if len(parts) > 1 else parts[0]
+
+    def datasets(self) -> list:
+        folder = os.path.join(self.folder, "datasets")
+        if not os.path.isdir(folder):
+            return []
+        return sorted(os.listdir(folder))
+
+    def versions(self, dataset_name: str) -> list:
+        """Stored versions, oldest first: [{"version", "parent", "created_at", "rows", "message"}]."""
+        folder = os.path.join(self._dataset_dir(dataset_name), "versions")
+        if not os.path.isdir(folder):
+            return []
+        versions = []
+        for file_name in os.listdir(folder):
+            manifest = self.manifest(dataset_name, os.path.splitext(file_name)[0])
+            versions.append({key: manifest[key] for key in ("version", "parent", "created_at", "rows", "message")})
+        return sorted(versions, key=lambda v: v["created_at"])
+
+    def storage(self, dataset_name: str) -> dict:
+        """Chunks referenced by all versions of a dataset vs. unique chunks actually stored."""
+        referenced, unique_bytes = 0, {}
+        for v in self.versions(dataset_name):
+            for segment in self.manifest(dataset_name, v["version"])["segments"]:
+                for chunk in segment["chunks"].values():
+                    referenced += 1
+                    if chunk not in unique_bytes:
+                        unique_bytes[chunk] = os.path.getsize(self._object_path(chunk))
+        return {"referenced_chunks": referenced, "unique_chunks": len(unique_bytes),
+                "stored_bytes": sum(unique_bytes.values())}
+
+    # -- pins ----------------------------------------------------------------
+
+    def pin(self, run_id: str, dataset_name: str, version: str, **info) -> str:
+        """Record that training run `run_id` used `version` of `dataset_name`."""
+        pin = {"run_id": run_id, "dataset": dataset_name, "version": version, "pinned_at": time.time(), **info}
+        path = self._pin_path(run_id)
+        _write_atomic(path, json.dumps(pin, default=str).encode())
+        return path
+
+    def pinned(self, run_id: str) -> dict:
+        with open(self._pin_path(run_id), encoding="utf-8") as f:
+            return json.load(f)
+
+    def checkout_run(self, run_id: str, columns: list = None) -> pd.DataFrame:
+        """Exact training input of a pinned run."""
+        pin = self.pinned(run_id)
+        return self.checkout(pin["dataset"], pin["version"], columns=columns)
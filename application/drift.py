@@ -0,0 +1,204 @@
+# application/drift.py
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2_contingency, kstwobign
+
+from application.fingerprint import dataset_fingerprint
+
+DRIFT_FOLDER = os.path.join("data", "drift")
+
+# A numeric column is summarized by its quantiles on this grid, which is
+# enough to rebuild an approximate CDF for PSI and KS without the raw data.
+QUANTILE_GRID = np.linspace(0, 1, 101)
+TOP_CATEGORIES = 100
+OTHER = "__other__"
+PSI_THRESHOLD = 0.2
+P_VALUE_THRESHOLD = 0.05
+
+
+def sketch_column(series: pd.Series) -> dict:
+    """Compact, JSON-serializable summary of one column."""
+    missing = int(series.isna().sum())
+    values = series.dropna()
+    sketch = {"count": int(len(values)), "missing": missing}
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        array = values.to_numpy(dtype=np.float64)
+        array = array[np.isfinite(array)]
+        sketch["kind"] = "numeric"
+        sketch["quantiles"] = np.quantile(array, QUANTILE_GRID).tolist() if len(array) else []
+    else:
+        counts = values.astype(str).value_counts()
+        sketch["kind"] = "categorical"
+        sketch["counts"] = {str(k): int(v) for k, v in counts.head(TOP_CATEGORIES).items()}
+        sketch["counts"][OTHER] = int(counts.iloc[TOP_CATEGORIES:].sum())
+    return sketch
+
+
+def sketch_dataset(df: pd.DataFrame) -> dict:
+    return {
+        "rows": len(df),
+        "columns": {str(col): sketch_column(df[col]) for col in df.columns},
+    }
+
+
+def _cdf(quantiles: list, x: np.ndarray, side: str = "right") -> np.ndarray:
+    """
+    Approximate CDF at `x` from a quantile sketch.
+
+    Tied quantiles mark a point mass (a zero-inflated or low-cardinality
+    column): the CDF steps there, from the first tied grid level to the
+    last, and is interpolated linearly only between distinct values.
+    side="right" gives P(X <= x); side="left" the limit from the left, P(X < x).
+    """
+    q = np.asarray(quantiles, dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64)
+    values, first = np.unique(q, return_index=True)
+    last = np.searchsorted(q, values, side="right") - 1
+    below, above = QUANTILE_GRID[first], QUANTILE_GRID[last]  # CDF just before / at each value
+
+    k = np.searchsorted(values, x, side="right") - 1  # largest distinct value <= x
+    inside = (k >= 0) & (k < len(values) - 1)
+    k_in = np.clip(k, 0, max(len(values) - 2, 0))
+    if len(values) > 1:
+        x0, x1 = values[k_in], values[k_in + 1]
+        between = above[k_in] + (below[k_in + 1] - above[k_in]) * (x - x0) / (x1 - x0)
+    else:
+        between = np.zeros_like(x)
+    cdf = np.where(k < 0, 0.0, np.where(inside, between, 1.0))
+    on_value = (k >= 0) & (values[np.clip(k, 0, None)] == x)
+    at_value = above if side == "right" else below
+    return np.where(on_value, at_value[np.clip(k, 0, None)], cdf)
+
+
+def _psi(expected: np.ndarray, actual: np.ndarray, eps: float = 1e-4) -> float:
+    expected = np.clip(expected / max(expected.sum(), eps), eps, None)
+    actual = np.clip(actual / max(actual.sum(), eps), eps, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def numeric_drift(reference: dict, current: dict, bins: int = 10) -> dict:
+    ref_q, cur_q = reference["quantiles"], current["quantiles"]
+    if not ref_q or not cur_q:
+        return {"psi": np.nan, "ks": np.nan, "p_value": np.nan}
+
+    # PSI over the reference deciles.
+    edges = np.unique(np.quantile(ref_q, np.linspace(0, 1, bins + 1)))
+    inner = edges[1:-1]
+    ref_props = np.diff(np.concatenate([[0.0], _cdf(ref_q, inner), [1.0]]))
+    cur_props = np.diff(np.concatenate([[0.0], _cdf(cur_q, inner), [1.0]]))
+    psi = _psi(ref_props, cur_props)
+
+    # Two-sample KS on the approximate CDFs, asymptotic p-value. The CDFs are
+    # linear between knots, so the supremum is at a knot or just left of one.
+    grid = np.union1d(ref_q, cur_q)
+    ks = float(max(np.max(np.abs(_cdf(ref_q, grid, side) - _cdf(cur_q, grid, side)))
+                   for side in ("right", "left")))
+    n, m = reference["count"], current["count"]
+    p_value = float(kstwobign.sf(ks * np.sqrt(n * m / (n + m)))) if n and m else np.nan
+    return {"psi": psi, "ks": ks, "p_value": p_value}
+
+
+def _fold_counts(counts: dict, categories: set) -> dict:
+    """`counts` restricted to `categories`, everything else added to OTHER."""
+    folded = {c: counts.get(c, 0) for c in categories}
+    folded[OTHER] = sum(n for c, n in counts.items() if c not in categories)
+    return folded
+
+
+def categorical_drift(reference: dict, current: dict) -> dict:
+    # Each sketch keeps its own top categories; one outside the other side's
+    # top is hidden in that side's OTHER, not absent. Compare only the
+    # categories both sides kept and fold the rest into OTHER on both.
+    shared = (set(reference["counts"]) & set(current["counts"])) - {OTHER}
+    ref_counts = _fold_counts(reference["counts"], shared)
+    cur_counts = _fold_counts(current["counts"], shared)
+    categories = sorted(shared) + [OTHER]
+    ref = np.array([ref_counts[c] for c in categories], dtype=np.float64)
+    cur = np.array([cur_counts[c] for c in categories], dtype=np.float64)
+    keep = (ref + cur) > 0
+    ref, cur = ref[keep], cur[keep]
+    if len(ref) < 2 or ref.sum() == 0 or cur.sum() == 0:
+        return {"psi": np.nan, "chi2": np.nan, "p_value": np.nan}
+    chi2, p_value, _, _ = chi2_contingency(np.vstack([ref, cur]))
+    return {"psi": _psi(ref, cur), "chi2": float(chi2), "p_value": float(p_value)}
+
+
+def compare_sketches(reference: dict, current: dict) -> pd.DataFrame:
+    """Per-column drift between two stored dataset sketches."""
+    rows = []
+    for col, ref in reference["columns"].items():
+        cur = current["columns"].get(col)
+        if cur is None or cur["kind"] != ref["kind"]:
+            rows.append({"column": col, "kind": ref["kind"], "status": "schema change"})
+            continue
+        stats = numeric_drift(ref, cur) if ref["kind"] == "numeric" else categorical_drift(ref, cur)
+        ref_missing = ref["missing"] / max(ref["count"] + ref["missing"], 1)
+        cur_missing = cur["missing"] / max(cur["count"] + cur["missing"], 1)
+        drifted = (stats["psi"] > PSI_THRESHOLD) or (stats["p_value"] < P_VALUE_THRESHOLD)
+        rows.append({
+            "column": col,
+            "kind": ref["kind"],
+            **stats,
+            "missing_delta": cur_missing - ref_missing,
+            "status": "drift" if drifted else "stable",
+        })
+    for col in current["columns"]:
+        if col not in reference["columns"]:
+            rows.append({"column": col, "kind": current["columns"][col]["kind"], "status": "new column"})
+    return pd.DataFrame(rows)
+
+
+class DriftStore:
+    """
+    Keeps one sketch per dataset version under DRIFT_FOLDER/<dataset>/<version>.json,
+    where the version is the content fingerprint of the frame. Drift between
+    any two stored versions is computed from the sketches alone.
+    """
+
+    def __init__(self, folder: str = DRIFT_FOLDER):
+        self.folder = folder
+
+    def _dataset_dir(self, dataset_name: str) -> str:
+        return os.path.join(self.folder, dataset_name.replace("/", "__"))
+
+    def record(self, dataset_name: str, df: pd.DataFrame) -> str:
+        """Store the sketch of this version (once) and return its version id."""
+        version = dataset_fingerprint(df)
+        path = os.path.join(self._dataset_dir(dataset_name), f"{version}.json")
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            sketch = sketch_dataset(df)
+            sketch.update({"version": version, "recorded_at": time.time()})
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(sketch, f)
+            print(f"Recorded version {version} of '{dataset_name}'.")
+        return version
+
+    def datasets(self) -> list:
+        if not os.path.isdir(self.folder):
+            return []
+        return sorted(os.listdir(self.folder))
+
+    def versions(self, dataset_name: str) -> list:
+        """Stored versions, oldest first: [{"version", "recorded_at", "rows"}]."""
+        folder = self._dataset_dir(dataset_name)
+        if not os.path.isdir(folder):
+            return []
+        versions = []
+        for file_name in os.listdir(folder):
+            sketch = self.load(dataset_name, os.path.splitext(file_name)[0])
+            versions.append({"version": sketch["version"], "recorded_at": sketch["recorded_at"],
+                             "rows": sketch["rows"]})
+        return sorted(versions, key=lambda v: v["recorded_at"])
+
+    def load(self, dataset_name: str, version: str) -> dict:
+        with open(os.path.join(self._dataset_dir(dataset_name), f"{version}.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    def compare(self, dataset_name: str, reference_version: str, current_version: str) -> pd.DataFrame:
+        return compare_sketches(self.load(dataset_name, reference_version),
+                                self.load(dataset_name, current_version))
@@ -0,0 +1,144 @@
+# application/edit_log.py
+import json
+import os
+import time
+import warnings
+
+import pandas as pd
+
+from application.fingerprint import dataset_fingerprint
+
+EDITS_FOLDER = os.path.join("data", "edits")
+
+
+def _json_values(series: pd.Series) -> list:
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def compute_delta(source: pd.DataFrame, edited: pd.DataFrame) -> list:
+    """
+    Cell/row/column-level difference between two frames aligned on their index,
+    as a list of replayable operations:
+
+    - {"op": "drop_columns", "columns": [...]}
+    - {"op": "add_column", "column": c, "rows": [...], "values": [...]}
+    - {"op": "drop_rows", "rows": [...]}
+    - {"op": "set", "column": c, "rows": [...], "values": [...]}
+    - {"op": "append_rows", "rows": [...], "records": [...]}
+    """
+    if "index" in edited.columns and "index" not in source.columns:
+        edited = edited.set_index("index")
+        edited.index.name = source.index.name
+
+    ops = []
+    dropped_columns = [c for c in source.columns if c not in edited.columns]
+    if dropped_columns:
+        ops.append({"op": "drop_columns", "columns": dropped_columns})
+
+    dropped_rows = source.index.difference(edited.index)
+    if len(dropped_rows):
+        ops.append({"op": "drop_rows", "rows": dropped_rows.tolist()})
+
+    common_rows = source.index.intersection(edited.index)
+    for col in edited.columns:
+        if col not in source.columns:
+            values = edited.loc[common_rows, col]
+            ops.append({"op": "add_column", "column": col, "rows": common_rows.tolist(),
+                        "values": _json_values(values)})
+            continue
+        before = source.loc[common_rows, col]
+        after = edited.loc[common_rows, col]
+        changed = ~((before == after) | (before.isna() & after.isna())).to_numpy()
+        if changed.any():
+            rows = common_rows[changed]
+            ops.append({"op": "set", "column": col, "rows": rows.tolist(),
+                        "values": _json_values(after[changed])})
+
+    new_rows = edited.index.difference(source.index)
+    if len(new_rows):
+        ops.append({"op": "append_rows", "rows": new_rows.tolist(),
+                    "records": json.loads(edited.loc[new_rows].to_json(orient="records"))})
+    return ops
+
+
+def apply_delta(df: pd.DataFrame, ops: list) -> pd.DataFrame:
+    """Replay operations from compute_delta on `df` (modified in place where possible)."""
+    for op in ops:
+        kind = op["op"]
+        if kind == "drop_columns":
+            df = df.drop(columns=[c for c in op["columns"] if c in df.columns])
+        elif kind == "drop_rows":
+            df = df.drop(index=[r for r in op["rows"] if r in df.index])
+        elif kind in ("set", "add_column"):
+            values = pd.Series(op["values"], index=op["rows"])
+            if kind == "set" and op["column"] in df.columns:
+                try:
+                    values = values.astype(df[op["column"]].dtype)
+                except (TypeError, ValueError):
+                    pass  # the edit changed the column's type; keep the edited values as they are
+            df.loc[op["rows"], op["column"]] = values
+        elif kind == "append_rows":
+            appended = pd.DataFrame(op["records"], index=op["rows"])
+            df = pd.concat([df, appended[[c for c in appended.columns if c in df.columns]]])
+    return df
+
+
+class EditLog:
+    """
+    Append-only JSONL log of edits made to one dataset, stored in EDITS_FOLDER.
+
+    Each Dtale session appends one batch: a header with the timestamp and the
+    fingerprint of the frame it was diffed against, followed by its operations.
+    The base file is never rewritten; apply() replays the batches on load.
+    """
+
+    def __init__(self, dataset_name: str, folder: str = EDITS_FOLDER):
+        self.dataset_name = dataset_name
+        self.path = os.path.join(folder, dataset_name.replace("/", "__") + ".jsonl")
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def record(self, source: pd.DataFrame, edited: pd.DataFrame) -> int:
+        """Diff `edited` against `source` and append the batch; returns the number of operations."""
+        ops = compute_delta(source, edited)
+        if not ops:
+            return 0
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        header = {"op": "batch", "at": time.time(), "base": dataset_fingerprint(source), "size": len(ops)}
+        with open(self.path, "a", encoding="utf-8") as f:
+            for entry in [header] + ops:
+                f.write(json.dumps(entry, default=str) + "\n")
+        return len(ops)
+
+    def batches(self) -> list:
+        if not self.exists():
+            return []
+        batches = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry["op"] == "batch":
+                    batches.append({"header": entry, "ops": []})
+                elif batches:
+                    batches[-1]["ops"].append(entry)
+        return batches
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Replay the batches in order. A batch is only replayed onto the frame it
+        was recorded against (its "base" fingerprint): when the base file was
+        re-downloaded or changed, label-based edits would land on different
+        data, so stale batches are skipped with a warning.
+        """
+        skipped = 0
+        for batch in self.batches():
+            base = batch["header"].get("base")
+            if base is not None and base != dataset_fingerprint(df):
+                skipped += 1
+                continue
+            df = apply_delta(df, batch["ops"])
+        if skipped:
+            warnings.warn(f"{skipped} edit batch(es) of '{self.dataset_name}' were recorded against "
+                          f"different data and were not applied ({self.path}).")
+        return df
@@ -0,0 +1,24 @@
+# application/fingerprint.py
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+
+def dataset_fingerprint(X, y=None) -> str:
+    """
+    Stable content hash of a feature matrix (and optional target).
+    Used to key every on-disk cache that depends on the training data.
+    """
+    h = hashlib.sha1()
+    if isinstance(X, pd.DataFrame):
+        h.update(",".join(map(str, X.columns)).encode())
+        h.update(pd.util.hash_pandas_object(X, index=False).values.tobytes())
+    else:
+        X = np.ascontiguousarray(X)
+        h.update(str(X.shape).encode())
+        h.update(X.tobytes())
+    if y is not None:
+        y = pd.Series(np.asarray(y))
+        h.update(pd.util.hash_pandas_object(y, index=False).values.tobytes())
+    return h.hexdigest()[:16]
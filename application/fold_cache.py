@@ -0,0 +1,218 @@
+# application/fold_cache.py
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import KFold, StratifiedKFold
+
+from application.fingerprint import dataset_fingerprint
+from application.memory_profiler import object_size
+from application.structured_logging import log_event
+
+FOLD_CACHE_FOLDER = os.path.join("data", "fold_cache")
+
+# Leaderboard metrics: display name -> sklearn scorer. Scorers prefixed with
+# "neg_" are reported with their sign flipped (RMSE, MAE).
+METRICS = {
+    "classification": {"Accuracy": "accuracy", "F1": "f1_weighted"},
+    "regression": {"RMSE": "neg_root_mean_squared_error", "MAE": "neg_mean_absolute_error", "R2": "r2"},
+}
+SORT_METRIC = {"classification": "Accuracy", "regression": "RMSE"}
+
+
+def load_fold(path: str, i: int) -> tuple:
+    """
+    Open the matrices of fold `i` as read-only memory maps:
+    (X_train, y_train, X_valid, y_valid). Safe to call from worker processes,
+    which then share the OS page cache instead of receiving pickled copies.
+    """
+    return tuple(
+        np.load(os.path.join(path, f"{name}_{i}.npy"), mmap_mode="r")
+        for name in ("X_train", "y_train", "X_valid", "y_valid")
+    )
+
+
+class FoldCache:
+    """
+    Computes the cross-validation split indices and the per-fold train and
+    validation matrices once per training set and keeps them on disk as
+    .npy files, so every candidate and every tuning trial is scored on
+    exactly the same, already preprocessed folds.
+
+    With a `preprocessor` (an sklearn transformer or pipeline, e.g. PyCaret's
+    setup pipeline), X is the raw training frame and a clone of the
+    preprocessor is fitted on each fold's training rows only, so no
+    validation fold influences its own imputation, encoding or scaling.
+    Without one, X must already be preprocessed; if that preprocessing was
+    fitted on all of X, the CV scores are optimistically biased and
+    `per_fold_preprocessing` (also in leaderboard.attrs) is False.
+    """
+
+    def __init__(self, X, y, task_type: str, n_splits: int = 5,
+                 random_state: int = 123, cache_dir: str = FOLD_CACHE_FOLDER, preprocessor=None):
+        self.X = X
+        self.y = y
+        self.task_type = task_type
+        self.n_splits = n_splits
+        self.random_state = random_state
+        self.cache_dir = cache_dir
+        self.preprocessor = preprocessor
+        # Scores with and without per-fold preprocessing are not comparable: keep them apart.
+        mode = "perfold" if self.per_fold_preprocessing else "shared"
+        self.key = f"{dataset_fingerprint(X, y)}-{task_type}-{n_splits}-{random_state}-{mode}"
+        self._splits = None
+
+    @property
+    def per_fold_preprocessing(self) -> bool:
+        return self.preprocessor is not None
+
+    @classmethod
+    def from_pycaret(cls, get_config, task_type: str, **kwargs) -> "FoldCache":
+        """
+        Build the cache from the active PyCaret setup. PyCaret 3 exposes the
+        raw training set and its preprocessing pipeline, which is refitted per
+        fold. In PyCaret 2 only the already transformed X_train is available
+        (preprocessing fitted on all of it), so those scores carry the bias
+        described in the class docstring.
+        """
+        try:
+            pipeline = get_config("pipeline")
+            X, y = get_config("X_train"), get_config("y_train_transformed")
+        except Exception:
+            print("Warning: PyCaret 2 exposes only pre-transformed data; CV scores include preprocessing leakage.")
+            return cls(get_config("X_train"), get_config("y_train"), task_type, **kwargs)
+        return cls(X, y, task_type, preprocessor=pipeline, **kwargs)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.cache_dir, self.key)
+
+    def splits(self) -> list:
+        """Return the list of (train_idx, valid_idx) pairs, computing them at most once."""
+        if self._splits is not None:
+            return self._splits
+
+        index_file = os.path.join(self.path, "folds.npz")
+        if os.path.exists(index_file):
+            stored = np.load(index_file)
+            self._splits = [(stored[f"train_{i}"], stored[f"valid_{i}"])
+                            for i in range(self.n_splits)]
+            return self._splits
+
+        if self.task_type == "classification":
+            splitter = StratifiedKFold(n_splits=self.n_splits, shuffle=True,
+                                       random_state=self.random_state)
+        else:
+            splitter = KFold(n_splits=self.n_splits, shuffle=True,
+                             random_state=self.random_state)
+        self._splits = list(splitter.split(np.zeros(len(self.y)), np.asarray(self.y)))
+
+        os.makedirs(self.path, exist_ok=True)
+        arrays = {}
+        for i, (train_idx, valid_idx) in enumerate(self._splits):
+            arrays[f"train_{i}"] = train_idx
+            arrays[f"valid_{i}"] = valid_idx
+        np.savez(index_file, **arrays)
+        return self._splits
+
+    def materialize(self, dtype=np.float64) -> str:
+        """
+        Write the per-fold matrices once and return the cache directory.
+        Later calls (and later runs on the same data) are no-ops.
+        """
+        marker = os.path.join(self.path, "matrices.done")
+        if os.path.exists(marker):
+            return self.path
+
+        X = self.X if self.per_fold_preprocessing else np.asarray(self.X, dtype=dtype)
+        y = np.asarray(self.y)
+        if y.dtype == object:
+            # Object arrays cannot be memory-mapped; only the CV scores use
+            # these labels, and they are invariant to the encoding.
+            y = pd.factorize(y)[0]
+
+        for i, (train_idx, valid_idx) in enumerate(self.splits()):
+            if self.per_fold_preprocessing:
+                rows = X.iloc if hasattr(X, "iloc") else X
+                preprocessor = clone(self.preprocessor).fit(rows[train_idx], y[train_idx])
+                X_train = np.asarray(preprocessor.transform(rows[train_idx]), dtype=dtype)
+                X_valid = np.asarray(preprocessor.transform(rows[valid_idx]), dtype=dtype)
+            else:
+                X_train, X_valid = X[train_idx], X[valid_idx]
+            np.save(os.path.join(self.path, f"X_train_{i}.npy"), X_train)
+            np.save(os.path.join(self.path, f"y_train_{i}.npy"), y[train_idx])
+            np.save(os.path.join(self.path, f"X_valid_{i}.npy"), X_valid)
+            np.save(os.path.join(self.path, f"y_valid_{i}.npy"), y[valid_idx])
+        open(marker, "w").close()
+        return self.path
+
+    def fold(self, i: int) -> tuple:
+        self.materialize()
+        return load_fold(self.path, i)
+
+    def cross_validate(self, estimator, metrics: dict = None, model_id: str = None) -> dict:
+        """
+        Fit a clone of `estimator` on every cached fold; returns per-fold metrics
+        and fit times, plus "model_mb", the size of the last fitted model.
+        Each fold's scores are also emitted as a "fold_metrics" event.
+        """
+        metrics = metrics or METRICS[self.task_type]
+        scorers = {name: get_scorer(scoring) for name, scoring in metrics.items()}
+        result = {name: [] for name in metrics}
+        result["fit_time"] = []
+        for i in range(self.n_splits):
+            X_train, y_train, X_valid, y_valid = self.fold(i)
+            model = clone(estimator)
+            started = time.time()
+            model.fit(X_train, y_train)
+            result["fit_time"].append(time.time() - started)
+            for name, scorer in scorers.items():
+                score = float(scorer(model, X_valid, y_valid))
+                result[name].append(-score if metrics[name].startswith("neg_") else score)
+            log_event("fold_metrics", model=model_id or type(estimator).__name__, fold=i,
+                      fit_time=result["fit_time"][-1], cache_key=self.key,
+                      scores={name: values[-1] for name, values in result.items() if name != "fit_time"})
+        result["model_mb"] = object_size(model) / 1024 / 1024
+        return result
+
+    def compare(self, estimators: dict, metrics: dict = None, sort: str = None, store=None,
+                **record_info) -> tuple:
+        """
+        Cross-validate every candidate on the shared folds.
+        Returns (leaderboard DataFrame sorted best first, {model_id: per-fold results}).
+
+        With a LeaderboardStore, candidates already scored on these folds are
+        read back instead of refitted, and the comparison is recorded
+        (record_info: dataset_name, run_id, meta_features); its id is in
+        leaderboard.attrs["comparison_id"].
+        """
+        metrics = metrics or METRICS[self.task_type]
+        sort = sort or SORT_METRIC[self.task_type]
+        fold_results, rows = {}, []
+        for position, (model_id, estimator) in enumerate(estimators.items()):
+            log_event("progress", stage="compare", model=model_id, done=position, total=len(estimators))
+            folds = store.cached_folds(self.key, model_id, estimator, metrics) if store else None
+            if folds is not None:
+                print(f"'{model_id}' already scored on these folds; using stored results.")
+            else:
+                print(f"Cross-validating '{model_id}' on {self.n_splits} cached folds...")
+                folds = self.cross_validate(estimator, metrics, model_id=model_id)
+            fold_results[model_id] = folds
+            row = {"ID": model_id, "Model": type(estimator).__name__}
+            row.update({name: float(np.mean(folds[name])) for name in metrics})
+            row["TT (Sec)"] = float(np.sum(folds["fit_time"]))
+            row["Mem (MB)"] = folds.get("model_mb")
+            rows.append(row)
+
+        leaderboard = pd.DataFrame(rows)
+        leaderboard.attrs["per_fold_preprocessing"] = self.per_fold_preprocessing
+        if not leaderboard.empty:
+            ascending = metrics[sort].startswith("neg_")
+            leaderboard = leaderboard.sort_values(sort, ascending=ascending).reset_index(drop=True)
+            if store is not None:
+                leaderboard.attrs["comparison_id"] = store.record(self, estimators, metrics, sort, leaderboard,
+                                                                  fold_results, **record_info)
+        return leaderboard, fold_results
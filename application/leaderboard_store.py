@@ -0,0 +1,316 @@
+# application/leaderboard_store.py
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+LEADERBOARD_DB = os.path.join("data", "leaderboards.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS comparisons (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dataset_fingerprint TEXT NOT NULL,
+    cache_key TEXT NOT NULL,
+    config_key TEXT NOT NULL,
+    dataset_name TEXT,
+    task_type TEXT NOT NULL,
+    n_rows INTEGER,
+    n_features INTEGER,
+    n_splits INTEGER,
+    sort_metric TEXT,
+    meta_features TEXT,
+    run_id TEXT,
+    leaderboard TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS comparisons_dataset ON comparisons (dataset_fingerprint, config_key);
+CREATE INDEX IF NOT EXISTS comparisons_task ON comparisons (task_type, created_at);
+
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cache_key TEXT NOT NULL,
+    model_id TEXT NOT NULL,
+    model TEXT NOT NULL,
+    params_hash TEXT NOT NULL,
+    params TEXT NOT NULL,
+    metrics_key TEXT NOT NULL,
+    scores TEXT NOT NULL,
+    fit_time REAL,
+    model_mb REAL,
+    created_at REAL NOT NULL,
+    UNIQUE (cache_key, model_id, params_hash, metrics_key)
+);
+
+CREATE TABLE IF NOT EXISTS folds (
+    candidate_id INTEGER NOT NULL REFERENCES candidates (id),
+    fold INTEGER NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (candidate_id, fold, metric)
+);
+
+CREATE TABLE IF NOT EXISTS comparison_candidates (
+    comparison_id INTEGER NOT NULL REFERENCES comparisons (id),
+    candidate_id INTEGER NOT NULL REFERENCES candidates (id),
+    rank INTEGER NOT NULL,
+    PRIMARY KEY (comparison_id, candidate_id)
+);
+
+CREATE TABLE IF NOT EXISTS tuned (
+    cache_key TEXT NOT NULL,
+    model TEXT NOT NULL,
+    params TEXT NOT NULL,
+    score REAL,
+    baseline_score REAL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tuned_model ON tuned (model, cache_key);
+"""
+
+
+def _digest(payload) -> str:
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def estimator_params(estimator) -> dict:
+    """JSON-friendly hyperparameters of an estimator (nested objects as their repr)."""
+    params = estimator.get_params(deep=False) if hasattr(estimator, "get_params") else {}
+    return {key: value if isinstance(value, (int, float, str, bool, type(None))) else repr(value)
+            for key, value in sorted(params.items())}
+
+
+def config_key(task_type: str, n_splits: int, random_state: int, metrics: dict, estimators: dict) -> str:
+    """Identifies a comparison setup: task, folds, metrics and the exact candidate set."""
+    return _digest({
+        "task_type": task_type, "n_splits": n_splits, "random_state": random_state, "metrics": metrics,
+        "candidates": {model_id: _digest(estimator_params(est)) for model_id, est in estimators.items()},
+    })
+
+
+class LeaderboardStore:
+    """
+    SQLite record of every model comparison.
+
+    - candidates: one row per (folds, model id, hyperparameters, metrics)
+      with the mean scores, total fit time and fitted model size; its
+      per-fold values (metrics and fit_time) live in `folds`
+    - comparisons: one row per compare() call, indexed by the dataset
+      fingerprint and the config key, holding the leaderboard as shown
+      and the dataset's meta-features
+    - tuned: the best parameters found by HyperparameterTuner per folds and model
+
+    FoldCache.compare(store=...) cross-validates only the candidates not
+    already stored for the same folds, so re-opening a comparison costs a
+    query instead of a training run. Past comparisons across datasets also
+    serve as priors for model selection (model_stats, and
+    application.meta_learning.WarmStartSelector).
+    """
+
+    def __init__(self, path: str = LEADERBOARD_DB):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """One connection per call (threads and processes may share the file), committed on success."""
+        db = sqlite3.connect(self.path, timeout=30)
+        db.row_factory = sqlite3.Row
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    # --- candidates ----------------------------------------------------
+
+    def cached_folds(self, cache_key: str, model_id: str, estimator, metrics: dict):
+        """Stored per-fold results of this exact candidate on these folds, or None."""
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT id, model_mb FROM candidates WHERE cache_key = ? AND model_id = ? "
+                "AND params_hash = ? AND metrics_key = ?",
+                (cache_key, model_id, _digest(estimator_params(estimator)), _digest(metrics)),
+            ).fetchone()
+            if row is None:
+                return None
+            values = db.execute("SELECT fold, metric, value FROM folds WHERE candidate_id = ? ORDER BY fold",
+                                (row["id"],)).fetchall()
+        folds = {}
+        for value in values:
+            folds.setdefault(value["metric"], []).append(value["value"])
+        folds["model_mb"] = row["model_mb"]
+        return folds
+
+    def _save_candidate(self, db, cache_key: str, model_id: str, estimator, metrics: dict, folds: dict) -> int:
+        params = estimator_params(estimator)
+        scores = {name: float(np.mean(folds[name])) for name in metrics}
+        db.execute(
+            "INSERT OR IGNORE INTO candidates (cache_key, model_id, model, params_hash, params, metrics_key, "
+            "scores, fit_time, model_mb, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (cache_key, model_id, type(estimator).__name__, _digest(params), json.dumps(params),
+             _digest(metrics), json.dumps(scores), float(np.sum(folds["fit_time"])),
+             folds.get("model_mb"), time.time()),
+        )
+        candidate_id = db.execute(
+            "SELECT id FROM candidates WHERE cache_key = ? AND model_id = ? AND params_hash = ? AND metrics_key = ?",
+            (cache_key, model_id, _digest(params), _digest(metrics)),
+        ).fetchone()["id"]
+        db.executemany(
+            "INSERT OR IGNORE INTO folds (candidate_id, fold, metric, value) VALUES (?, ?, ?, ?)",
+            [(candidate_id, i, metric, float(value))
+             for metric in [*metrics, "fit_time"] for i, value in enumerate(folds[metric])],
+        )
+        return candidate_id
+
+    # --- comparisons ---------------------------------------------------
+
+    def record(self, fold_cache, estimators: dict, metrics: dict, sort: str, leaderboard: pd.DataFrame,
+               fold_results: dict, dataset_name: str = None, run_id: str = None,
+               meta_features: dict = None) -> int:
+        """Store a finished comparison (and any new candidates); returns its id."""
+        dataset_fingerprint = fold_cache.key.split("-")[0]
+        key = config_key(fold_cache.task_type, fold_cache.n_splits, fold_cache.random_state, metrics, estimators)
+        with self._connect() as db:
+            cursor = db.execute(
+                "INSERT INTO comparisons (dataset_fingerprint, cache_key, config_key, dataset_name, task_type, "
+                "n_rows, n_features, n_splits, sort_metric, meta_features, run_id, leaderboard, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (dataset_fingerprint, fold_cache.key, key, dataset_name, fold_cache.task_type,
+                 int(np.shape(fold_cache.X)[0]), int(np.shape(fold_cache.X)[1]), fold_cache.n_splits, sort,
+                 json.dumps(meta_features, default=str) if meta_features else None, run_id,
+                 leaderboard.to_json(orient="records"), time.time()),
+            )
+            comparison_id = cursor.lastrowid
+            for rank, model_id in enumerate(leaderboard["ID"]):
+                candidate_id = self._save_candidate(db, fold_cache.key, model_id, estimators[model_id],
+                                                    metrics, fold_results[model_id])
+                db.execute("INSERT OR IGNORE INTO comparison_candidates (comparison_id, candidate_id, rank) "
+                           "VALUES (?, ?, ?)", (comparison_id, candidate_id, rank))
+        return comparison_id
+
+    def history(self, dataset_fingerprint: str = None, task_type: str = None, limit: int = 50) -> pd.DataFrame:
+        """Most recent comparisons first: id, dataset, task, size, best model and when."""
+        query, args = "SELECT * FROM comparisons WHERE 1 = 1", []
+        if dataset_fingerprint:
+            query += " AND dataset_fingerprint = ?"
+            args.append(dataset_fingerprint)
+        if task_type:
+            query += " AND task_type = ?"
+            args.append(task_type)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        args.append(limit)
+        with self._connect() as db:
+            rows = db.execute(query, args).fetchall()
+        return pd.DataFrame([{
+            "id": row["id"],
+            "dataset": row["dataset_name"] or row["dataset_fingerprint"],
+            "task_type": row["task_type"],
+            "rows": row["n_rows"],
+            "features": row["n_features"],
+            "best": (json.loads(row["leaderboard"]) or [{}])[0].get("ID"),
+            "run_id": row["run_id"],
+            "created_at": time.strftime("%Y-%m-%d %H:%M", time.localtime(row["created_at"])),
+        } for row in rows])
+
+    def load(self, comparison_id: int) -> tuple:
+        """(leaderboard, {model_id: per-fold results}) of a stored comparison."""
+        with self._connect() as db:
+            row = db.execute("SELECT * FROM comparisons WHERE id = ?", (comparison_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"No comparison {comparison_id}.")
+            members = db.execute(
+                "SELECT c.id, c.model_id, c.model_mb FROM comparison_candidates m "
+                "JOIN candidates c ON c.id = m.candidate_id WHERE m.comparison_id = ? ORDER BY m.rank",
+                (comparison_id,),
+            ).fetchall()
+            fold_results = {}
+            for member in members:
+                folds = {}
+                for value in db.execute("SELECT metric, value FROM folds WHERE candidate_id = ? ORDER BY fold",
+                                        (member["id"],)):
+                    folds.setdefault(value["metric"], []).append(value["value"])
+                folds["model_mb"] = member["model_mb"]
+                fold_results[member["model_id"]] = folds
+        return pd.DataFrame(json.loads(row["leaderboard"])), fold_results
+
+    def latest(self, dataset_fingerprint: str, config: str = None):
+        """Id of the newest comparison on this data (and config, when given), or None."""
+        query, args = "SELECT id FROM comparisons WHERE dataset_fingerprint = ?", [dataset_fingerprint]
+        if config:
+            query += " AND config_key = ?"
+            args.append(config)
+        with self._connect() as db:
+            row = db.execute(query + " ORDER BY created_at DESC LIMIT 1", args).fetchone()
+        return row["id"] if row else None
+
+    def fold_table(self, comparison_id: int) -> pd.DataFrame:
+        """Long-format per-fold values (model_id, fold, metric, value) of a comparison."""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT c.model_id, f.fold, f.metric, f.value FROM comparison_candidates m "
+                "JOIN candidates c ON c.id = m.candidate_id JOIN folds f ON f.candidate_id = c.id "
+                "WHERE m.comparison_id = ? ORDER BY m.rank, f.metric, f.fold",
+                (comparison_id,),
+            ).fetchall()
+        return pd.DataFrame([dict(row) for row in rows], columns=["model_id", "fold", "metric", "value"])
+
+    def model_stats(self, task_type: str) -> pd.DataFrame:
+        """
+        Per model id across all stored comparisons of a task: how often it
+        was compared and won, its mean rank (0 = best) and mean fit time.
+        """
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT c.model_id, COUNT(*) AS comparisons, SUM(m.rank = 0) AS wins, AVG(m.rank) AS mean_rank, "
+                "AVG(c.fit_time) AS mean_fit_time FROM comparison_candidates m "
+                "JOIN candidates c ON c.id = m.candidate_id JOIN comparisons p ON p.id = m.comparison_id "
+                "WHERE p.task_type = ? GROUP BY c.model_id ORDER BY mean_rank",
+                (task_type,),
+            ).fetchall()
+        return pd.DataFrame([dict(row) for row in rows],
+                            columns=["model_id", "comparisons", "wins", "mean_rank", "mean_fit_time"])
+
+    # --- priors --------------------------------------------------------
+
+    def comparisons_with_meta(self, task_type: str) -> list:
+        """[{"id", "cache_key", "meta_features", "ranking"}] of the comparisons that stored meta-features."""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT id, cache_key, meta_features, leaderboard FROM comparisons "
+                "WHERE task_type = ? AND meta_features IS NOT NULL ORDER BY created_at",
+                (task_type,),
+            ).fetchall()
+        return [{"id": row["id"], "cache_key": row["cache_key"], "meta_features": json.loads(row["meta_features"]),
+                 "ranking": [entry["ID"] for entry in json.loads(row["leaderboard"])]} for row in rows]
+
+    def record_tuning(self, cache_key: str, result) -> None:
+        """Keep the best parameters of a TuningResult for warm-starting later studies."""
+        if not result.best_params:
+            return
+        with self._connect() as db:
+            db.execute(
+                "INSERT INTO tuned (cache_key, model, params, score, baseline_score, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (cache_key, result.name, json.dumps(result.best_params, default=str), result.best_score,
+                 result.baseline_score, time.time()),
+            )
+
+    def tuned_params(self, cache_keys: list, model: str) -> dict:
+        """{cache_key: best params of `model`} for the given folds (latest study per key)."""
+        if not cache_keys:
+            return {}
+        placeholders = ", ".join("?" * len(cache_keys))
+        with self._connect() as db:
+            rows = db.execute(
+                f"SELECT cache_key, params FROM tuned WHERE model = ? AND cache_key IN ({placeholders}) "
+                "ORDER BY created_at",
+                (model, *cache_keys),
+            ).fetchall()
+        return {row["cache_key"]: json.loads(row["params"]) for row in rows}
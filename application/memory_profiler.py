@@ -0,0 +1,187 @@
+# application/memory_profiler.py
+import contextvars
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from application.tracing import current_rss_mb, peak_rss_mb, tracer
+
+MEMORY_REPORT_FOLDER = os.path.join("data", "memory")
+
+_session_id = contextvars.ContextVar("memory_session_id", default="main")
+
+
+def object_size(obj) -> int:
+    """Approximate size in bytes: exact for frames and arrays, pickled size for models."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(obj, pd.DataFrame) else usage)
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(object_size(item) for item in obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(object_size(v) for v in obj.values())
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return sys.getsizeof(obj)
+    try:
+        return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(obj)
+
+
+def largest_objects(namespace, top_n: int = 10) -> list:
+    """[{"key", "type", "bytes"}] for the biggest values of a mapping (e.g. st.session_state)."""
+    sizes = [
+        {"key": str(key), "type": type(value).__name__, "bytes": object_size(value)}
+        for key, value in dict(namespace).items()
+    ]
+    return sorted(sizes, key=lambda s: s["bytes"], reverse=True)[:top_n]
+
+
+class MemoryProfiler:
+    """
+    Opt-in memory accounting per pipeline stage and per session.
+
+    Registered as a tracer hook, so every traced stage (read, setup, compare,
+    predict, ...) is measured while it is enabled: the tracemalloc peak and
+    net allocation of the stage, the top allocation sites from a snapshot at
+    its end, and the process RSS. Results are added to the span attributes
+    and kept here, tagged with the current session, for report().
+
+    tracemalloc is process-wide: stages running at the same time (in other
+    threads or interleaved on an event loop) are counted in each other's
+    peaks. Open stages are tracked by span id, so they may end in any order. Tracing slows Python
+    allocations down noticeably, which is why this is off by default
+    (ML_MEMORY_PROFILE=1 turns it on at startup).
+    """
+
+    def __init__(self, enabled: bool = False, top_n: int = 10, frames: int = 1, keep: int = 500):
+        self.top_n = top_n
+        self.frames = frames
+        self.keep = keep
+        self.records = []
+        self._open = {}  # span id -> {"start", "peak"} of every stage still running
+        self._lock = threading.Lock()
+        self.enabled = False
+        if enabled:
+            self.enable()
+
+    def enable(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self.enabled = True
+        tracer.add_hook(self)
+
+    def disable(self) -> None:
+        self.enabled = False
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def set_session(self, session_id: str) -> None:
+        _session_id.set(session_id)
+
+    def on_start(self, span) -> None:
+        if not self.enabled or not tracemalloc.is_tracing():
+            return
+        with self._lock:
+            current, peak = tracemalloc.get_traced_memory()
+            # Resetting the peak for this stage must not lose the peak of the other open ones.
+            for state in self._open.values():
+                state["peak"] = max(state["peak"], peak)
+            tracemalloc.reset_peak()
+            self._open[span.span_id] = {"start": current, "peak": current}
+
+    def on_end(self, span) -> None:
+        with self._lock:
+            state = self._open.pop(span.span_id, None)
+            if state is None or not tracemalloc.is_tracing():  # not measured, or disabled meanwhile
+                return
+            current, peak = tracemalloc.get_traced_memory()
+            stage_peak = max(state["peak"], peak)
+            for other in self._open.values():
+                other["peak"] = max(other["peak"], stage_peak)
+
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        top = [
+            {"location": str(stat.traceback), "bytes": stat.size, "count": stat.count}
+            for stat in snapshot.statistics("lineno")[:self.top_n]
+        ]
+        record = {
+            "session": _session_id.get(),
+            "stage": span.name,
+            "span_id": span.span_id,
+            "at": time.time(),
+            "duration": span.duration,
+            "rows": span.attributes.get("rows"),
+            "cols": span.attributes.get("cols"),
+            "traced_peak_mb": (stage_peak - state["start"]) / 1024 / 1024,
+            "traced_delta_mb": (current - state["start"]) / 1024 / 1024,
+            "rss_mb": span.attributes.get("rss_mb", current_rss_mb()),
+            "rss_delta_mb": span.attributes.get("rss_delta_mb"),
+            "top_allocations": top,
+        }
+        span.set(traced_peak_mb=round(record["traced_peak_mb"], 1),
+                 traced_delta_mb=round(record["traced_delta_mb"], 1), session=record["session"])
+        with self._lock:
+            self.records.append(record)
+            del self.records[:-self.keep]
+
+    def stage_summary(self) -> pd.DataFrame:
+        """Worst case per stage: max traced peak, max RSS, number of runs."""
+        if not self.records:
+            return pd.DataFrame()
+        df = pd.DataFrame(self.records)
+        return (df.groupby("stage")
+                  .agg(runs=("stage", "size"), traced_peak_mb=("traced_peak_mb", "max"),
+                       traced_delta_mb=("traced_delta_mb", "max"), rss_mb=("rss_mb", "max"),
+                       duration=("duration", "max"))
+                  .sort_values("traced_peak_mb", ascending=False))
+
+    def session_summary(self) -> pd.DataFrame:
+        """Per session: stages run, worst traced peak and the stage responsible, max RSS."""
+        if not self.records:
+            return pd.DataFrame()
+        df = pd.DataFrame(self.records)
+        worst = df.loc[df.groupby("session")["traced_peak_mb"].idxmax(), ["session", "stage"]]
+        summary = df.groupby("session").agg(stages=("stage", "size"), traced_peak_mb=("traced_peak_mb", "max"),
+                                            rss_mb=("rss_mb", "max"))
+        return summary.join(worst.set_index("session").rename(columns={"stage": "worst_stage"}))
+
+    def report(self, session_objects: dict = None, folder: str = MEMORY_REPORT_FOLDER) -> str:
+        """
+        Write a JSON report (per-stage records, stage and session summaries,
+        and the largest objects of `session_objects` per session) and return its path.
+        """
+        report = {
+            "created_at": time.time(),
+            "rss_mb": current_rss_mb(),
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": self.stage_summary().reset_index().to_dict(orient="records"),
+            "sessions": self.session_summary().reset_index().to_dict(orient="records"),
+            "session_objects": {
+                session: largest_objects(objects, self.top_n)
+                for session, objects in (session_objects or {}).items()
+            },
+            "records": self.records,
+        }
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"memory_report_{time.strftime('%Y%m%d-%H%M%S')}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"Memory report written to {path}")
+        return path
+
+
+# Shared with the tracer; enable() it (or set ML_MEMORY_PROFILE=1) to start accounting.
+memory_profiler = MemoryProfiler(enabled=os.environ.get("ML_MEMORY_PROFILE") == "1")
@@ -0,0 +1,141 @@
+# application/meta_learning.py
+import numpy as np
+import pandas as pd
+
+from application.leaderboard_store import LeaderboardStore
+
+# Meta-features compared between datasets, each mapped to a roughly
+# comparable scale (counts in log10) before standardization.
+_SCALED = {
+    "rows": np.log10,
+    "columns": np.log10,
+    "numeric_ratio": None,
+    "max_cardinality": np.log10,
+    "mean_cardinality": np.log10,
+    "missing_ratio": None,
+    "n_classes": np.log10,
+    "minority_ratio": None,
+    "class_entropy": None,
+    "target_skew": lambda v: np.sign(v) * np.log1p(abs(v)),
+}
+
+
+def meta_features(df: pd.DataFrame, target: str = None, task_type: str = None,
+                  sample_rows: int = 100_000) -> dict:
+    """
+    Cheap description of a training frame: size, column types, categorical
+    cardinalities, missingness and the target's class balance (or skew).
+    Pass the raw frame, before imputation, so stored comparisons stay
+    comparable. Statistics other than the row count come from a sample of
+    `sample_rows`.
+    """
+    sample = df.sample(sample_rows, random_state=0) if len(df) > sample_rows else df
+    features = sample.drop(columns=[target]) if target else sample
+    numeric = features.select_dtypes(include=[np.number]).columns
+    categorical = [col for col in features.columns if col not in numeric]
+    cardinalities = [int(features[col].nunique()) for col in categorical]
+    meta = {
+        "rows": len(df),
+        "columns": features.shape[1],
+        "numeric_ratio": len(numeric) / features.shape[1] if features.shape[1] else 0.0,
+        "max_cardinality": max(cardinalities, default=0),
+        "mean_cardinality": float(np.mean(cardinalities)) if cardinalities else 0.0,
+        "missing_ratio": float(features.isna().to_numpy().mean()) if features.size else 0.0,
+    }
+    if target and task_type == "classification":
+        shares = sample[target].value_counts(normalize=True)
+        meta["n_classes"] = len(shares)
+        meta["minority_ratio"] = float(shares.min() / shares.max()) if len(shares) else 0.0
+        meta["class_entropy"] = float(-(shares * np.log(shares)).sum() / np.log(len(shares))) \
+            if len(shares) > 1 else 0.0
+    elif target and task_type == "regression":
+        skew = pd.to_numeric(sample[target], errors="coerce").skew()
+        meta["target_skew"] = 0.0 if pd.isna(skew) else float(skew)
+    return meta
+
+
+def _vector(meta: dict) -> np.ndarray:
+    values = []
+    for name, scale in _SCALED.items():
+        value = float(meta.get(name) or 0.0)
+        values.append(scale(value + 1) if scale is np.log10 else scale(value) if scale else value)
+    return np.array(values)
+
+
+class WarmStartSelector:
+    """
+    Picks likely winners from past comparisons of similar datasets.
+
+    Every comparison recorded with meta-features in the LeaderboardStore is
+    a data point; the `k` nearest to the new dataset (standardized
+    meta-feature distance) vote with their rankings, weighted by similarity.
+    Models those neighbours never tried score as average, and every
+    shortlist reserves a slot for the least-compared remaining model, so
+    new candidates still get evaluated. With fewer than `min_history`
+    comparisons there is no prior and every candidate is kept.
+    """
+
+    def __init__(self, store: LeaderboardStore = None, k: int = 5, min_history: int = 3):
+        self.store = store or LeaderboardStore()
+        self.k = k
+        self.min_history = min_history
+
+    def neighbours(self, meta: dict, task_type: str) -> list:
+        """Past comparisons closest to `meta`, nearest first, each with its "distance"."""
+        history = self.store.comparisons_with_meta(task_type)
+        if len(history) < self.min_history:
+            return []
+        matrix = np.array([_vector(entry["meta_features"]) for entry in history])
+        center, scale = matrix.mean(axis=0), matrix.std(axis=0)
+        scale[scale == 0] = 1.0
+        distances = np.linalg.norm((matrix - center) / scale - (_vector(meta) - center) / scale, axis=1)
+        order = np.argsort(distances)[:self.k]
+        return [{**history[i], "distance": float(distances[i])} for i in order]
+
+    def rank(self, meta: dict, task_type: str, model_ids: list) -> pd.DataFrame:
+        """
+        Expected relative rank (0 = always best, 1 = always last) of each model
+        id among the neighbours, best first; "votes" is how many of them compared it.
+        """
+        neighbours = self.neighbours(meta, task_type)
+        rows = []
+        for model_id in model_ids:
+            weights, ranks = [], []
+            for entry in neighbours:
+                if model_id in entry["ranking"]:
+                    position = entry["ranking"].index(model_id)
+                    ranks.append(position / max(len(entry["ranking"]) - 1, 1))
+                    weights.append(1.0 / (1.0 + entry["distance"]))
+            expected = float(np.average(ranks, weights=weights)) if ranks else 0.5
+            rows.append({"ID": model_id, "expected_rank": expected, "votes": len(ranks)})
+        return pd.DataFrame(rows).sort_values(["expected_rank", "votes"], ascending=[True, False]) \
+            .reset_index(drop=True)
+
+    def shortlist(self, meta: dict, task_type: str, candidates: dict, size: int = 3) -> dict:
+        """
+        The most promising candidates (all of them when there is no history):
+        the best `size - 1` by expected rank plus one exploration slot for the
+        least-compared of the others, so models outside the shortlist keep
+        collecting votes instead of being locked out by earlier shortlists.
+        """
+        ranking = self.rank(meta, task_type, list(candidates))
+        if not ranking["votes"].any() or size >= len(ranking):
+            return candidates
+        chosen = ranking["ID"].head(max(size - 1, 1)).tolist()
+        rest = ranking[~ranking["ID"].isin(chosen)]
+        # Stable sort keeps the rank order among equally explored models.
+        chosen.append(rest.sort_values("votes", kind="mergesort")["ID"].iloc[0])
+        print(f"Warm start: evaluating {chosen} first (of {len(candidates)} candidates).")
+        return {model_id: candidates[model_id] for model_id in chosen}
+
+    def seed_params(self, meta: dict, task_type: str, models: list, per_model: int = 3) -> dict:
+        """{estimator class name: [best params of the nearest tuned runs]}, for HyperparameterTuner seeds."""
+        neighbours = self.neighbours(meta, task_type)
+        cache_keys = [entry["cache_key"] for entry in neighbours]
+        seeds = {}
+        for model in models:
+            tuned = self.store.tuned_params(cache_keys, model)
+            params = [tuned[key] for key in cache_keys if key in tuned][:per_model]
+            if params:
+                seeds[model] = params
+        return seeds
@@ -0,0 +1,183 @@
+# application/orchestrator.py
+import json
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+from application.structured_logging import LOG_FOLDER, log_event
+
+ORCHESTRATOR_FOLDER = os.path.join("data", "orchestrator")
+THREAD_ENV_VARS = ["OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "LOKY_MAX_CPU_COUNT"]
+
+
+def total_memory_gb() -> float:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1024 ** 3
+    except (ValueError, AttributeError, OSError):
+        try:
+            import psutil
+            return psutil.virtual_memory().total / 1024 ** 3
+        except ImportError:
+            return float("inf")
+
+
+def job_argv(job: dict) -> list:
+    """Translate a job spec into `python -m application run` arguments."""
+    argv = ["run"]
+    for key in ("kaggle", "csv", "name", "table", "target", "task", "time_budget"):
+        if job.get(key) is not None:
+            argv += [f"--{key.replace('_', '-')}", str(job[key])]
+    for key in ("models", "only", "force"):
+        if job.get(key):
+            argv += [f"--{key}", *job[key]]
+    for key in ("tune", "warm_start"):
+        if job.get(key):
+            argv.append(f"--{key.replace('_', '-')}")
+    if job.get("shortlist") is not None:
+        argv += ["--shortlist", str(job["shortlist"])]
+    argv += ["--n-jobs", str(job["cpus"])]
+    return argv
+
+
+def _limit_resources(cpus: int, memory_gb: float) -> None:
+    """Runs first in the job process, before numpy/sklearn spin up their thread pools."""
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(cpus)
+    try:
+        import resource
+    except ImportError:  # Windows: only the thread limits apply
+        return
+    limit = int(memory_gb * 1024 ** 3)
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard == resource.RLIM_INFINITY or limit < hard:
+        # Over budget the job gets a MemoryError instead of the whole pod being OOM-killed.
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def run_job(job: dict) -> dict:
+    """Run one dataset's pipeline (in its own process) and return its leaderboard."""
+    _limit_resources(job["cpus"], job["memory_gb"])
+    from application.cli import STAGES, build_parser, build_pipeline, pipeline_name, validate_run_args
+    from application.structured_logging import configure_logging
+    from application.tracing import peak_rss_mb
+
+    args = build_parser().parse_args(job_argv(job))
+    error = validate_run_args(args)
+    if error:
+        raise ValueError(error)
+    name = pipeline_name(args)
+    # One log per job: concurrent processes rotating the same file would clobber each other.
+    configure_logging(path=os.path.join(LOG_FOLDER, "jobs", f"{name}.jsonl"))
+    started = time.time()
+    pipeline = build_pipeline(args)
+    targets = [s for s in (args.only or STAGES) if s in pipeline.stages]
+    report = pipeline.run(targets, force=tuple(args.force or ()))
+
+    leaderboard = []
+    train = report.get("train", {})
+    if train.get("output"):
+        with open(train["output"]["model"], "rb") as f:
+            model = pickle.load(f)
+        if getattr(model, "leaderboard", None) is not None:
+            leaderboard = model.leaderboard.to_dict(orient="records")
+    return {
+        "name": name,
+        "stages": {stage: r["status"] for stage, r in report.items()},
+        "failed": any(r["status"] in ("failed", "blocked") for r in report.values()),
+        "run_id": train["output"]["run_id"] if train.get("output") else None,
+        "leaderboard": leaderboard,
+        "duration": time.time() - started,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+class Orchestrator:
+    """
+    Runs the pipelines of many datasets in parallel, one process per job.
+
+    Every job declares (or inherits) a CPU and a memory budget; a job is
+    started only while the running jobs fit within `cpus` and `memory_gb`,
+    taking the first queued job that fits (a job larger than the whole
+    budget runs alone). Inside its process a job is held to its budget:
+    BLAS/OpenMP/joblib thread counts are set to its CPUs and, on POSIX, its
+    address space is capped at its memory. The leaderboards of all jobs
+    are combined into one report.
+    """
+
+    def __init__(self, cpus: int = None, memory_gb: float = None, default_cpus: int = 2,
+                 default_memory_gb: float = 4.0, output_dir: str = ORCHESTRATOR_FOLDER):
+        self.cpus = cpus or os.cpu_count()
+        self.memory_gb = memory_gb or total_memory_gb() * 0.8
+        self.default_cpus = default_cpus
+        self.default_memory_gb = default_memory_gb
+        self.output_dir = output_dir
+
+    def _with_budget(self, job: dict) -> dict:
+        job = dict(job)
+        job["cpus"] = max(1, min(int(job.get("cpus", self.default_cpus)), self.cpus))
+        job["memory_gb"] = min(float(job.get("memory_gb", self.default_memory_gb)), self.memory_gb)
+        return job
+
+    def run(self, jobs: list) -> dict:
+        queue = [self._with_budget(job) for job in jobs]
+        results, running = [], {}
+        used_cpus, used_memory = 0, 0.0
+        context = multiprocessing.get_context("spawn")  # fresh interpreter: limits apply before imports
+
+        while queue or running:
+            for job in list(queue):
+                fits = used_cpus + job["cpus"] <= self.cpus and used_memory + job["memory_gb"] <= self.memory_gb
+                if fits or not running:
+                    queue.remove(job)
+                    executor = ProcessPoolExecutor(max_workers=1, mp_context=context)
+                    running[executor.submit(run_job, job)] = (job, executor, time.time())
+                    used_cpus += job["cpus"]
+                    used_memory += job["memory_gb"]
+                    log_event("job", status="started", job=job.get("name") or job.get("kaggle") or job.get("csv"),
+                              cpus=job["cpus"], memory_gb=job["memory_gb"])
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                job, executor, started = running.pop(future)
+                executor.shutdown()
+                used_cpus -= job["cpus"]
+                used_memory -= job["memory_gb"]
+                try:
+                    result = future.result()
+                except (Exception, SystemExit) as e:  # MemoryError from the job's limit, bad job args, crashed workers
+                    result = {"name": job.get("name") or job.get("kaggle") or job.get("csv"), "stages": {},
+                              "failed": True, "error": repr(e), "leaderboard": [],
+                              "duration": time.time() - started}
+                result.update(cpus=job["cpus"], memory_gb=job["memory_gb"])
+                print(f"{result['name']}: {'failed' if result['failed'] else 'done'} in {result['duration']:.0f}s")
+                log_event("job", status="failed" if result["failed"] else "done", job=result["name"],
+                          duration=result["duration"])
+                results.append(result)
+        return self._report(results)
+
+    def _report(self, results: list) -> dict:
+        """Write the combined leaderboard (CSV) and the job summaries (JSON)."""
+        rows = [
+            {"dataset": r["name"], "run_id": r.get("run_id"), **row}
+            for r in results for row in r["leaderboard"]
+        ]
+        leaderboard = pd.DataFrame(rows)
+        folder = os.path.join(self.output_dir, time.strftime("%Y%m%d-%H%M%S"))
+        os.makedirs(folder, exist_ok=True)
+        leaderboard_path = os.path.join(folder, "leaderboard.csv")
+        leaderboard.to_csv(leaderboard_path, index=False)
+        summary = {
+            "cpus": self.cpus,
+            "memory_gb": self.memory_gb,
+            "jobs": [{k: v for k, v in r.items() if k != "leaderboard"} for r in results],
+            "best": leaderboard.groupby("dataset").head(1).to_dict(orient="records") if not leaderboard.empty else [],
+        }
+        summary_path = os.path.join(folder, "report.json")
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, default=str)
+        print(f"Combined leaderboard: {leaderboard_path}")
+        return {"leaderboard": leaderboard, "summary": summary, "folder": folder}
@@ -0,0 +1,158 @@
+# application/pipeline.py
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from application.structured_logging import log_event
+from application.tracing import tracer
+
+PIPELINE_FOLDER = os.path.join("data", "pipeline")
+
+
+class Stage:
+    """
+    One cached step of a Pipeline.
+
+    - run(inputs) receives {dependency name: its output} and returns a
+      JSON-serializable dict; any "paths" listed in it must exist for a
+      cached result to be reused
+    - params: settings that change the result (part of the fingerprint)
+    - watch(): optional callable returning extra fingerprint input that
+      lives outside the pipeline (e.g. the remote dataset version)
+    """
+
+    def __init__(self, name: str, run, deps: tuple = (), params: dict = None, watch=None):
+        self.name = name
+        self.run = run
+        self.deps = tuple(deps)
+        self.params = dict(params or {})
+        self.watch = watch
+
+
+def stage_fingerprint(stage: Stage, inputs: dict, dep_fingerprints: dict = None) -> str:
+    """
+    Hash of everything a stage's result depends on. The dependencies' own
+    fingerprints are included, so a change upstream (e.g. a new watch()
+    value) reaches every downstream stage even when the dependency's output
+    looks the same (same table paths for new data).
+    """
+    payload = {
+        "stage": stage.name,
+        "params": stage.params,
+        "inputs": {name: inputs[name] for name in stage.deps},
+        "deps": {name: (dep_fingerprints or {}).get(name) for name in stage.deps},
+        "watch": stage.watch() if stage.watch else None,
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+class Pipeline:
+    """
+    A DAG of stages with fingerprint-based skipping.
+
+    A stage's fingerprint covers its params, its watch() value and the
+    outputs and fingerprints of its dependencies; when it matches the one
+    stored in `state_dir` (and the recorded paths still exist) the stored
+    output is reused instead of running the stage. Stages whose dependencies
+    are done run concurrently on a thread pool.
+    """
+
+    def __init__(self, name: str, stages: list, state_dir: str = PIPELINE_FOLDER, max_workers: int = 4):
+        self.name = name
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_dir = os.path.join(state_dir, name.replace("/", "__"))
+        self.max_workers = max_workers
+        for stage in stages:
+            missing = [dep for dep in stage.deps if dep not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages {missing}.")
+
+    def _state_path(self, stage_name: str) -> str:
+        return os.path.join(self.state_dir, f"{stage_name}.json")
+
+    def _cached(self, stage: Stage, fingerprint: str):
+        path = self._state_path(stage.name)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        output = state.get("output") or {}
+        if state.get("fingerprint") != fingerprint or not all(os.path.exists(p) for p in output.get("paths", [])):
+            return None
+        return output
+
+    def _save(self, stage: Stage, fingerprint: str, output: dict, duration: float) -> None:
+        os.makedirs(self.state_dir, exist_ok=True)
+        tmp_path = self._state_path(stage.name) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "output": output, "finished_at": time.time(),
+                       "duration": duration}, f, indent=2, default=str)
+        os.replace(tmp_path, self._state_path(stage.name))
+
+    def _execute(self, stage: Stage, inputs: dict, dep_fingerprints: dict, force: bool) -> tuple:
+        fingerprint = stage_fingerprint(stage, inputs, dep_fingerprints)
+        cached = None if force else self._cached(stage, fingerprint)
+        if cached is not None:
+            print(f"[{self.name}] {stage.name}: unchanged, skipped.")
+            log_event("stage", pipeline=self.name, stage=stage.name, status="skipped", fingerprint=fingerprint)
+            return cached, "skipped", fingerprint
+        print(f"[{self.name}] {stage.name}: running...")
+        started = time.time()
+        with tracer.span(f"stage.{stage.name}", pipeline=self.name):
+            output = stage.run(inputs) or {}
+        duration = time.time() - started
+        self._save(stage, fingerprint, output, duration)
+        log_event("stage", pipeline=self.name, stage=stage.name, status="ran", fingerprint=fingerprint,
+                  duration=duration)
+        return output, "ran", fingerprint
+
+    def run(self, targets: list = None, force: tuple = ()) -> dict:
+        """
+        Run `targets` (default: every stage) and what they depend on.
+        Stages named in `force` run even when unchanged. Returns
+        {stage: {"status": "ran" | "skipped" | "failed" | "blocked", "output": ...}}.
+        """
+        wanted = set()
+
+        def collect(name):
+            if name not in wanted:
+                wanted.add(name)
+                for dep in self.stages[name].deps:
+                    collect(dep)
+
+        for name in (targets or self.stages):
+            collect(name)
+
+        outputs, fingerprints, report, running = {}, {}, {}, {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                changed = True
+                while changed:  # until no stage can be submitted or marked blocked
+                    changed = False
+                    for name in wanted:
+                        stage = self.stages[name]
+                        if name in report or name in running:
+                            continue
+                        if any(report.get(dep, {}).get("status") in ("failed", "blocked") for dep in stage.deps):
+                            report[name] = {"status": "blocked", "output": None}
+                            changed = True
+                        elif all(dep in outputs for dep in stage.deps):
+                            inputs = {dep: outputs[dep] for dep in stage.deps}
+                            dep_fingerprints = {dep: fingerprints[dep] for dep in stage.deps}
+                            running[name] = executor.submit(self._execute, stage, inputs, dep_fingerprints,
+                                                            name in force)
+                if not running:
+                    break
+                done, _ = wait(running.values(), return_when=FIRST_COMPLETED)
+                for name in [n for n, future in running.items() if future in done]:
+                    future = running.pop(name)
+                    try:
+                        outputs[name], status, fingerprints[name] = future.result()
+                        report[name] = {"status": status, "output": outputs[name]}
+                    except Exception as e:
+                        print(f"[{self.name}] {name}: failed: {e}")
+                        log_event("stage", pipeline=self.name, stage=name, status="failed", error=repr(e))
+                        report[name] = {"status": "failed", "output": None, "error": repr(e)}
+        return report
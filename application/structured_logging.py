@@ -0,0 +1,311 @@
+# application/structured_logging.py
+import atexit
+import contextvars
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+import warnings
+from contextlib import contextmanager
+
+LOG_FOLDER = "logs"
+LOG_FILE = os.path.join(LOG_FOLDER, "app.jsonl")
+APP_LOGGER = "ml_studio"
+EVENTS_LOGGER = f"{APP_LOGGER}.events"
+
+# PyCaret logs through the "logs" logger and resets its handlers on every setup().
+PYCARET_LOGGER = "logs"
+
+_run_id = contextvars.ContextVar("run_id", default=None)
+
+_VARIABLE_PARTS = re.compile(r"0x[0-9a-fA-F]+|\d+(\.\d+)?")
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+def message_fingerprint(record: logging.LogRecord) -> str:
+    """Logger, level and message with numbers/addresses masked, so repeats collapse."""
+    text = _VARIABLE_PARTS.sub("#", record.getMessage().strip())
+    return hashlib.sha1(f"{record.name}|{record.levelno}|{text}".encode()).hexdigest()[:12]
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def set_run_id(run_id: str = None) -> str:
+    """Tag the records of the current context with `run_id` from now on (see run_context)."""
+    _run_id.set(run_id or new_run_id())
+    return _run_id.get()
+
+
+@contextmanager
+def run_context(run_id: str = None):
+    """Tag every record logged inside the block (in this context) with `run_id`."""
+    token = _run_id.set(run_id or new_run_id())
+    try:
+        yield _run_id.get()
+    finally:
+        _run_id.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Adds the correlation id of the current run and the message fingerprint."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run_id = getattr(record, "run_id", None) or _run_id.get()
+        record.fingerprint = message_fingerprint(record)
+        return True
+
+
+class DedupFilter(logging.Filter):
+    """
+    Rate limiting by message fingerprint: at most `burst` records with the
+    same fingerprint pass per `window` seconds. The next record that passes
+    carries the number of repeats that were dropped in between.
+    """
+
+    def __init__(self, burst: int = 3, window: float = 60.0):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "event", None):
+            return True  # metrics and progress events are data, never deduplicated
+        key = getattr(record, "fingerprint", None) or message_fingerprint(record)
+        now = time.monotonic()
+        with self._lock:
+            start, passed, suppressed = self._seen.get(key, (now, 0, 0))
+            if now - start > self.window:
+                start, passed = now, 0
+            if passed >= self.burst:
+                self._seen[key] = (start, passed, suppressed + 1)
+                return False
+            self._seen[key] = (start, passed + 1, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; extra= fields are kept as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage().strip(),
+            "run_id": getattr(record, "run_id", None),
+            "fingerprint": getattr(record, "fingerprint", None),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RedirectFilter(logging.Filter):
+    """
+    Logger-level filter that hands every record to `target` and drops it from
+    the original logger, so handlers a library installs on its own logger
+    (PyCaret's logs.log FileHandler) never see it. Logger filters survive
+    handlers.clear(), unlike handlers.
+    """
+
+    def __init__(self, target: logging.Logger):
+        super().__init__()
+        self.target = target
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.target.isEnabledFor(record.levelno):
+            self.target.handle(record)
+        return False
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues records without ever blocking the caller: when the queue is
+    full the record is dropped and counted instead. Filters attached here
+    (correlation id, dedup) run on the calling thread, where the run id
+    context variable is set.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchWriter(threading.Thread):
+    """
+    Background writer for AsyncQueueHandler: drains up to `batch_size`
+    records at a time (or whatever arrived within `flush_interval`), formats
+    them and writes the batch to the rotating file with one write and one
+    flush, rotating by size between batches.
+    """
+
+    _STOP = object()
+
+    def __init__(self, log_queue: queue.Queue, handler: logging.handlers.RotatingFileHandler,
+                 source: AsyncQueueHandler = None, batch_size: int = 256, flush_interval: float = 0.5):
+        super().__init__(name="log-writer", daemon=True)
+        self.queue = log_queue
+        self.handler = handler
+        self.source = source
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._reported_drops = 0
+
+    def run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = []
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+                while True:
+                    if item is self._STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    item = self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._report_drops(batch)
+            if batch:
+                self._write(batch)
+
+    def _report_drops(self, batch: list) -> None:
+        dropped = self.source.dropped if self.source else 0
+        if dropped > self._reported_drops:
+            batch.append(logging.makeLogRecord({
+                "name": APP_LOGGER, "levelno": logging.WARNING, "levelname": "WARNING",
+                "msg": "log queue full, records dropped", "dropped": dropped - self._reported_drops,
+            }))
+            self._reported_drops = dropped
+
+    def _write(self, batch: list) -> None:
+        handler = self.handler
+        lines = []
+        for record in batch:
+            try:
+                lines.append(handler.format(record) + handler.terminator)
+            except Exception:
+                handler.handleError(record)
+        data = "".join(lines)
+        with handler.lock:
+            if handler.stream is None:
+                handler.stream = handler._open()
+            handler.stream.seek(0, 2)
+            if handler.maxBytes and handler.stream.tell() + len(data.encode("utf-8")) > handler.maxBytes \
+                    and handler.stream.tell() > 0:
+                handler.doRollover()
+            handler.stream.write(data)
+            handler.stream.flush()
+
+    def stop(self) -> None:
+        """Write what is still queued and stop (called at exit)."""
+        if self.is_alive():
+            self.queue.put(self._STOP)
+            self.join()
+        self.handler.close()
+
+
+def build_handler(path: str = LOG_FILE, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                  burst: int = 3, window: float = 60.0) -> logging.Handler:
+    """Size-rotated JSON file handler with correlation ids and deduplication."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                                   encoding="utf-8", delay=True)
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(ContextFilter())
+    handler.addFilter(DedupFilter(burst, window))
+    return handler
+
+
+def build_async_handler(path: str = LOG_FILE, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                        burst: int = 3, window: float = 60.0, max_queue: int = 10_000,
+                        batch_size: int = 256, flush_interval: float = 0.5) -> tuple:
+    """
+    Same output as build_handler, but records go through a bounded queue to
+    a BatchWriter thread. Returns (handler to attach, started writer).
+    """
+    file_handler = build_handler(path, max_bytes, backup_count)
+    file_handler.filters.clear()  # filtering happens on the caller's side of the queue
+    log_queue = queue.Queue(max_queue)
+    handler = AsyncQueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+    handler.addFilter(DedupFilter(burst, window))
+    writer = BatchWriter(log_queue, file_handler, handler, batch_size, flush_interval)
+    writer.start()
+    return handler, writer
+
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def configure_logging(path: str = LOG_FILE, level: int = logging.INFO, max_bytes: int = 10 * 1024 * 1024,
+                      backup_count: int = 5, burst: int = 3, window: float = 60.0,
+                      asynchronous: bool = True) -> logging.Logger:
+    """
+    Route the application, PyCaret and Python warnings (sklearn's
+    UndefinedMetricWarning, FutureWarnings, ...) into one structured,
+    deduplicated JSON log. Safe to call more than once (e.g. on every
+    Streamlit rerun); only the first call configures anything.
+
+    By default records are written by a background thread (see
+    build_async_handler), so logging never does file I/O on the
+    training thread; pass asynchronous=False to write inline.
+    """
+    global _configured
+    app_logger = logging.getLogger(APP_LOGGER)
+    with _configure_lock:
+        if _configured:
+            return app_logger
+        root = logging.getLogger()
+        root.setLevel(level)
+        if asynchronous:
+            handler, writer = build_async_handler(path, max_bytes, backup_count, burst, window)
+            atexit.register(writer.stop)
+        else:
+            handler = build_handler(path, max_bytes, backup_count, burst, window)
+        root.addHandler(handler)
+
+        pycaret_logger = logging.getLogger(PYCARET_LOGGER)
+        pycaret_logger.addFilter(RedirectFilter(logging.getLogger(f"{APP_LOGGER}.pycaret")))
+
+        logging.captureWarnings(True)
+        # Let repeated warnings reach the log; DedupFilter collapses them there.
+        warnings.simplefilter("default")
+        _configured = True
+    return app_logger
+
+
+def get_logger(name: str = None) -> logging.Logger:
+    return logging.getLogger(f"{APP_LOGGER}.{name}" if name else APP_LOGGER)
+
+
+def log_event(event: str, **fields) -> None:
+    """
+    Structured metrics/progress event (e.g. "fold_metrics", "trial", "progress"),
+    written to the same log with the fields as top-level keys.
+    """
+    logging.getLogger(EVENTS_LOGGER).info(event, extra={"event": event, **fields})
@@ -0,0 +1,260 @@
+# application/tracing.py
+import atexit
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+TRACES_FOLDER = os.path.join("data", "traces")
+SERVICE_NAME = "ml-studio"
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (NaN where it can't be read)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+        except ImportError:
+            return float("nan")
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 1024 / 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KB on Linux
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def current_rss_mb() -> float:
+    """Current resident set size in MB (falls back to the peak where it can't be read)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        return peak_rss_mb()
+
+
+class Span:
+    def __init__(self, name: str, trace_id: str, parent_id: str = None, attributes: dict = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.start = time.time()
+        self.end = None
+        self.status = "ok"
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.time()) - self.start
+
+    def set(self, **attributes) -> "Span":
+        self.attributes.update(attributes)
+        return self
+
+    def set_frame(self, df) -> "Span":
+        """Record the shape of the frame this span worked on."""
+        rows, cols = df.shape if len(getattr(df, "shape", ())) == 2 else (len(df), 1)
+        return self.set(rows=int(rows), cols=int(cols))
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "end": self.end,
+            "duration": self.duration,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class JsonlSpanExporter:
+    """Appends one JSON object per finished span to `path`."""
+
+    def __init__(self, path: str = os.path.join(TRACES_FOLDER, "spans.jsonl")):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: list) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+
+class OtlpHttpSpanExporter:
+    """
+    Posts spans as OTLP/HTTP JSON to a local collector (e.g. the OpenTelemetry
+    Collector or Jaeger on port 4318). No OpenTelemetry SDK is needed.
+    """
+
+    def __init__(self, endpoint: str = "http://localhost:4318/v1/traces", timeout: float = 2.0):
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self._warned = False
+
+    @staticmethod
+    def _value(value) -> dict:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def _encode(self, span: Span) -> dict:
+        encoded = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(int(span.start * 1e9)),
+            "endTimeUnixNano": str(int(span.end * 1e9)),
+            "attributes": [{"key": k, "value": self._value(v)} for k, v in span.attributes.items()],
+            "status": {"code": 1 if span.status == "ok" else 2},
+        }
+        if span.parent_id:
+            encoded["parentSpanId"] = span.parent_id
+        return encoded
+
+    def export(self, spans: list) -> None:
+        body = {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": [self._encode(s) for s in spans]}],
+        }]}
+        request = urllib.request.Request(self.endpoint, data=json.dumps(body).encode(),
+                                         headers={"Content-Type": "application/json"})
+        try:
+            urllib.request.urlopen(request, timeout=self.timeout).close()
+        except OSError as e:
+            if not self._warned:
+                print(f"Could not export spans to {self.endpoint}: {e}")
+                self._warned = True
+
+
+class Tracer:
+    """
+    Lightweight tracing for the hot paths (read, setup, compare, finalize,
+    predict, profile, Dtale launch).
+
+    Spans nest through a context variable, carry free-form attributes (rows,
+    cols, ...) plus the process RSS at the end and its change over the span
+    ("rss_mb", "rss_delta_mb"; the process-lifetime peak would only show the
+    largest earlier request in a long-lived server), and are kept in memory
+    for the Streamlit timing panel. Finished spans are batched and handed to
+    the exporters when `batch_size` accumulate, on flush() and at exit.
+
+    Hooks (objects with on_start(span) / on_end(span), e.g. the memory
+    profiler) run around every span and may add attributes to it.
+    """
+
+    def __init__(self, exporters: list = None, batch_size: int = 32, keep: int = 200):
+        self.exporters = list(exporters or [])
+        self.hooks = []
+        self.batch_size = batch_size
+        self.finished = deque(maxlen=keep)
+        self._pending = []
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        parent = _current_span.get()
+        trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        span = Span(name, trace_id, parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        rss_start = current_rss_mb()
+        for hook in self.hooks:
+            hook.on_start(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.set(error=repr(e))
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end = time.time()
+            rss_end = current_rss_mb()
+            span.set(rss_mb=round(rss_end, 1), rss_delta_mb=round(rss_end - rss_start, 1))
+            for hook in reversed(self.hooks):
+                hook.on_end(span)
+            self._finish(span)
+
+    def add_hook(self, hook) -> None:
+        if hook not in self.hooks:
+            self.hooks.append(hook)
+
+    def traced(self, name: str = None):
+        """Decorator form of span()."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name or func.__qualname__):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self.finished.append(span)
+            if not self.exporters:
+                return
+            self._pending.append(span)
+            if len(self._pending) < self.batch_size and span.parent_id is not None:
+                return
+            batch, self._pending = self._pending, []
+        self._export(batch)
+
+    def _export(self, batch: list) -> None:
+        for exporter in self.exporters:
+            exporter.export(batch)
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._export(batch)
+
+    def recent(self, n: int = 20) -> list:
+        """The last `n` finished spans, newest first, as dicts."""
+        return [span.to_dict() for span in list(self.finished)[::-1][:n]]
+
+
+def exporters_from_env() -> list:
+    """
+    ML_TRACE_EXPORTER selects where spans go: "jsonl" (default, data/traces/spans.jsonl),
+    "otlp" (OTEL_EXPORTER_OTLP_ENDPOINT, default http://localhost:4318), both
+    ("jsonl,otlp") or "none".
+    """
+    exporters = []
+    names = os.environ.get("ML_TRACE_EXPORTER", "jsonl").lower().split(",")
+    if "jsonl" in names:
+        exporters.append(JsonlSpanExporter(os.environ.get("ML_TRACE_FILE", os.path.join(TRACES_FOLDER, "spans.jsonl"))))
+    if "otlp" in names:
+        endpoint = os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318").rstrip("/")
+        exporters.append(OtlpHttpSpanExporter(f"{endpoint}/v1/traces"))
+    return exporters
+
+
+# Shared by the use cases, the adapters and the Streamlit app.
+tracer = Tracer(exporters_from_env())
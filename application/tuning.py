@@ -0,0 +1,386 @@
+# application/tuning.py
+import json
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+
+from application.fold_cache import FoldCache, load_fold
+from application.structured_logging import log_event
+
+TUNING_FOLDER = os.path.join("data", "tuning")
+
+
+class IntUniform:
+    def __init__(self, low: int, high: int):
+        self.low, self.high = low, high
+
+    def sample(self, rng):
+        return int(rng.integers(self.low, self.high + 1))
+
+    def perturb(self, value, rng, scale):
+        step = rng.normal(0, scale * (self.high - self.low))
+        return int(np.clip(round(value + step), self.low, self.high))
+
+
+class Uniform:
+    def __init__(self, low: float, high: float):
+        self.low, self.high = low, high
+
+    def sample(self, rng):
+        return float(rng.uniform(self.low, self.high))
+
+    def perturb(self, value, rng, scale):
+        step = rng.normal(0, scale * (self.high - self.low))
+        return float(np.clip(value + step, self.low, self.high))
+
+
+class LogUniform:
+    def __init__(self, low: float, high: float):
+        self.low, self.high = math.log(low), math.log(high)
+
+    def sample(self, rng):
+        return float(math.exp(rng.uniform(self.low, self.high)))
+
+    def perturb(self, value, rng, scale):
+        step = rng.normal(0, scale * (self.high - self.low))
+        return float(math.exp(np.clip(math.log(value) + step, self.low, self.high)))
+
+
+class Choice:
+    def __init__(self, *options):
+        self.options = list(options)
+
+    def sample(self, rng):
+        return self.options[int(rng.integers(len(self.options)))]
+
+    def perturb(self, value, rng, scale):
+        return value if rng.random() > scale * 3 else self.sample(rng)
+
+
+# Search spaces keyed by the estimator class name returned by compare_models.
+SEARCH_SPACES = {
+    "LogisticRegression": {
+        "C": LogUniform(1e-3, 1e2),
+    },
+    "Ridge": {
+        "alpha": LogUniform(1e-3, 1e2),
+    },
+    "RandomForestClassifier": {
+        "n_estimators": IntUniform(50, 500),
+        "max_depth": IntUniform(2, 32),
+        "min_samples_leaf": IntUniform(1, 20),
+        "max_features": Choice("sqrt", "log2", None),
+    },
+    "RandomForestRegressor": {
+        "n_estimators": IntUniform(50, 500),
+        "max_depth": IntUniform(2, 32),
+        "min_samples_leaf": IntUniform(1, 20),
+        "max_features": Choice("sqrt", "log2", 1.0),
+    },
+    "ExtraTreesClassifier": {
+        "n_estimators": IntUniform(50, 500),
+        "max_depth": IntUniform(2, 32),
+        "min_samples_leaf": IntUniform(1, 20),
+        "max_features": Choice("sqrt", "log2", None),
+    },
+    "ExtraTreesRegressor": {
+        "n_estimators": IntUniform(50, 500),
+        "max_depth": IntUniform(2, 32),
+        "min_samples_leaf": IntUniform(1, 20),
+        "max_features": Choice("sqrt", "log2", 1.0),
+    },
+    "GradientBoostingClassifier": {
+        "n_estimators": IntUniform(50, 400),
+        "learning_rate": LogUniform(1e-2, 3e-1),
+        "max_depth": IntUniform(2, 8),
+        "subsample": Uniform(0.5, 1.0),
+    },
+    "GradientBoostingRegressor": {
+        "n_estimators": IntUniform(50, 400),
+        "learning_rate": LogUniform(1e-2, 3e-1),
+        "max_depth": IntUniform(2, 8),
+        "subsample": Uniform(0.5, 1.0),
+    },
+    "XGBClassifier": {
+        "n_estimators": IntUniform(50, 500),
+        "learning_rate": LogUniform(1e-2, 3e-1),
+        "max_depth": IntUniform(2, 10),
+        "subsample": Uniform(0.5, 1.0),
+        "colsample_bytree": Uniform(0.5, 1.0),
+    },
+    "XGBRegressor": {
+        "n_estimators": IntUniform(50, 500),
+        "learning_rate": LogUniform(1e-2, 3e-1),
+        "max_depth": IntUniform(2, 10),
+        "subsample": Uniform(0.5, 1.0),
+        "colsample_bytree": Uniform(0.5, 1.0),
+    },
+}
+
+DEFAULT_SCORING = {
+    "classification": "accuracy",
+    "regression": "neg_root_mean_squared_error",
+}
+
+
+class TrialStore:
+    """Append-only JSONL file with one record per finished trial, so a study can be resumed."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> list:
+        if not os.path.exists(self.path):
+            return []
+        trials = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    trials.append(json.loads(line))
+        return trials
+
+    def append(self, trial: dict) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(trial) + "\n")
+
+
+class TuningResult:
+    def __init__(self, name: str, estimator, best_params: dict, best_score: float,
+                 baseline_score: float, trials: list):
+        self.name = name
+        self.estimator = estimator
+        self.best_params = best_params
+        self.best_score = best_score
+        self.baseline_score = baseline_score
+        self.trials = trials
+
+    @property
+    def n_pruned(self) -> int:
+        return sum(1 for t in self.trials if t["state"] == "pruned")
+
+    def summary(self) -> dict:
+        return {
+            "Modelo": self.name,
+            "Score Original": round(self.baseline_score, 4),
+            "Score Ajustado": round(self.best_score, 4),
+            "Trials": len(self.trials),
+            "Podados": self.n_pruned,
+            "Parâmetros": json.dumps(self.best_params),
+        }
+
+
+# Worker state, filled once per process by _init_worker. Workers open the
+# fold matrices as memory maps, so the training data is never pickled.
+_WORKER = {}
+
+
+def _init_worker(fold_path, n_splits):
+    _WORKER["folds"] = [load_fold(fold_path, i) for i in range(n_splits)]
+
+
+def _run_trial(number, estimator, params, scoring, median_curve, deadline):
+    """
+    Score one parameter set fold by fold and apply the median stopping rule:
+    a trial is pruned as soon as its running mean falls below the median
+    running mean of earlier trials at the same fold.
+    """
+    folds = _WORKER["folds"]
+    scorer = get_scorer(scoring)
+    model = clone(estimator).set_params(**params)
+    if "n_jobs" in model.get_params():
+        model.set_params(n_jobs=1)
+
+    fold_scores = []
+    started = time.time()
+    for i, (X_train, y_train, X_valid, y_valid) in enumerate(folds):
+        if time.time() > deadline:
+            return {"number": number, "params": params, "fold_scores": fold_scores,
+                    "state": "timeout", "duration": time.time() - started}
+        model.fit(X_train, y_train)
+        fold_scores.append(float(scorer(model, X_valid, y_valid)))
+        running_mean = float(np.mean(fold_scores))
+        if i < len(folds) - 1 and i < len(median_curve) and median_curve[i] is not None \
+                and running_mean < median_curve[i]:
+            return {"number": number, "params": params, "fold_scores": fold_scores,
+                    "state": "pruned", "duration": time.time() - started}
+
+    return {"number": number, "params": params, "fold_scores": fold_scores,
+            "score": float(np.mean(fold_scores)), "state": "complete",
+            "duration": time.time() - started}
+
+
+class HyperparameterTuner:
+    """
+    Parallel, early-stopped hyperparameter search over the top candidates of
+    compare_models.
+
+    - strategy="random": independent samples from the search space
+    - strategy="bayesian": TPE-style sampling around the best quantile of the
+      finished trials, after `n_startup_trials` random ones
+    - median-stopping pruning between folds
+    - wall-clock budget shared by all candidates (`time_budget`, seconds)
+    - trials persisted to TUNING_FOLDER, so re-running resumes the study
+    """
+
+    def __init__(self, task_type: str, n_trials: int = 20, time_budget: float = 300,
+                 strategy: str = "bayesian", n_jobs: int = -1, n_splits: int = 5,
+                 n_startup_trials: int = 5, scoring: str = None, random_state: int = 123,
+                 storage_dir: str = TUNING_FOLDER):
+        if strategy not in ("random", "bayesian"):
+            raise ValueError("strategy must be 'random' or 'bayesian'.")
+        self.task_type = task_type
+        self.n_trials = n_trials
+        self.time_budget = time_budget
+        self.strategy = strategy
+        self.n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+        self.n_splits = n_splits
+        self.n_startup_trials = n_startup_trials
+        self.scoring = scoring or DEFAULT_SCORING[task_type]
+        self.random_state = random_state
+        self.storage_dir = storage_dir
+
+    def tune_candidates(self, estimators, X=None, y=None, fold_cache: FoldCache = None,
+                        seeds: dict = None) -> list:
+        """
+        Tune each estimator within one shared time budget; best result first.
+        Pass the FoldCache used for model comparison to reuse its folds, and
+        `seeds` ({estimator class name: [params, ...]}, e.g. from
+        WarmStartSelector.seed_params) to evaluate known-good settings first.
+        """
+        if not isinstance(estimators, (list, tuple)):
+            estimators = [estimators]
+        if fold_cache is None:
+            fold_cache = FoldCache(X, y, self.task_type, n_splits=self.n_splits,
+                                   random_state=self.random_state)
+        deadline = time.time() + self.time_budget
+        results = []
+        for i, estimator in enumerate(estimators):
+            # Split what is left of the budget evenly over the remaining candidates.
+            remaining = max(deadline - time.time(), 0)
+            candidate_deadline = time.time() + remaining / (len(estimators) - i)
+            seed_params = (seeds or {}).get(type(estimator).__name__)
+            results.append(self.tune(estimator, fold_cache, candidate_deadline, seed_params))
+        return sorted(results, key=lambda r: r.best_score, reverse=True)
+
+    def tune(self, estimator, fold_cache: FoldCache, deadline: float, seed_params: list = None) -> TuningResult:
+        name = type(estimator).__name__
+        space = SEARCH_SPACES.get(name, {})
+        store = TrialStore(os.path.join(
+            self.storage_dir,
+            f"{fold_cache.key}-{name}-{self.scoring}-{self.strategy}.jsonl"))
+        trials = store.load()
+        if trials:
+            print(f"Resuming {name} study with {len(trials)} stored trials.")
+
+        fold_path = fold_cache.materialize()
+        rng = np.random.default_rng([self.random_state, len(trials)])
+
+        # Trial 0 always scores the untuned estimator, so tuning never makes things worse.
+        # Seeded params follow it (pop() takes from the end) and count towards n_trials.
+        tried = [t["params"] for t in trials]
+        seeded = []
+        for params in seed_params or []:
+            params = {key: value for key, value in params.items() if key in space}
+            if params and params not in tried and params not in seeded:
+                seeded.append(params)
+        if seeded:
+            print(f"{name}: {len(seeded)} seeded trial(s) from similar runs.")
+        pending_params = seeded[::-1] + ([] if trials else [{}])
+        n_target = len(trials) + (self.n_trials if space else len(pending_params))
+
+        def next_params():
+            if pending_params:
+                return pending_params.pop()
+            return self._sample(space, trials, rng)
+
+        def submit(executor, number):
+            args = (number, estimator, next_params(), self.scoring,
+                    self._median_curve(trials), deadline)
+            return executor.submit(_run_trial, *args)
+
+        next_number = len(trials)
+        if self.n_jobs == 1:
+            _init_worker(fold_path, fold_cache.n_splits)
+            while next_number < n_target and time.time() < deadline:
+                params = next_params()
+                trial = _run_trial(next_number, estimator, params, self.scoring,
+                                   self._median_curve(trials), deadline)
+                next_number += 1
+                self._record(trial, trials, store)
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker,
+                                     initargs=(fold_path, fold_cache.n_splits)) as executor:
+                running = set()
+                # Workers stop on their own at the deadline, so draining `running` is bounded.
+                while running or (next_number < n_target and time.time() < deadline):
+                    while len(running) < self.n_jobs and next_number < n_target \
+                            and time.time() < deadline:
+                        running.add(submit(executor, next_number))
+                        next_number += 1
+                    if not running:
+                        break
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._record(future.result(), trials, store)
+
+        complete = [t for t in trials if t["state"] == "complete"]
+        baseline = next((t for t in complete if not t["params"]), None)
+        best = max(complete, key=lambda t: t["score"]) if complete else {"params": {}, "score": float("nan")}
+        tuned = clone(estimator).set_params(**best["params"])
+        print(f"{name}: best {self.scoring}={best['score']:.4f} after {len(trials)} trials.")
+        return TuningResult(
+            name=name,
+            estimator=tuned,
+            best_params=best["params"],
+            best_score=best["score"],
+            baseline_score=baseline["score"] if baseline else float("nan"),
+            trials=trials,
+        )
+
+    @staticmethod
+    def _record(trial: dict, trials: list, store: TrialStore) -> None:
+        # Runs in the coordinating process, so events go through its log queue, not the workers'.
+        log_event("trial", **{key: value for key, value in trial.items() if key != "fold_scores"},
+                  folds=len(trial.get("fold_scores", [])))
+        # Timed-out trials are incomplete; leave them out so a resumed study re-runs them.
+        if trial["state"] == "timeout":
+            return
+        trials.append(trial)
+        store.append(trial)
+
+    def _median_curve(self, trials: list) -> list:
+        """Median running mean per fold across earlier trials (None until enough trials)."""
+        if len(trials) < self.n_startup_trials:
+            return []
+        curve = []
+        for i in range(max(len(t["fold_scores"]) for t in trials)):
+            running = [float(np.mean(t["fold_scores"][:i + 1]))
+                       for t in trials if len(t["fold_scores"]) > i]
+            curve.append(float(np.median(running)) if running else None)
+        return curve
+
+    def _sample(self, space: dict, trials: list, rng) -> dict:
+        complete = [t for t in trials if t["state"] == "complete" and t["params"]]
+        if self.strategy == "random" or len(complete) < self.n_startup_trials:
+            return {name: dist.sample(rng) for name, dist in space.items()}
+
+        # TPE-style: start from one of the top 25% trials and perturb each
+        # parameter with a bandwidth that shrinks as the study grows.
+        complete.sort(key=lambda t: t["score"], reverse=True)
+        good = complete[:max(1, len(complete) // 4)]
+        anchor = good[int(rng.integers(len(good)))]["params"]
+        scale = max(0.05, 0.3 / math.sqrt(len(complete)))
+        params = {}
+        for name, dist in space.items():
+            if name in anchor and rng.random() < 0.8:
+                params[name] = dist.perturb(anchor[name], rng, scale)
+            else:
+                params[name] = dist.sample(rng)
+        return params
@@ -1,24 +1,79 @@
 # application/use_cases.py
+import asyncio
 import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+
 import pandas as pd
 
 from ports.dataset_port import DatasetPort
 from ports.profiling_port import ProfilingPort
 from ports.dtale_port import DtalePort
 from ports.training_port import TrainingPort
+from application.async_runtime import call_port, run_blocking
+from application.dataset_store import DatasetStore, new_run_id
+from application.drift import DriftStore
+from application.edit_log import EditLog
+from application.structured_logging import get_logger, run_context
+from application.tracing import tracer
+
+logger = get_logger(__name__)
 
 DATA_FOLDER = "data"
 
+
+def read_dataset(path: str) -> pd.DataFrame:
+    """Load a Parquet table directory written by the ingestion stage, or a CSV file."""
+    parquet = os.path.isdir(path)
+    with tracer.span("read_parquet" if parquet else "read_csv", path=path) as span:
+        df = pd.read_parquet(path) if parquet else pd.read_csv(path)
+        span.set_frame(df)
+    return df
+
 class MLUseCases:
     def __init__(self, 
                  dataset_adapter: DatasetPort, 
                  profiler_adapter: ProfilingPort,
                  dtale_adapter: DtalePort,
-                 training_adapter: TrainingPort):
+                 training_adapter: TrainingPort,
+                 drift_store: DriftStore = None,
+                 dataset_store: DatasetStore = None,
+                 data_folder: str = DATA_FOLDER,
+                 executor: Executor = None):
+        """
+        Adapters may implement the sync ports or their Async* variants; the
+        *_async methods await async adapters and run sync ones on `executor`
+        (default: the loop's thread pool). Only the CPU-bound ports
+        (profiling, training) use `executor`; downloads and the use cases'
+        own file work (loading, snapshots, drift sketches) always run on
+        threads: they are I/O-bound and hold state (API clients, this
+        object) that can't be pickled to a process pool.
+        """
         self.dataset_adapter = dataset_adapter
         self.profiler_adapter = profiler_adapter
         self.dtale_adapter = dtale_adapter
         self.training_adapter = training_adapter
+        self.drift_store = drift_store or DriftStore()
+        self.dataset_store = dataset_store or DatasetStore()
+        self.data_folder = data_folder
+        self.executor = executor
+        self.io_executor = None if isinstance(executor, ProcessPoolExecutor) else executor
+
+    def load_dataset(self, csv_filename: str, version: str = None, apply_edits: bool = True) -> pd.DataFrame:
+        """
+        Load a dataset: a stored `version` when given, otherwise the file in
+        data_folder with its recorded edits (if any) replayed.
+        """
+        if version is not None:
+            return self.dataset_store.checkout(csv_filename, version)
+        df = read_dataset(os.path.join(self.data_folder, csv_filename))
+        edit_log = EditLog(csv_filename)
+        if apply_edits and edit_log.exists():
+            df = edit_log.apply(df)
+        return df
+
+    def snapshot(self, csv_filename: str, message: str = "") -> str:
+        """Commit the current state of a dataset to the store; returns the version id."""
+        return self.dataset_store.commit(csv_filename, self.load_dataset(csv_filename), message=message)
 
     def download_dataset(self, kaggle_name: str, output_path: str):
         # pass both arguments to the adapter
@@ -27,26 +82,128 @@ class MLUseCases:
 
     
     def profile_data(self, csv_filename: str):
-        full_path = os.path.join(DATA_FOLDER, csv_filename)
-        df = pd.read_csv(full_path)
-        self.profiler_adapter.generate_report(df)
+        df = self.load_dataset(csv_filename)
+        with tracer.span("profile", adapter=type(self.profiler_adapter).__name__) as span:
+            span.set_frame(df)
+            self.profiler_adapter.generate_report(df)
+        # Keep a compact sketch of this version for later drift checks
+        self.drift_store.record(csv_filename, df)
+    
+    def detect_drift(self, csv_filename: str, reference_version: str = None,
+                     current_version: str = None) -> pd.DataFrame:
+        """Drift between two recorded versions (default: the two most recent)."""
+        versions = [v["version"] for v in self.drift_store.versions(csv_filename)]
+        if len(versions) < 2 and not (reference_version and current_version):
+            raise ValueError(f"Need at least two recorded versions of '{csv_filename}'.")
+        report = self.drift_store.compare(
+            csv_filename,
+            reference_version or versions[-2],
+            current_version or versions[-1],
+        )
+        print(report.to_string(index=False))
+        return report
     
     def edit_data(self, csv_filename: str) -> str:
-        """Launch dtale, then (optionally) store the edited dataset."""
-        full_path = os.path.join(DATA_FOLDER, csv_filename)
-        df = pd.read_csv(full_path)
+        """
+        Launch dtale, then store only what changed: the cell/row/column delta
+        between the loaded and the edited frame is appended to the dataset's
+        edit log and replayed by load_dataset(). The base file is not rewritten.
+        The edited frame is also committed to the dataset store; its version
+        id is returned.
+        """
+        df = self.load_dataset(csv_filename)
         
         new_df = self.dtale_adapter.open_in_dtale(df)
-        # For demonstration, we do not know how to get user edits.
-        # We'll just pretend it's edited in place and re-saved.
-        edited_path = os.path.join(DATA_FOLDER, "edited_data.csv")
-        new_df.to_csv(edited_path, index=False)
-        print(f"Saved (edited) data to {edited_path}")
-        return edited_path
+        edit_log = EditLog(csv_filename)
+        n_ops = edit_log.record(df, new_df)
+        print(f"Saved {n_ops} edit operation(s) to {edit_log.path}")
+        return self.dataset_store.commit(csv_filename, self.load_dataset(csv_filename),
+                                         message=f"dtale edit ({n_ops} operations)")
     
-    def train_model(self, csv_filename: str, target_col: str, task_type: str):
-        full_path = os.path.join(DATA_FOLDER, csv_filename)
-        df = pd.read_csv(full_path)
-        model = self.training_adapter.train_model(df, target_col, task_type)
-        # we simply print or return the model
+    def train_model(self, csv_filename: str, target_col: str, task_type: str,
+                    version: str = None, run_id: str = None):
+        """
+        Train on a stored version of the dataset (default: the current state,
+        committed first) and pin that version to the run for reproducibility.
+        """
+        if version is None:
+            version = self.snapshot(csv_filename)
+        df = self.load_dataset(csv_filename, version=version)
+        run_id = run_id or new_run_id()
+        self.dataset_store.pin(run_id, csv_filename, version, target=target_col, task_type=task_type)
+        print(f"Run {run_id} uses version {version} of '{csv_filename}'.")
+        with run_context(run_id), tracer.span("train_model", task_type=task_type, run_id=run_id) as span:
+            span.set_frame(df)
+            logger.info("training started", extra={"dataset": csv_filename, "dataset_version": version,
+                                                   "task_type": task_type, "rows": len(df)})
+            model = self.training_adapter.train_model(df, target_col, task_type)
+            logger.info("training finished", extra={"model": type(model).__name__})
+        print(f"Training complete. Model object: {model}")
+        return model
+
+    def score(self, csv_filename: str, model, output_path: str, batch_size: int = 250_000) -> str:
+        """Batch-predict a dataset with a trained model and write the predictions as Parquet."""
+        df = self.load_dataset(csv_filename)
+        with tracer.span("predict", model=type(model).__name__) as span:
+            span.set_frame(df)
+            predictions = pd.concat([
+                pd.Series(model.predict(df.iloc[start:start + batch_size]), index=df.index[start:start + batch_size])
+                for start in range(0, len(df), batch_size)
+            ]) if len(df) else pd.Series(dtype=object)
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        predictions.rename("prediction").infer_objects().to_frame().to_parquet(output_path)
+        print(f"Scored {len(df):,} rows into {output_path}")
+        return output_path
+
+    # --- asyncio ------------------------------------------------------
+
+    async def download_dataset_async(self, kaggle_name: str, output_path: str):
+        # Network-bound, and the Kaggle adapters (API client, lambdas) can't be pickled to a process pool.
+        await call_port(self.dataset_adapter.download_dataset, kaggle_name, output_path,
+                        executor=self.io_executor)
+        print(f"Dataset '{kaggle_name}' downloaded to '{output_path}'.")
+
+    async def profile_data_async(self, csv_filename: str):
+        df = await run_blocking(self.io_executor, self.load_dataset, csv_filename)
+        with tracer.span("profile", adapter=type(self.profiler_adapter).__name__) as span:
+            span.set_frame(df)
+            await call_port(self.profiler_adapter.generate_report, df, executor=self.executor)
+        await run_blocking(self.io_executor, self.drift_store.record, csv_filename, df)
+
+    async def train_model_async(self, csv_filename: str, target_col: str, task_type: str,
+                                version: str = None, run_id: str = None):
+        """train_model() for the event loop: same versioning, pinning and logging."""
+        if version is None:
+            version = await run_blocking(self.io_executor, self.snapshot, csv_filename)
+        df = await run_blocking(self.io_executor, self.load_dataset, csv_filename, version)
+        run_id = run_id or new_run_id()
+        self.dataset_store.pin(run_id, csv_filename, version, target=target_col, task_type=task_type)
+        print(f"Run {run_id} uses version {version} of '{csv_filename}'.")
+        with run_context(run_id), tracer.span("train_model", task_type=task_type, run_id=run_id) as span:
+            span.set_frame(df)
+            logger.info("training started", extra={"dataset": csv_filename, "dataset_version": version,
+                                                   "task_type": task_type, "rows": len(df)})
+            model = await call_port(self.training_adapter.train_model, df, target_col, task_type,
+                                    executor=self.executor)
+            logger.info("training finished", extra={"model": type(model).__name__})
         print(f"Training complete. Model object: {model}")
+        return model
+
+    async def run_dataset_async(self, csv_filename: str, target_col: str, task_type: str,
+                                kaggle_name: str = None) -> dict:
+        """Download (when a Kaggle slug is given), then profile and train the dataset concurrently."""
+        if kaggle_name:
+            await self.download_dataset_async(kaggle_name, self.data_folder)
+        _, model = await asyncio.gather(
+            self.profile_data_async(csv_filename),
+            self.train_model_async(csv_filename, target_col, task_type),
+        )
+        return {"dataset": csv_filename, "model": model}
+
+    async def run_datasets_async(self, jobs: list) -> list:
+        """
+        Run many datasets in one event loop, overlapping one dataset's
+        download with another's profiling and training. `jobs` holds
+        run_dataset_async() keyword arguments; a failed job yields its exception.
+        """
+        return await asyncio.gather(*(self.run_dataset_async(**job) for job in jobs), return_exceptions=True)
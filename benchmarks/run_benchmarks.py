@@ -0,0 +1,173 @@
+# benchmarks/run_benchmarks.py
+"""
+End-to-end pipeline benchmarks on synthetic Spotify-shaped data.
+
+    python -m benchmarks.run_benchmarks --rows 10000 100000
+    python -m benchmarks.run_benchmarks --rows 10000 --update-baseline
+
+Each row count is benchmarked in a fresh process, so "peak_rss_mb" (the
+process high-water mark after each stage) never carries over from a larger
+run; "peak_alloc_mb" is the tracemalloc peak of the stage alone (Python and
+numpy allocations; tracing adds the same overhead to every run). Training
+uses the sklearn FoldCache path, not PyCaret, and is reported as
+"train_sklearn".
+
+Each run writes benchmarks/results/<timestamp>.json and, when a baseline
+exists (benchmarks/baseline.json), exits with status 1 if any stage got
+slower than the baseline by more than --tolerance.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from adapters.native_profiling_adapter import NativeProfilingAdapter, correlation_top_pairs
+from application.candidates import candidate_estimators
+from application.clustering import ClusteringEngine, FeatureEncoder
+from application.data_prep import NullHandler
+from application.fold_cache import FoldCache
+from application.tracing import peak_rss_mb
+from application.use_cases import read_dataset
+from benchmarks.synthetic import write_spotify_csv
+
+BENCHMARK_FOLDER = os.path.dirname(os.path.abspath(__file__))
+DATA_FOLDER = os.path.join(BENCHMARK_FOLDER, "data")
+RESULTS_FOLDER = os.path.join(BENCHMARK_FOLDER, "results")
+BASELINE_PATH = os.path.join(BENCHMARK_FOLDER, "baseline.json")
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000, 10_000_000]
+
+FEATURES = ["acousticness", "danceability", "duration_ms", "energy", "instrumentalness",
+            "liveness", "loudness", "speechiness", "tempo", "valence", "key", "time_signature"]
+TARGET = "mode"
+
+
+class StageTimer:
+    def __init__(self, rows: int):
+        self.rows = rows
+        self.results = []
+
+    def run(self, stage: str, func, *args, **kwargs):
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        value = func(*args, **kwargs)
+        seconds = time.perf_counter() - start
+        peak_alloc_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        self.results.append({"rows": self.rows, "stage": stage, "seconds": seconds,
+                             "peak_alloc_mb": peak_alloc_mb, "peak_rss_mb": peak_rss_mb()})
+        print(f"  {stage:<14} {seconds:10.3f}s {peak_alloc_mb:10.1f} MB")
+        return value
+
+
+def benchmark(n_rows: int, train_rows: int, seed: int = 0) -> list:
+    print(f"{n_rows:,} rows")
+    path = write_spotify_csv(os.path.join(DATA_FOLDER, f"spotify_{n_rows}.csv"), n_rows, seed=seed)
+    timer = StageTimer(n_rows)
+    tracemalloc.start()
+
+    df = timer.run("load", read_dataset, path)
+    timer.run("profile", NativeProfilingAdapter().profile, df)
+    timer.run("correlation", correlation_top_pairs, df)
+
+    # Training is capped at `train_rows` (as the app trains on what fits in memory);
+    # prediction and clustering run on every row.
+    train = df.sample(n=min(train_rows, n_rows), random_state=seed)
+    null_handler = NullHandler().fit(train, FEATURES)
+    encoder = FeatureEncoder().fit(null_handler.transform(train)[0])
+
+    def train_models():
+        X = encoder.transform(null_handler.transform(train)[0])
+        y = (train[TARGET] == "Major").to_numpy(dtype=np.int64)
+        candidates = candidate_estimators("classification", include=["lr", "rf"], random_state=seed)
+        # A fresh cache directory, so every run pays for materializing the folds
+        with tempfile.TemporaryDirectory() as cache_dir:
+            fold_cache = FoldCache(X, y, "classification", n_splits=3, random_state=seed, cache_dir=cache_dir)
+            leaderboard, _ = fold_cache.compare(candidates)
+        return candidates[leaderboard["ID"].iloc[0]].fit(X, y)
+
+    # The sklearn FoldCache path used by the CLI and orchestrator; PyCaret is not benchmarked.
+    model = timer.run("train_sklearn", train_models)
+
+    def batch_predict(batch_size: int = 500_000):
+        for start in range(0, n_rows, batch_size):
+            batch = df.iloc[start:start + batch_size]
+            model.predict(encoder.transform(null_handler.transform(batch)[0]))
+
+    timer.run("batch_predict", batch_predict)
+    timer.run("cluster", ClusteringEngine(k_range=range(2, 7), random_state=seed).fit, df[FEATURES])
+    tracemalloc.stop()
+    return timer.results
+
+
+def compare_to_baseline(results: list, baseline: dict, tolerance: float, min_seconds: float) -> list:
+    """Stages slower than the baseline by more than `tolerance` (and `min_seconds`, to ignore noise)."""
+    reference = {(r["rows"], r["stage"]): r["seconds"] for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        before = reference.get((r["rows"], r["stage"]))
+        if before is None:
+            continue
+        if r["seconds"] > before * (1 + tolerance) and r["seconds"] - before > min_seconds:
+            regressions.append({**r, "baseline_seconds": before, "ratio": r["seconds"] / before})
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--train-rows", type=int, default=100_000, help="cap on the training sample")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, as a fraction")
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="ignore slowdowns smaller than this")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for n_rows in args.rows:
+        # A fresh interpreter per size: peak RSS is a process-lifetime maximum.
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.extend(executor.submit(benchmark, n_rows, args.train_rows, args.seed).result())
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "train_rows": args.train_rows,
+        "results": results,
+    }
+    os.makedirs(RESULTS_FOLDER, exist_ok=True)
+    results_path = os.path.join(RESULTS_FOLDER, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    with open(results_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {results_path}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to create one.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_seconds)
+    for r in regressions:
+        print(f"REGRESSION {r['stage']} @ {r['rows']:,} rows: "
+              f"{r['seconds']:.3f}s vs {r['baseline_seconds']:.3f}s ({r['ratio']:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
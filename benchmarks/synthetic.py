@@ -0,0 +1,72 @@
+# benchmarks/synthetic.py
+import os
+import string
+
+import numpy as np
+import pandas as pd
+
+GENRES = [
+    "Movie", "R&B", "A Capella", "Alternative", "Country", "Dance", "Electronic", "Anime",
+    "Folk", "Blues", "Opera", "Hip-Hop", "Children's Music", "Rap", "Indie", "Classical",
+    "Pop", "Reggae", "Reggaeton", "Jazz", "Rock", "Ska", "Comedy", "Soul", "Soundtrack", "World",
+]
+KEYS = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+TIME_SIGNATURES = ["4/4", "3/4", "5/4", "1/4", "0/4"]
+BASE62 = np.array(list(string.digits + string.ascii_letters))
+
+# Same column order as SpotifyFeatures.csv
+COLUMNS = [
+    "genre", "artist_name", "track_name", "track_id", "popularity", "acousticness",
+    "danceability", "duration_ms", "energy", "instrumentalness", "key", "liveness",
+    "loudness", "mode", "speechiness", "tempo", "time_signature", "valence",
+]
+
+
+def spotify_frame(n_rows: int, seed: int = 0, offset: int = 0) -> pd.DataFrame:
+    """
+    `n_rows` synthetic tracks shaped like SpotifyFeatures.csv: bounded audio
+    features, skewed popularity, low-cardinality categoricals and
+    high-cardinality strings (about one artist per 10 tracks, unique track
+    names and ids). `offset` numbers the rows so chunks can be concatenated.
+    """
+    rng = np.random.default_rng(seed + offset)
+    ids = np.arange(offset, offset + n_rows)
+    genre_codes = rng.integers(0, len(GENRES), n_rows)
+    energy = rng.beta(2.5, 1.8, n_rows)
+
+    artists = rng.zipf(1.3, n_rows) % max((offset + n_rows) // 10, 1)
+    return pd.DataFrame({
+        "genre": np.asarray(GENRES, dtype=object)[genre_codes],
+        "artist_name": pd.Series(artists).map("Artist {}".format).to_numpy(dtype=object),
+        "track_name": pd.Series(ids).map("Track {}".format).to_numpy(dtype=object),
+        "track_id": BASE62[rng.integers(0, len(BASE62), (n_rows, 22))].view("<U22").ravel().astype(object),
+        "popularity": np.clip(rng.normal(41 + genre_codes, 18), 0, 100).round().astype(np.int64),
+        "acousticness": np.clip(1 - energy + rng.normal(0, 0.15, n_rows), 0, 1),
+        "danceability": rng.beta(5, 4, n_rows),
+        "duration_ms": rng.lognormal(12.3, 0.35, n_rows).round().astype(np.int64),
+        "energy": energy,
+        "instrumentalness": np.where(rng.random(n_rows) < 0.7, 0.0, rng.beta(0.5, 1.5, n_rows)),
+        "key": np.asarray(KEYS, dtype=object)[rng.integers(0, len(KEYS), n_rows)],
+        "liveness": rng.beta(1.5, 6, n_rows),
+        "loudness": np.clip(-5 - 12 * (1 - energy) + rng.normal(0, 2, n_rows), -52, 3),
+        "mode": np.where(rng.random(n_rows) < 0.65, "Major", "Minor").astype(object),
+        "speechiness": rng.beta(0.8, 7, n_rows),
+        "tempo": rng.normal(118, 30, n_rows).clip(30, 240),
+        "time_signature": np.asarray(TIME_SIGNATURES, dtype=object)[
+            rng.choice(len(TIME_SIGNATURES), n_rows, p=[0.86, 0.1, 0.02, 0.015, 0.005])
+        ],
+        "valence": rng.beta(2, 2, n_rows),
+    }, columns=COLUMNS)
+
+
+def write_spotify_csv(path: str, n_rows: int, seed: int = 0, chunksize: int = 1_000_000) -> str:
+    """Write the synthetic dataset in chunks (10M rows never sit in memory at once)."""
+    if os.path.exists(path):
+        return path
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    for offset in range(0, n_rows, chunksize):
+        chunk = spotify_frame(min(chunksize, n_rows - offset), seed=seed, offset=offset)
+        chunk.to_csv(tmp_path, mode="w" if offset == 0 else "a", header=offset == 0, index=False)
+    os.replace(tmp_path, path)
+    return path
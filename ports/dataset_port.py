@@ -11,3 +11,12 @@ class DatasetPort(ABC):
         return the local path of the dataset CSV (or ZIP) file.
         """
         pass
+
+
+class AsyncDatasetPort(ABC):
+    """Asyncio variant of DatasetPort: fetching a dataset must not block the event loop."""
+
+    @abstractmethod
+    async def download_dataset(self, source_name: str, path: str) -> str:
+        """Download a dataset into `path` and return that path."""
+        pass
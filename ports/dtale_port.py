@@ -12,3 +12,12 @@ class DtalePort(ABC):
         return the edited dataframe.
         """
         pass
+
+
+class AsyncDtalePort(ABC):
+    """Asyncio variant of DtalePort."""
+
+    @abstractmethod
+    async def open_in_dtale(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Launch dtale and return the edited dataframe once the user is done."""
+        pass
@@ -9,3 +9,12 @@ class ProfilingPort(ABC):
     def generate_report(self, df: pd.DataFrame) -> None:
         """Generate or display a data profiling report."""
         pass
+
+
+class AsyncProfilingPort(ABC):
+    """Asyncio variant of ProfilingPort."""
+
+    @abstractmethod
+    async def generate_report(self, df: pd.DataFrame) -> None:
+        """Generate a data profiling report without blocking the event loop."""
+        pass
@@ -12,3 +12,12 @@ class TrainingPort(ABC):
         Return the trained model or any relevant object.
         """
         pass
+
+
+class AsyncTrainingPort(ABC):
+    """Asyncio variant of TrainingPort."""
+
+    @abstractmethod
+    async def train_model(self, df: pd.DataFrame, target: str, task_type: str):
+        """Train a model without blocking the event loop; returns the same objects as TrainingPort."""
+        pass
@@ -6,8 +6,16 @@ import seaborn as sns
 import plotly.express as px
 import plotly.graph_objects as go
 from io import StringIO
-import warnings
-warnings.filterwarnings("ignore")
+import os
+import uuid
+
+from application.memory_profiler import largest_objects, memory_profiler
+from application.structured_logging import configure_logging, get_logger, set_run_id
+from application.tracing import tracer
+
+# Avisos do PyCaret/sklearn vão para logs/app.jsonl, deduplicados, em vez de sumirem
+configure_logging()
+logger = get_logger("streamlit")
 
 # Configuração da página
 st.set_page_config(
@@ -44,6 +52,12 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def column_statistics(df):
+    """Estatísticas por coluna calculadas em paralelo (colunas divididas entre processos)"""
+    from adapters.profiling_executor import ColumnProfilingExecutor, basic_column_stats
+    
+    return ColumnProfilingExecutor().map(df, basic_column_stats)
+
 def show_home_page():
     """Página inicial com informações sobre a aplicação"""
     st.markdown("<h2 class=\"section-header\">Bem-vindo ao ML Studio!</h2>", unsafe_allow_html=True)
@@ -100,8 +114,11 @@ def show_data_upload_page():
         if uploaded_file is not None:
             try:
                 # Ler o arquivo
-                df = pd.read_csv(uploaded_file)
+                with tracer.span("read_csv", path=uploaded_file.name) as span:
+                    df = pd.read_csv(uploaded_file)
+                    span.set_frame(df)
                 st.session_state.df = df
+                st.session_state.dataset_name = uploaded_file.name
                 st.success(f"✅ Arquivo carregado com sucesso! {df.shape[0]} linhas e {df.shape[1]} colunas.")
                 
             except Exception as e:
@@ -110,8 +127,11 @@ def show_data_upload_page():
     
     elif upload_option == "🎵 Usar dataset do Spotify (exemplo)":
         try:
-            # Tentar carregar o dataset do Spotify
+            from application.use_cases import read_dataset
+            
+            # Tentar carregar o dataset do Spotify (Parquet ingerido primeiro, depois CSV)
             spotify_files = [
+                "data/parquet/zaheenhamidani__ultimate-spotify-tracks-db/SpotifyFeatures",
                 "data/SpotifyFeatures.csv",
                 "data/spotify_songs.csv",
                 "data/tracks.csv",
@@ -121,8 +141,9 @@ def show_data_upload_page():
             loaded = False
             for file_path in spotify_files:
                 try:
-                    df = pd.read_csv(file_path)
+                    df = read_dataset(file_path)
                     st.session_state.df = df
+                    st.session_state.dataset_name = os.path.basename(file_path)
                     st.success(f"✅ Dataset do Spotify carregado! {df.shape[0]} linhas e {df.shape[1]} colunas.")
                     loaded = True
                     break
@@ -183,12 +204,13 @@ def show_data_upload_page():
         # Informações sobre tipos de dados
         st.markdown("<h3 class=\"section-header\">📋 Informações das Colunas</h3>", unsafe_allow_html=True)
         
+        column_stats = pd.DataFrame(column_statistics(df))
         col_info = pd.DataFrame({
-            "Coluna": df.columns,
-            "Tipo": df.dtypes,
-            "Valores Únicos": [df[col].nunique() for col in df.columns],
-            "Valores Nulos": [df[col].isnull().sum() for col in df.columns],
-            "% Nulos": [round(df[col].isnull().sum() / len(df) * 100, 2) for col in df.columns]
+            "Coluna": column_stats["name"],
+            "Tipo": column_stats["dtype"],
+            "Valores Únicos": column_stats["unique"],
+            "Valores Nulos": column_stats["missing"],
+            "% Nulos": (column_stats["missing"] / len(df) * 100).round(2)
         })
         
         st.dataframe(col_info, use_container_width=True)
@@ -229,11 +251,12 @@ def show_exploratory_analysis_page():
         categorical_cols = df.select_dtypes(include=["object"]).columns
         if len(categorical_cols) > 0:
             st.markdown("**Variáveis Categóricas:**")
+            column_stats = pd.DataFrame(column_statistics(df[categorical_cols]))
             cat_stats = pd.DataFrame({
-                "Coluna": categorical_cols,
-                "Valores Únicos": [df[col].nunique() for col in categorical_cols],
-                "Valor Mais Frequente": [df[col].mode().iloc[0] if len(df[col].mode()) > 0 else "N/A" for col in categorical_cols],
-                "Frequência do Mais Comum": [df[col].value_counts().iloc[0] if len(df[col].value_counts()) > 0 else 0 for col in categorical_cols]
+                "Coluna": column_stats["name"],
+                "Valores Únicos": column_stats["unique"],
+                "Valor Mais Frequente": column_stats["mode"],
+                "Frequência do Mais Comum": column_stats["mode_count"]
             })
             st.dataframe(cat_stats, use_container_width=True)
     
@@ -562,6 +585,37 @@ def show_model_configuration_page():
     else:
         st.warning("⚠️ Selecione pelo menos uma feature para continuar.")
 
+def show_comparison_history(task_type):
+    """Lista as comparações de modelos salvas e mostra a escolhida com as métricas por fold"""
+    from application.leaderboard_store import LeaderboardStore
+    
+    store = LeaderboardStore()
+    history = store.history(task_type=task_type)
+    if history.empty:
+        return
+    
+    with st.expander(f"📜 Comparações Anteriores ({len(history)})"):
+        st.dataframe(history, use_container_width=True)
+        comparison_id = st.selectbox(
+            "Abrir comparação",
+            history["id"].tolist(),
+            format_func=lambda i: f"#{i} · {history.set_index('id').loc[i, 'dataset']} · {history.set_index('id').loc[i, 'created_at']}"
+        )
+        leaderboard, _ = store.load(comparison_id)
+        st.dataframe(leaderboard, use_container_width=True)
+        
+        folds = store.fold_table(comparison_id)
+        metric = st.selectbox("Métrica por fold", folds["metric"].unique().tolist())
+        fig = px.box(
+            folds[folds["metric"] == metric],
+            x="model_id",
+            y="value",
+            points="all",
+            title=f"{metric} por fold"
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+
 def show_training_page():
     """Página para treinamento e avaliação do modelo"""
     st.markdown("<h2 class=\"section-header\">🎯 Treinamento e Avaliação do Modelo</h2>", unsafe_allow_html=True)
@@ -576,21 +630,29 @@ def show_training_page():
     
     df = st.session_state.df
     
-    # Preparar dados para treinamento
+    # Configuração do tratamento de valores nulos
+    from application.data_prep import CATEGORICAL_STRATEGIES, NUMERIC_STRATEGIES, NullHandler, missing_mask
+    
+    with st.expander("🧹 Tratamento de Valores Nulos"):
+        col1, col2 = st.columns(2)
+        with col1:
+            numeric_strategy = st.selectbox("Features numéricas", NUMERIC_STRATEGIES)
+        with col2:
+            categorical_strategy = st.selectbox("Features categóricas", CATEGORICAL_STRATEGIES)
+    
+    # Preparar dados para treinamento: imputação ajustada no treino, sem cópias intermediárias
+    null_handler = NullHandler(numeric_strategy, categorical_strategy).fit(df, st.session_state.selected_features)
+    features_data, valid_rows = null_handler.transform(df)
     if st.session_state.target_column:
-        # Para classificação e regressão
-        features_data = df[st.session_state.selected_features + [st.session_state.target_column]].copy()
-    else:
-        # Para clustering
-        features_data = df[st.session_state.selected_features].copy()
+        # Para classificação e regressão: o alvo não é imputado
+        features_data[st.session_state.target_column] = df[st.session_state.target_column]
+        valid_rows &= ~missing_mask(df, [st.session_state.target_column])
     
-    # Remover linhas com valores nulos
     initial_rows = len(features_data)
-    features_data = features_data.dropna()
-    final_rows = len(features_data)
-    
-    if initial_rows != final_rows:
-        st.info(f"ℹ️ Removidas {initial_rows - final_rows} linhas com valores nulos. Dataset final: {final_rows} linhas.")
+    final_rows = int(valid_rows.sum())
+    if final_rows != initial_rows:
+        features_data = features_data[valid_rows]
+        st.info(f"ℹ️ {initial_rows - final_rows} linhas sem alvo ou com nulos em colunas \"drop\" ficam fora do treino. Dataset final: {final_rows} linhas.")
     
     # Mostrar configuração atual
     st.markdown("<h3 class=\"section-header\">📋 Configuração Atual</h3>", unsafe_allow_html=True)
@@ -610,75 +672,210 @@ def show_training_page():
         target_display = st.session_state.target_column if st.session_state.target_column else "N/A"
         st.metric("Variável Alvo", target_display)
     
+    # Configuração do ajuste de hiperparâmetros
+    tune_enabled = False
+    warm_start = False
+    if st.session_state.task_type in ["classification", "regression"]:
+        with st.expander("⚡ Seleção Inicial de Modelos"):
+            warm_start = st.checkbox(
+                "Avaliar só os modelos que venceram em datasets parecidos",
+                value=False,
+                help="Usa o histórico de comparações e meta-features do dataset (linhas, colunas, cardinalidades, balanço de classes); o ajuste começa dos melhores parâmetros dessas execuções"
+            )
+            shortlist_size = st.number_input("Modelos avaliados", min_value=1, max_value=5, value=3)
+        
+        with st.expander("🎛️ Ajuste de Hiperparâmetros"):
+            tune_enabled = st.checkbox(
+                "Ajustar os melhores modelos após a comparação",
+                value=True,
+                help="Busca paralela com poda pela mediana sobre os top-k modelos da comparação"
+            )
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                tune_top_k = st.number_input("Top-k modelos", min_value=1, max_value=5, value=3)
+            with col2:
+                tune_trials = st.number_input("Trials por modelo", min_value=1, max_value=200, value=20)
+            with col3:
+                tune_budget = st.number_input("Tempo máximo (s)", min_value=10, max_value=3600, value=300)
+            with col4:
+                tune_strategy = st.selectbox("Estratégia", ["bayesian", "random"])
+    else:  # clustering
+        with st.expander("🎛️ Seleção do Número de Clusters"):
+            col1, col2 = st.columns(2)
+            with col1:
+                k_min, k_max = st.slider("Faixa de k avaliada", min_value=2, max_value=30, value=(2, 10))
+            with col2:
+                k_selection = st.selectbox(
+                    "Critério de escolha de k",
+                    ["silhouette", "calinski_harabasz", "elbow"],
+                    help="Silhouette e Calinski-Harabasz são calculados sobre uma amostra dos dados"
+                )
+
+    # Comparações anteriores, recarregadas do histórico sem retreinar
+    if st.session_state.task_type in ["classification", "regression"]:
+        show_comparison_history(st.session_state.task_type)
+    
     # Botão para iniciar treinamento
     if st.button("🚀 Iniciar Treinamento", type="primary"):
         
         with st.spinner("🔄 Treinando modelos... Isso pode levar alguns minutos."):
             try:
+                # Versionar o dataset e fixar a versão usada neste treino
+                from application.dataset_store import DatasetStore, new_run_id
+                
+                dataset_store = DatasetStore()
+                dataset_name = st.session_state.get("dataset_name", "dataset")
+                run_id = new_run_id()
+                try:
+                    dataset_version = dataset_store.commit(dataset_name, df)
+                    dataset_store.pin(
+                        run_id,
+                        dataset_name,
+                        dataset_version,
+                        task_type=st.session_state.task_type,
+                        target=st.session_state.target_column,
+                        features=st.session_state.selected_features
+                    )
+                except Exception as e:
+                    # O versionamento não deve impedir o treino
+                    dataset_version = None
+                    st.warning(f"⚠️ Não foi possível versionar o dataset: {e}")
+                st.session_state.dataset_version = dataset_version
+                st.session_state.run_id = run_id
+                set_run_id(run_id)
+                logger.info("training started", extra={
+                    "task_type": st.session_state.task_type,
+                    "rows": len(features_data),
+                    "dataset": dataset_name,
+                    "dataset_version": dataset_version
+                })
+                
                 # Importar PyCaret baseado no tipo de tarefa
                 if st.session_state.task_type == "classification":
-                    from pycaret.classification import setup, compare_models, finalize_model, evaluate_model, get_config
+                    from pycaret.classification import setup, finalize_model, evaluate_model, get_config
                 elif st.session_state.task_type == "regression":
-                    from pycaret.regression import setup, compare_models, finalize_model, evaluate_model, get_config
-                else:  # clustering
-                    from pycaret.clustering import setup, create_model, assign_model, get_config
+                    from pycaret.regression import setup, finalize_model, evaluate_model, get_config
                 
                 # Setup do PyCaret
                 if st.session_state.task_type in ["classification", "regression"]:
-                    ml_setup = setup(
-                        data=features_data,
-                        target=st.session_state.target_column,
-                        session_id=123,
-                        train_size=0.8,
-                        silent=True,
-                        html=False,
-                        verbose=False
-                    )
+                    with tracer.span("setup", task_type=st.session_state.task_type) as span:
+                        span.set_frame(features_data)
+                        ml_setup = setup(
+                            data=features_data,
+                            target=st.session_state.target_column,
+                            session_id=123,
+                            train_size=0.8,
+                            silent=True,
+                            html=False,
+                            verbose=False
+                        )
                     
-                    # Comparar modelos
-                    best_models = compare_models(
-                        include=["lr", "rf", "et", "gbr" if st.session_state.task_type == "regression" else "gbc", "xgboost"],
-                        sort="RMSE" if st.session_state.task_type == "regression" else "Accuracy",
-                        n_select=3,
-                        verbose=False
+                    # Comparar modelos sobre folds pré-processados uma única vez
+                    from application.candidates import candidate_estimators
+                    from application.fold_cache import FoldCache
+                    from application.leaderboard_store import LeaderboardStore
+                    from application.meta_learning import WarmStartSelector, meta_features
+                    
+                    leaderboard_store = LeaderboardStore()
+                    fold_cache = FoldCache.from_pycaret(get_config, st.session_state.task_type)
+                    candidates = candidate_estimators(st.session_state.task_type)
+                    # Meta-features do dado bruto (antes da imputação), como no SklearnTrainingAdapter
+                    meta = meta_features(
+                        df[st.session_state.selected_features + [st.session_state.target_column]],
+                        st.session_state.target_column,
+                        st.session_state.task_type
                     )
+                    selector = WarmStartSelector(leaderboard_store) if warm_start else None
+                    if selector:
+                        candidates = selector.shortlist(meta, st.session_state.task_type, candidates, int(shortlist_size))
+                        st.info(f"⚡ Modelos avaliados a partir do histórico: {', '.join(candidates)}")
+                    with tracer.span("compare_models", candidates=len(candidates)) as span:
+                        span.set_frame(fold_cache.X)
+                        # Candidatos já avaliados nestes folds são lidos do histórico, sem novo treino
+                        leaderboard, _ = fold_cache.compare(
+                            candidates,
+                            store=leaderboard_store,
+                            dataset_name=dataset_name,
+                            run_id=run_id,
+                            meta_features=meta
+                        )
+                    st.session_state.leaderboard = leaderboard
+                    st.session_state.comparison_id = leaderboard.attrs.get("comparison_id")
+                    if not leaderboard.attrs.get("per_fold_preprocessing"):
+                        st.caption("⚠️ Pré-processamento ajustado em todo o treino (PyCaret 2): "
+                                   "as métricas de validação cruzada são otimistas.")
+                    n_select = tune_top_k if tune_enabled else 3
+                    best_models = [candidates[model_id] for model_id in leaderboard["ID"].head(n_select)]
+                    
+                    # Ajustar hiperparâmetros dos melhores candidatos
+                    if tune_enabled:
+                        from application.tuning import HyperparameterTuner
+                        
+                        tuner = HyperparameterTuner(
+                            task_type=st.session_state.task_type,
+                            n_trials=int(tune_trials),
+                            time_budget=float(tune_budget),
+                            strategy=tune_strategy
+                        )
+                        seeds = selector.seed_params(
+                            meta,
+                            st.session_state.task_type,
+                            [type(model).__name__ for model in best_models]
+                        ) if selector else None
+                        with tracer.span("tune", models=len(best_models), trials=int(tune_trials)):
+                            tuning_results = tuner.tune_candidates(best_models, fold_cache=fold_cache, seeds=seeds)
+                        for result in tuning_results:
+                            leaderboard_store.record_tuning(fold_cache.key, result)
+                        st.session_state.tuning_results = [r.summary() for r in tuning_results]
+                        best_models = [r.estimator for r in tuning_results]
                     
                     # Finalizar o melhor modelo
-                    if isinstance(best_models, list):
+                    with tracer.span("finalize", model=type(best_models[0]).__name__):
                         best_model = finalize_model(best_models[0])
-                    else:
-                        best_model = finalize_model(best_models)
                     
                     st.session_state.model = best_model
+                    st.session_state.null_handler = null_handler
                     
                 else:  # clustering
-                    ml_setup = setup(
-                        data=features_data,
-                        session_id=123,
-                        silent=True,
-                        html=False,
-                        verbose=False
-                    )
+                    from application.centroid_index import CentroidIndex
+                    from application.clustering import ClusteringEngine
                     
-                    # Criar modelo de clustering
-                    kmeans_model = create_model("kmeans", num_clusters=3)
+                    # Escolher k em amostras e ajustar MiniBatchKMeans em todos os dados
+                    engine = ClusteringEngine(k_range=range(k_min, k_max + 1), selection=k_selection)
+                    with tracer.span("cluster", selection=k_selection) as span:
+                        span.set_frame(features_data)
+                        clustering = engine.fit(features_data)
+                    clustered_data = features_data.assign(Cluster=clustering.cluster_names(clustering.labels))
                     
-                    # Atribuir clusters
-                    clustered_data = assign_model(kmeans_model)
+                    # Índice de centróides persistido para atribuição rápida de novos dados
+                    cluster_index = CentroidIndex.from_clustering(clustering, features_data)
+                    cluster_index.save(dataset_name, run_id)
                     
-                    st.session_state.model = kmeans_model
+                    st.session_state.model = clustering.model
+                    st.session_state.clustering = clustering
+                    st.session_state.cluster_index = cluster_index
                     st.session_state.clustered_data = clustered_data
+                    st.session_state.null_handler = null_handler
                 
+                logger.info("training finished", extra={"task_type": st.session_state.task_type})
                 st.success("✅ Treinamento concluído com sucesso!")
+                st.caption(f"Execução {run_id} · dataset '{dataset_name}' versão {dataset_version or 'não versionada'}")
                 
                 # Mostrar resultados
                 st.markdown("<h3 class=\"section-header\">📊 Resultados do Treinamento</h3>", unsafe_allow_html=True)
                 
                 if st.session_state.task_type in ["classification", "regression"]:
                     # Métricas do modelo
+                    st.markdown("**Comparação de Modelos (validação cruzada):**")
+                    st.dataframe(st.session_state.leaderboard, use_container_width=True)
+                    
                     st.markdown("**Melhor Modelo Treinado:**")
                     st.write(f"Algoritmo: {type(best_model).__name__}")
                     
+                    if tune_enabled and st.session_state.get("tuning_results"):
+                        st.markdown("**Ajuste de Hiperparâmetros (validação cruzada):**")
+                        st.dataframe(pd.DataFrame(st.session_state.tuning_results), use_container_width=True)
+                    
                     # Avaliação do modelo
                     try:
                         # Obter métricas do setup
@@ -745,8 +942,19 @@ def show_training_page():
                 
                 else:  # clustering
                     st.markdown("**Modelo de Clustering Criado:**")
-                    st.write(f"Algoritmo: K-Means")
-                    st.write(f"Número de Clusters: 3")
+                    st.write(f"Algoritmo: MiniBatch K-Means (k-means++)")
+                    st.write(f"Número de Clusters: {clustering.k} (escolhido por {clustering.selection})")
+                    
+                    # Scores por k avaliado
+                    score_column = "inertia" if clustering.selection == "elbow" else clustering.selection
+                    fig_k = px.line(
+                        clustering.scores,
+                        x="k",
+                        y=score_column,
+                        markers=True,
+                        title=f"Seleção de k - {score_column}"
+                    )
+                    st.plotly_chart(fig_k, use_container_width=True)
                     
                     # Mostrar distribuição dos clusters
                     cluster_counts = clustered_data["Cluster"].value_counts().sort_index()
@@ -796,6 +1004,18 @@ def show_prediction_page():
         st.warning("⚠️ Configure o modelo primeiro na seção \'Configuração do Modelo\'.")
         return
     
+    # Sem índice na sessão: recarregar o salvo no treino deste dataset
+    if st.session_state.task_type == "clustering" and st.session_state.get("cluster_index") is None:
+        from application.centroid_index import CentroidIndex
+        try:
+            st.session_state.cluster_index = CentroidIndex.load(
+                st.session_state.get("dataset_name", "dataset"),
+                st.session_state.get("run_id")
+            )
+        except FileNotFoundError:
+            st.warning("⚠️ Índice de clusters não encontrado. Treine o modelo de clustering novamente.")
+            return
+    
     # Informações sobre o modelo atual
     st.markdown("<h3 class=\"section-header\">📋 Modelo Atual</h3>", unsafe_allow_html=True)
     
@@ -925,30 +1145,26 @@ def show_prediction_page():
                                 st.metric("Média no Dataset", f"{target_mean:.3f}")
                     
                     else:  # clustering
-                        # Para clustering, atribuir cluster
-                        from pycaret.clustering import assign_model
-                        
-                        clustered_input = assign_model(st.session_state.model, data=input_df)
-                        cluster = clustered_input["Cluster"].iloc[0]
+                        # Para clustering, atribuir o centróide mais próximo
+                        cluster_index = st.session_state.cluster_index
+                        cluster_id = cluster_index.assign_row(input_data)
+                        cluster = cluster_index.name(cluster_id)
                         
                         st.success(f"**Cluster Atribuído:** {cluster}")
                         
-                        # Mostrar informações sobre o cluster
-                        if hasattr(st.session_state, "clustered_data"):
-                            cluster_data = st.session_state.clustered_data
-                            cluster_info = cluster_data[cluster_data["Cluster"] == cluster]
-                            
-                            st.markdown(f"**Informações sobre o Cluster {cluster}:**")
-                            
-                            col1, col2 = st.columns(2)
-                            
-                            with col1:
-                                st.metric("Pontos no Cluster", len(cluster_info))
-                            
-                            with col2:
-                                total_points = len(cluster_data)
-                                percentage = (len(cluster_info) / total_points) * 100
-                                st.metric("% do Total", f"{percentage:.1f}%")
+                        # Mostrar informações sobre o cluster (contagens pré-calculadas no índice)
+                        st.markdown(f"**Informações sobre o {cluster}:**")
+                        
+                        col1, col2 = st.columns(2)
+                        
+                        with col1:
+                            st.metric("Pontos no Cluster", cluster_index.size(cluster_id))
+                        
+                        with col2:
+                            st.metric("% do Total", f"{cluster_index.share(cluster_id) * 100:.1f}%")
+                        
+                        st.markdown("**Média das variáveis numéricas no cluster:**")
+                        st.dataframe(cluster_index.profile(cluster_id).to_frame("Média"), use_container_width=True)
                     
                     # Mostrar dados de entrada
                     st.markdown("<h3 class=\"section-header\">📊 Dados de Entrada</h3>", unsafe_allow_html=True)
@@ -981,47 +1197,62 @@ def show_prediction_page():
                     st.error(f"❌ Colunas ausentes no arquivo: {missing_features}")
                     st.info("💡 O arquivo deve conter todas as features usadas no treinamento.")
                 else:
-                    # Selecionar apenas as features necessárias
-                    prediction_data = new_data[st.session_state.selected_features].copy()
+                    # Aplicar o mesmo tratamento de nulos ajustado no treino (sem remover linhas)
+                    from application.data_prep import NullHandler, missing_mask
+                    
+                    null_handler = st.session_state.get("null_handler")
+                    if null_handler is None:
+                        null_handler = NullHandler().fit(st.session_state.df, st.session_state.selected_features)
+                    prediction_data, valid_rows = null_handler.transform(new_data)
                     
-                    # Verificar valores nulos
-                    null_counts = prediction_data.isnull().sum()
-                    if null_counts.sum() > 0:
-                        st.warning("⚠️ Dados com valores nulos encontrados. Eles serão removidos.")
-                        prediction_data = prediction_data.dropna()
+                    n_missing = int(missing_mask(new_data, st.session_state.selected_features).sum())
+                    if n_missing > 0:
+                        st.info(f"ℹ️ {n_missing} linhas com valores nulos foram imputadas com os valores do treino.")
+                    if not valid_rows.all():
+                        st.warning(f"⚠️ {int((~valid_rows).sum())} linhas têm nulos em colunas \"drop\" e ficam sem previsão.")
                     
-                    if len(prediction_data) > 0:
+                    if valid_rows.any():
                         if st.button("🔮 Fazer Previsões em Lote", type="primary"):
                             try:
                                 with st.spinner("🔄 Fazendo previsões..."):
                                     
+                                    # Prever apenas as linhas válidas; as demais ficam com resultado vazio
+                                    valid_data = prediction_data if valid_rows.all() else prediction_data[valid_rows]
+                                    result_df = new_data[st.session_state.selected_features]
+                                    
+                                    def full_column(values):
+                                        column = pd.Series(None, index=new_data.index, dtype=object)
+                                        column[valid_rows] = values
+                                        return column
+                                    
                                     if st.session_state.task_type in ["classification", "regression"]:
-                                        predictions = st.session_state.model.predict(prediction_data)
-                                        
-                                        # Adicionar previsões ao DataFrame
-                                        result_df = prediction_data.copy()
+                                        with tracer.span("predict", task_type=st.session_state.task_type) as span:
+                                            span.set_frame(valid_data)
+                                            predictions = st.session_state.model.predict(valid_data)
                                         
                                         if st.session_state.task_type == "classification":
-                                            result_df["Classe_Predita"] = predictions
+                                            result_df = result_df.assign(Classe_Predita=full_column(predictions))
                                             
                                             # Tentar obter probabilidades
                                             try:
-                                                probabilities = st.session_state.model.predict_proba(prediction_data)
+                                                probabilities = st.session_state.model.predict_proba(valid_data)
                                                 classes = st.session_state.model.classes_
                                                 
-                                                for i, class_name in enumerate(classes):
-                                                    result_df[f"Prob_{class_name}"] = probabilities[:, i]
+                                                result_df = result_df.assign(**{
+                                                    f"Prob_{class_name}": full_column(probabilities[:, i]).astype(float)
+                                                    for i, class_name in enumerate(classes)
+                                                })
                                             except:
                                                 pass
                                         
                                         else:  # regression
-                                            result_df["Valor_Predito"] = predictions
+                                            result_df = result_df.assign(Valor_Predito=full_column(predictions).astype(float))
                                     
                                     else:  # clustering
-                                        from pycaret.clustering import assign_model
-                                        
-                                        clustered_result = assign_model(st.session_state.model, data=prediction_data)
-                                        result_df = clustered_result
+                                        cluster_index = st.session_state.cluster_index
+                                        result_df = result_df.assign(
+                                            Cluster=full_column([cluster_index.name(c) for c in cluster_index.assign(valid_data)])
+                                        )
                                     
                                     # Mostrar resultados
                                     st.markdown("<h3 class=\"section-header\">🎯 Resultados das Previsões</h3>", unsafe_allow_html=True)
@@ -1069,12 +1300,12 @@ def show_prediction_page():
                                         mime="text/csv"
                                     )
                                     
-                                    st.success(f"✅ Previsões concluídas para {len(result_df)} registros!")
+                                    st.success(f"✅ Previsões concluídas para {len(valid_data)} de {len(result_df)} registros!")
                             
                             except Exception as e:
                                 st.error(f"❌ Erro ao fazer previsões: {str(e)}")
                     else:
-                        st.error("❌ Nenhum dado válido encontrado após remoção de valores nulos.")
+                        st.error("❌ Nenhuma linha válida: todas têm nulos em colunas \"drop\".")
             
             except Exception as e:
                 st.error(f"❌ Erro ao carregar arquivo: {str(e)}")
@@ -1104,6 +1335,120 @@ def show_prediction_page():
     features_df = pd.DataFrame(features_info)
     st.dataframe(features_df, use_container_width=True)
 
+def show_drift_page():
+    """Página para comparar versões de um dataset (drift) a partir dos sketches armazenados"""
+    st.markdown("<h2 class=\"section-header\">📉 Drift de Dados</h2>", unsafe_allow_html=True)
+    
+    from application.drift import DriftStore
+    
+    drift_store = DriftStore()
+    
+    # Registrar a versão atual do dataset carregado
+    if st.session_state.df is not None:
+        st.markdown("<h3 class=\"section-header\">💾 Registrar Versão</h3>", unsafe_allow_html=True)
+        dataset_name = st.text_input("Nome do dataset:", value="dataset")
+        if st.button("💾 Registrar versão atual", type="primary"):
+            version = drift_store.record(dataset_name, st.session_state.df)
+            st.success(f"✅ Versão {version} registrada para '{dataset_name}'.")
+    
+    st.markdown("<h3 class=\"section-header\">🔎 Comparar Versões</h3>", unsafe_allow_html=True)
+    
+    datasets = drift_store.datasets()
+    if not datasets:
+        st.info("💡 Nenhuma versão registrada ainda. Carregue um dataset e registre uma versão.")
+        return
+    
+    selected_dataset = st.selectbox("Dataset:", datasets)
+    versions = drift_store.versions(selected_dataset)
+    if len(versions) < 2:
+        st.info("💡 São necessárias pelo menos duas versões registradas para comparar.")
+        return
+    
+    labels = {
+        v["version"]: f"{v['version']} — {pd.to_datetime(v['recorded_at'], unit='s'):%Y-%m-%d %H:%M} ({v['rows']:,} linhas)"
+        for v in versions
+    }
+    version_ids = list(labels)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        reference = st.selectbox("Versão de referência:", version_ids, index=len(version_ids) - 2, format_func=labels.get)
+    with col2:
+        current = st.selectbox("Versão atual:", version_ids, index=len(version_ids) - 1, format_func=labels.get)
+    
+    report = drift_store.compare(selected_dataset, reference, current)
+    drifted = report[report["status"] != "stable"]
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Colunas com Drift", len(drifted))
+    with col2:
+        st.metric("Colunas Comparadas", len(report))
+    
+    if "psi" in report.columns:
+        fig_psi = px.bar(
+            report.dropna(subset=["psi"]).sort_values("psi", ascending=False),
+            x="column",
+            y="psi",
+            color="status",
+            title="PSI por Coluna"
+        )
+        st.plotly_chart(fig_psi, use_container_width=True)
+    
+    st.dataframe(report, use_container_width=True)
+
+def show_timing_panel():
+    """Painel lateral com a duração das últimas etapas instrumentadas"""
+    spans = tracer.recent(15)
+    with st.sidebar.expander("⏱️ Tempos de Execução"):
+        if not spans:
+            st.caption("Nenhuma etapa registrada ainda.")
+            return
+        timings = pd.DataFrame([
+            {
+                "Etapa": span["name"],
+                "Duração (s)": round(span["duration"], 2),
+                "Linhas": span["attributes"].get("rows"),
+                "Colunas": span["attributes"].get("cols"),
+                "RSS (MB)": span["attributes"].get("rss_mb"),
+                "Δ RSS (MB)": span["attributes"].get("rss_delta_mb"),
+            }
+            for span in spans
+        ])
+        st.dataframe(timings, use_container_width=True)
+
+def show_memory_panel():
+    """Modo opcional de contabilidade de memória por etapa e por sessão"""
+    with st.sidebar.expander("🧠 Memória"):
+        enabled = st.checkbox(
+            "Ativar modo de memória",
+            value=memory_profiler.enabled,
+            help="Registra picos do tracemalloc e RSS por etapa; deixa a aplicação mais lenta"
+        )
+        if enabled and not memory_profiler.enabled:
+            memory_profiler.enable()
+        elif not enabled and memory_profiler.enabled:
+            memory_profiler.disable()
+        
+        if not memory_profiler.enabled:
+            return
+        
+        # Medir objetos custa (cópias profundas, pickle de modelos): só sob demanda
+        if st.button("📏 Medir objetos da sessão"):
+            objects = pd.DataFrame(largest_objects(st.session_state, top_n=8))
+            if not objects.empty:
+                st.markdown("**Maiores objetos da sessão:**")
+                objects["MB"] = (objects.pop("bytes") / 1024 / 1024).round(2)
+                st.dataframe(objects, use_container_width=True)
+        
+        stages = memory_profiler.stage_summary()
+        if not stages.empty:
+            st.markdown("**Pico por etapa (MB):**")
+            st.dataframe(stages[["runs", "traced_peak_mb", "rss_mb"]].round(1), use_container_width=True)
+        if st.button("📝 Gerar relatório de memória"):
+            path = memory_profiler.report({st.session_state.session_id: st.session_state})
+            st.success(f"Relatório salvo em {path}")
+
 def main():
     # Título principal
     st.markdown("<h1 class=\"main-header\">🤖 ML Studio - Análise e Modelagem</h1>", unsafe_allow_html=True)
@@ -1118,12 +1463,16 @@ def main():
         "🔍 Análise Exploratória",
         "⚙️ Configuração do Modelo",
         "🎯 Treinamento e Avaliação",
-        "🔮 Previsões"
+        "🔮 Previsões",
+        "📉 Drift de Dados"
     ]
     
     selected_option = st.sidebar.selectbox("Selecione uma opção:", menu_options)
     
     # Inicializar session state
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex[:8]
+    memory_profiler.set_session(st.session_state.session_id)
     if "df" not in st.session_state:
         st.session_state.df = None
     if "model" not in st.session_state:
@@ -1148,6 +1497,11 @@ def main():
         show_training_page()
     elif selected_option == "🔮 Previsões":
         show_prediction_page()
+    elif selected_option == "📉 Drift de Dados":
+        show_drift_page()
+    
+    show_timing_panel()
+    show_memory_panel()
 
 if __name__ == "__main__":
     main()
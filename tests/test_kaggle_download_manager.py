@@ -0,0 +1,126 @@
+# tests/test_kaggle_download_manager.py
+import base64
+import hashlib
+import os
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from adapters.kaggle_download_manager import ChecksumError, KaggleDownloadManager
+
+DATASET = "owner/slug"
+CONTENT = bytes(range(256)) * 4096  # 1 MiB
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serves `server.files` under /api/v1/datasets/download/<dataset>/<name>, honouring Range."""
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("Range")))
+        name = self.path.rsplit("/", 1)[-1]
+        if name not in self.server.files:
+            self.send_error(404)
+            return
+        body = self.server.files[name]
+        start = 0
+        if self.headers.get("Range"):
+            start = int(self.headers["Range"].split("=")[1].rstrip("-"))
+            if start >= len(body):
+                self.send_error(416)
+                return
+        self.send_response(206 if start else 200)
+        self.send_header("Content-Length", str(len(body) - start))
+        self.send_header("Content-MD5", base64.b64encode(hashlib.md5(body).digest()).decode())
+        self.end_headers()
+        self.wfile.write(body[start:])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    httpd.files, httpd.requests = {}, []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_manager(server, mirror_dir, listing):
+    api = SimpleNamespace(dataset_list_files=lambda name: [SimpleNamespace(**f) for f in listing])
+    return KaggleDownloadManager(
+        api, lambda name: {"last_updated": "2024-01-01"}, mirror_dir=str(mirror_dir),
+        base_url=f"http://127.0.0.1:{server.server_port}/api/v1", auth=("user", "key"), retries=1,
+    )
+
+
+def test_resumes_from_partial_file(server, tmp_path):
+    server.files["data.csv"] = CONTENT
+    sha256 = hashlib.sha256(CONTENT).hexdigest()
+    manager = make_manager(server, tmp_path, [{"name": "data.csv", "totalBytes": len(CONTENT), "sha256": sha256}])
+    half = len(CONTENT) // 2
+    with open(os.path.join(manager._staging_dir(DATASET), "data.csv.part"), "wb") as f:
+        f.write(CONTENT[:half])
+
+    manifest = manager.fetch(DATASET)
+
+    assert server.requests == [(f"/api/v1/datasets/download/{DATASET}/data.csv", f"bytes={half}-")]
+    assert manifest["files"] == [{"name": "data.csv", "size": len(CONTENT), "sha256": sha256}]
+    with open(manager.object_path(sha256), "rb") as f:
+        assert f.read() == CONTENT
+
+    # Same `last_updated`: served from the mirror without another request.
+    manager.fetch(DATASET)
+    assert len(server.requests) == 1
+
+
+def test_checksum_mismatch_retries_then_fails(server, tmp_path):
+    server.files["data.csv"] = CONTENT
+    manager = make_manager(server, tmp_path, [{"name": "data.csv", "totalBytes": len(CONTENT), "sha256": "0" * 64}])
+
+    with pytest.raises(ChecksumError):
+        manager.fetch(DATASET)
+
+    # Each attempt starts over: the corrupt partial is discarded, never resumed.
+    assert [r[1] for r in server.requests] == [None, None]
+    assert not os.path.exists(os.path.join(manager._staging_dir(DATASET), "data.csv.part"))
+
+
+def test_client_error_fails_fast(server, tmp_path):
+    manager = make_manager(server, tmp_path, [{"name": "missing.csv", "totalBytes": 10, "sha256": None}])
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        manager.fetch(DATASET)
+
+    assert error.value.code == 404
+    assert len(server.requests) == 1
+
+
+def test_list_files_follows_pages(tmp_path):
+    pages = {
+        None: SimpleNamespace(files=[SimpleNamespace(name="a.csv", totalBytes=1, sha256=None)],
+                              nextPageToken="page-2"),
+        "page-2": SimpleNamespace(files=[SimpleNamespace(name="b.csv", totalBytes=2, sha256=None)],
+                                  nextPageToken=""),
+    }
+    api = SimpleNamespace(dataset_list_files=lambda name, page_token=None: pages[page_token])
+    manager = KaggleDownloadManager(api, None, mirror_dir=str(tmp_path))
+
+    assert [f["name"] for f in manager.list_files(DATASET)] == ["a.csv", "b.csv"]
+
+
+def test_sync_refreshes_changed_file_of_same_size(server, tmp_path):
+    target_dir = tmp_path / "work"
+    for version, content in (("v1", b"a" * 100), ("v2", b"b" * 100)):
+        server.files["data.csv"] = content
+        manager = make_manager(server, tmp_path / "mirror",
+                               [{"name": "data.csv", "totalBytes": 100, "sha256": hashlib.sha256(content).hexdigest()}])
+        manager.metadata_fn = lambda name: {"last_updated": version}
+        manager.sync(DATASET, str(target_dir))
+        assert (target_dir / "data.csv").read_bytes() == content
@@ -0,0 +1,29 @@
+# tests/test_pipeline.py
+from application.pipeline import Pipeline, Stage
+
+
+def test_upstream_change_reruns_downstream_stages(tmp_path):
+    version = {"value": 1}
+    runs = []
+
+    def stage(name, output):
+        def run(inputs):
+            runs.append(name)
+            return output
+        return run
+
+    pipeline = Pipeline("demo", [
+        Stage("download", stage("download", {"version": "ignored"}), watch=lambda: version["value"]),
+        # Same output for every version, like table paths that do not change.
+        Stage("ingest", stage("ingest", {"tables": ["t"]}), deps=("download",)),
+        Stage("train", stage("train", {"model": "m"}), deps=("ingest",)),
+    ], state_dir=str(tmp_path))
+
+    assert {s: r["status"] for s, r in pipeline.run().items()} == {
+        "download": "ran", "ingest": "ran", "train": "ran"}
+    assert {r["status"] for r in pipeline.run().values()} == {"skipped"}
+
+    version["value"] = 2
+    assert {s: r["status"] for s, r in pipeline.run().items()} == {
+        "download": "ran", "ingest": "ran", "train": "ran"}
+    assert runs == ["download", "ingest", "train"] * 2